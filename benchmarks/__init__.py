@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+"""pyGIMLi benchmark suite.
+
+Benchmarks of the performance critical paths at several problem sizes.
+The classes follow the conventions of airspeed velocity (asv): `setup`
+prepares the problem, methods starting with `time_` are timed and methods
+starting with `peakmem_` are measured for their peak memory. The problem
+size is given by the class attributes `params` and `param_names`.
+
+Run them with asv (see asv.conf.json in the repository root)::
+
+    asv run --python=same
+    asv compare v1.5.0 HEAD
+
+or offline without any further dependency::
+
+    python -m benchmarks                      # all benchmarks
+    python -m benchmarks ert traveltime       # filtered by name
+    python -m benchmarks --save new.json --compare old.json
+"""
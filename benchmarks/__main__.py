@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Offline runner for the asv-style benchmarks of this package.
+
+Every benchmark and parameter combination runs in a fresh (spawned)
+process so peak memory is measured per case and includes memory allocated
+by the C++ core.
+"""
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import multiprocessing
+import os
+import pkgutil
+import sys
+import time
+import timeit
+
+
+def _peakRSS():
+    """Peak resident memory of the current process in MB."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float('nan')
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == 'darwin' else peak / 1024
+
+
+def collect(patterns=None):
+    """Return (module, class name, method name) of all benchmarks."""
+    pkg = importlib.import_module(__package__ or 'benchmarks')
+    cases = []
+    for info in pkgutil.iter_modules(pkg.__path__):
+        if not info.name.startswith('bench_'):
+            continue
+        mod = importlib.import_module(pkg.__name__ + '.' + info.name)
+        for clsName, cls in inspect.getmembers(mod, inspect.isclass):
+            if cls.__module__ != mod.__name__:
+                continue
+            for name, _ in inspect.getmembers(cls, inspect.isfunction):
+                if not name.startswith(('time_', 'peakmem_')):
+                    continue
+                key = '.'.join([info.name[6:], clsName, name])
+                if patterns and not any(p in key for p in patterns):
+                    continue
+                cases.append((mod.__name__, clsName, name))
+    return cases
+
+
+def paramSets(cls):
+    """All parameter combinations of a benchmark class."""
+    params = getattr(cls, 'params', [])
+    names = getattr(cls, 'param_names', [])
+    if len(names) <= 1:  # asv allows a flat list for a single parameter
+        params = [params] if len(names) == 1 else []
+    return list(itertools.product(*params))
+
+
+def _runCase(modName, clsName, name, params, repeat, queue):
+    """Run one benchmark case, put the result into queue."""
+    try:
+        cls = getattr(importlib.import_module(modName), clsName)
+        bench = cls()
+        if hasattr(bench, 'setup'):
+            bench.setup(*params)
+        fun = getattr(bench, name)
+        res = dict(setupMemory=_peakRSS())
+        if name.startswith('time_'):
+            fun(*params)  # warm up
+            times = timeit.repeat(lambda: fun(*params), number=1,
+                                  repeat=repeat)
+            res['time'] = min(times)
+        else:
+            fun(*params)
+        res['peakMemory'] = _peakRSS()
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*params)
+    except NotImplementedError as e:  # asv convention to skip
+        res = dict(skipped=str(e))
+    except Exception as e:
+        res = dict(error=repr(e))
+    queue.put(res)
+
+
+def run(cases, repeat=3, timeout=600):
+    """Run all cases, each in a fresh process, return results as dict."""
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+    for modName, clsName, name in cases:
+        cls = getattr(importlib.import_module(modName), clsName)
+        for params in paramSets(cls):
+            key = '{}.{}.{}({})'.format(modName.split('.')[-1][6:], clsName,
+                                        name, ', '.join(map(str, params)))
+            queue = ctx.Queue()
+            p = ctx.Process(target=_runCase,
+                            args=(modName, clsName, name, params, repeat,
+                                  queue))
+            tic = time.perf_counter()
+            p.start()
+            try:
+                res = queue.get(timeout=getattr(cls, 'timeout', timeout))
+            except Exception:
+                p.terminate()
+                res = dict(error='timeout')
+            p.join()
+            res['wall'] = time.perf_counter() - tic
+            results[key] = res
+            print(formatResult(key, res), flush=True)
+    return results
+
+
+def formatResult(key, res, ref=None):
+    """One line of the result table."""
+    if 'skipped' in res:
+        return '{:<64s} skipped: {}'.format(key, res['skipped'])
+    if 'error' in res:
+        return '{:<64s} failed: {}'.format(key, res['error'])
+
+    line = '{:<64s}'.format(key)
+    if 'time' in res:
+        line += '{:>12.4f} s'.format(res['time'])
+        if ref is not None and ref.get('time'):
+            line += ' ({:5.2f}x)'.format(res['time'] / ref['time'])
+    else:
+        line += '{:>12.1f} MB'.format(res['peakMemory'])
+        if ref is not None and ref.get('peakMemory'):
+            line += ' ({:5.2f}x)'.format(res['peakMemory'] /
+                                         ref['peakMemory'])
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks',
+        description='Run pyGIMLi benchmarks without asv.')
+    parser.add_argument('patterns', nargs='*',
+                        help='only run benchmarks containing one of these '
+                             'strings, e.g., "ert" or "Assembly2D.time_"')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+                        help='repetitions per timing, minimum is reported')
+    parser.add_argument('-s', '--save', help='save results as JSON')
+    parser.add_argument('-c', '--compare',
+                        help='JSON results of an earlier run to compare '
+                             'with (ratio new/old)')
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='list benchmarks only')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))))
+    cases = collect(args.patterns)
+    if args.list:
+        for c in cases:
+            print('.'.join(c))
+        return
+
+    results = run(cases, repeat=args.repeat)
+
+    if args.compare:
+        with open(args.compare) as fi:
+            ref = json.load(fi)['results']
+        print('\ncompared to', args.compare)
+        for key, res in results.items():
+            print(formatResult(key, res, ref.get(key)))
+
+    if args.save:
+        import pygimli as pg
+        with open(args.save, 'w') as fi:
+            json.dump(dict(version=pg.versionStr(), date=time.time(),
+                           results=results), fi, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Hashing of function arguments for pg.cache."""
+import numpy as np
+
+from pygimli.utils.cache import CacheManager, valHash
+
+from .common import createWorldMesh
+
+
+def _cachedFunction(mesh, values, name='test', factor=1.0):
+    return values * factor
+
+
+class CacheHash:
+    """Hash of large arrays and meshes as used by the @pg.cache decorator."""
+
+    params = [10**4, 10**5, 10**6]
+    param_names = ['size']
+
+    def setup(self, n):
+        self.vec = np.linspace(0, 1, n)
+        self.mat = self.vec.reshape(-1, 100)
+        self.mesh = createWorldMesh(1e4 / min(n, 10**5))
+
+    def time_valHashVector(self, n):
+        valHash(self.vec)
+
+    def time_valHashMatrix(self, n):
+        valHash(self.mat)
+
+    def time_cacheManagerHash(self, n):
+        CacheManager().hash(_cachedFunction, self.mesh, self.vec,
+                            name='bench', factor=2.0)
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""ERT forward response and Jacobian."""
+import numpy as np
+
+import pygimli as pg
+import pygimli.meshtools as mt
+from pygimli.physics import ert
+
+
+class ERTModelling:
+    """Dipole-dipole profile on a 2D parametric mesh."""
+
+    params = [24, 48, 96]
+    param_names = ['electrodes']
+    timeout = 600
+
+    def setup(self, nElecs):
+        self.data = ert.createData(elecs=np.linspace(0, nElecs - 1, nElecs),
+                                   schemeName='dd')
+        mesh = mt.createParaMesh(self.data.sensors(), quality=33.4,
+                                 paraMaxCellSize=1.0, paraDepth=nElecs / 4)
+        self.fop = ert.ERTModelling()
+        self.fop.setData(self.data)
+        self.fop.setMesh(mesh)
+        self.model = np.full(self.fop.parameterCount, 100.)
+        self.fop.response(self.model)  # build the forward mesh once
+
+    def time_response(self, nElecs):
+        self.fop.response(self.model)
+
+    def time_createJacobian(self, nElecs):
+        self.fop.createJacobian(self.model)
+
+    def peakmem_createJacobian(self, nElecs):
+        self.fop.createJacobian(self.model)
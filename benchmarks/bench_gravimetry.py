@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Holstein gravity and magnetics kernel."""
+import numpy as np
+
+from pygimli.physics.gravimetry import SolveGravMagHolstein
+
+from .common import createBoxMesh
+
+
+class HolsteinKernel:
+    """Kernel of a regular 3D grid for a surface grid of stations."""
+
+    params = [[8, 16, 24], [['gz'], ['gx', 'gy', 'gz']]]
+    param_names = ['cells', 'components']
+    timeout = 600
+
+    def setup(self, n, cmp):
+        self.mesh = createBoxMesh(n)
+        x = np.linspace(-40, 40, 10)
+        X, Y = np.meshgrid(x, x)
+        self.pnts = np.column_stack([X.ravel(), Y.ravel(),
+                                     np.full(X.size, 1.)])
+
+    def time_kernel(self, n, cmp):
+        SolveGravMagHolstein(self.mesh, self.pnts, cmp=cmp)
+
+    def peakmem_kernel(self, n, cmp):
+        SolveGravMagHolstein(self.mesh, self.pnts, cmp=cmp)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Mesh generation, Gmsh import and interpolation."""
+import os
+import tempfile
+
+import numpy as np
+
+import pygimli as pg
+import pygimli.meshtools as mt
+
+from .common import createWorldMesh, writeGmsh
+
+
+class CreateMesh:
+    """Triangle mesh generation of a half space with a circle."""
+
+    params = [1.0, 0.1, 0.01]
+    param_names = ['area']
+
+    def time_createMesh(self, area):
+        createWorldMesh(area)
+
+    def peakmem_createMesh(self, area):
+        createWorldMesh(area)
+
+
+class ReadGmsh:
+    """Import of an ASCII MSH 2.2 file."""
+
+    params = [1.0, 0.1, 0.01]
+    param_names = ['area']
+
+    def setup(self, area):
+        self.tmp = tempfile.mkdtemp()
+        self.fileName = os.path.join(self.tmp, 'mesh.msh')
+        writeGmsh(createWorldMesh(area), self.fileName)
+
+    def teardown(self, area):
+        os.remove(self.fileName)
+        os.rmdir(self.tmp)
+
+    def time_readGmsh(self, area):
+        mt.readGmsh(self.fileName)
+
+
+class Interpolate:
+    """Cell data of one mesh interpolated to another mesh."""
+
+    params = [1.0, 0.1, 0.01]
+    param_names = ['area']
+
+    def setup(self, area):
+        self.inMesh = createWorldMesh(area)
+        self.outMesh = createWorldMesh(area * 0.7)
+        self.cellData = pg.x(self.inMesh.cellCenters())
+        self.nodeData = pg.x(self.inMesh.positions())
+
+    def time_interpolateCellData(self, area):
+        pg.interpolate(self.outMesh, self.inMesh, self.cellData)
+
+    def time_interpolateNodeData(self, area):
+        pg.interpolate(self.outMesh, self.inMesh, self.nodeData)
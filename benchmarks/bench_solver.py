@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Finite element assembly."""
+import numpy as np
+
+import pygimli as pg
+
+from .common import createBoxMesh, createWorldMesh
+
+
+class Assembly2D:
+    """Stiffness and mass matrix of a 2D triangle mesh."""
+
+    params = [1.0, 0.1, 0.01]
+    param_names = ['area']
+
+    def setup(self, area):
+        self.mesh = createWorldMesh(area)
+        self.a = np.full(self.mesh.cellCount(), 2.)
+
+    def time_createStiffnessMatrix(self, area):
+        pg.solver.createStiffnessMatrix(self.mesh, self.a)
+
+    def time_createMassMatrix(self, area):
+        pg.solver.createMassMatrix(self.mesh, self.a)
+
+    def peakmem_createStiffnessMatrix(self, area):
+        pg.solver.createStiffnessMatrix(self.mesh, self.a)
+
+
+class Assembly3D:
+    """Stiffness and mass matrix of a 3D hexahedral grid."""
+
+    params = [10, 20, 40]
+    param_names = ['cells']
+
+    def setup(self, n):
+        self.mesh = createBoxMesh(n)
+        self.a = np.full(self.mesh.cellCount(), 2.)
+
+    def time_createStiffnessMatrix(self, n):
+        pg.solver.createStiffnessMatrix(self.mesh, self.a)
+
+    def time_createMassMatrix(self, n):
+        pg.solver.createMassMatrix(self.mesh, self.a)
+
+    def peakmem_createStiffnessMatrix(self, n):
+        pg.solver.createStiffnessMatrix(self.mesh, self.a)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+"""Dijkstra and fat-ray traveltime modelling."""
+import numpy as np
+
+import pygimli as pg
+from pygimli.physics import traveltime as tt
+
+
+class TravelTimeDijkstra:
+    """Crosshole geometry on a regular grid with secondary nodes."""
+
+    params = [[16, 32, 64], [False, True]]
+    param_names = ['cells', 'fatray']
+    timeout = 600
+
+    def setup(self, n, fatray):
+        mesh = pg.createGrid(n + 1, n + 1)
+        sensors = [(0, i) for i in range(0, n + 1, 2)] + \
+            [(n, i) for i in range(0, n + 1, 2)]
+        data = tt.createRAData(sensors, shotDistance=len(sensors) // 2)
+        data['t'] = 1.0
+        self.mgr = tt.TravelTimeManager(data, fatray=fatray, verbose=False)
+        self.mgr.applyMesh(mesh, secNodes=3)
+        self.model = np.full(self.mgr.fop.parameterCount, 1.)
+
+    def time_response(self, n, fatray):
+        self.mgr.fop.response(self.model)
+
+    def time_createJacobian(self, n, fatray):
+        self.mgr.fop.createJacobian(self.model)
+
+    def peakmem_createJacobian(self, n, fatray):
+        self.mgr.fop.createJacobian(self.model)
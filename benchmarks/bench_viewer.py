@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Mesh conversion for the matplotlib and pyvista viewers."""
+import numpy as np
+
+import pygimli as pg
+
+from .common import createBoxMesh, createWorldMesh
+
+
+class MplConversion:
+    """Triangles and patches for 2D drawing with matplotlib."""
+
+    params = [1.0, 0.1, 0.01]
+    param_names = ['area']
+
+    def setup(self, area):
+        import matplotlib
+        matplotlib.use('Agg')
+        self.mesh = createWorldMesh(area)
+        self.data = pg.x(self.mesh.cellCenters())
+
+    def time_createTriangles(self, area):
+        from pygimli.viewer.mpl.meshview import createTriangles
+        if hasattr(self.mesh, '_triData'):
+            del self.mesh._triData  # result is cached at the mesh
+        createTriangles(self.mesh)
+
+    def time_drawModel(self, area):
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots()
+        pg.viewer.mpl.drawModel(ax, self.mesh, self.data)
+        plt.close(fig)
+
+
+class PyVistaConversion:
+    """Conversion of 3D meshes into pyvista meshes."""
+
+    params = [10, 20, 40]
+    param_names = ['cells']
+
+    def setup(self, n):
+        pv = pg.optImport('pyvista', requiredFor='pyvista benchmarks')
+        if pv is None:
+            raise NotImplementedError('pyvista not installed')
+        self.mesh = createBoxMesh(n)
+        self.data = pg.z(self.mesh.cellCenters())
+
+    def time_pgMesh2pvMesh(self, n):
+        from pygimli.viewer.pv.utils import pgMesh2pvMesh
+        pgMesh2pvMesh(self.mesh, self.data, label='z')
+
+    def peakmem_pgMesh2pvMesh(self, n):
+        from pygimli.viewer.pv.utils import pgMesh2pvMesh
+        pgMesh2pvMesh(self.mesh, self.data, label='z')
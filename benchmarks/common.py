@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Test problems shared by the benchmarks."""
+import numpy as np
+
+import pygimli as pg
+import pygimli.meshtools as mt
+
+
+def createWorldMesh(area, quality=33.4):
+    """Triangle mesh of a 2D half space 100 m x 50 m with a circle.
+
+    The cell count scales with 1/area (about 10000/area cells).
+    """
+    world = mt.createWorld(start=[-50, 0], end=[50, -50], worldMarker=True)
+    circle = mt.createCircle(pos=[0, -15], radius=5, marker=2)
+    return mt.createMesh(world + circle, area=area, quality=quality)
+
+
+def createBoxMesh(n):
+    """Regular 3D hexahedral grid with n cells per dimension."""
+    x = np.linspace(-50, 50, n + 1)
+    z = np.linspace(-100, 0, n + 1)
+    return pg.createGrid(x, x, z)
+
+
+def writeGmsh(mesh, fileName):
+    """Write a 2D triangle mesh as ASCII MSH 2.2 file."""
+    pos = np.array(mesh.positions())
+    cells = np.array([c.ids() for c in mesh.cells()]) + 1
+    markers = np.array(mesh.cellMarkers())
+    with open(fileName, 'w') as fi:
+        fi.write('$MeshFormat\n2.2 0 8\n$EndMeshFormat\n')
+        fi.write('$Nodes\n{}\n'.format(len(pos)))
+        np.savetxt(fi, np.column_stack([np.arange(1, len(pos) + 1), pos]),
+                   fmt='%d %.12g %.12g %.12g')
+        fi.write('$EndNodes\n$Elements\n{}\n'.format(len(cells)))
+        # id type=2 (triangle) 2 tags: physical, elementary
+        np.savetxt(fi, np.column_stack([
+            np.arange(1, len(cells) + 1), np.full(len(cells), 2),
+            np.full(len(cells), 2), markers, markers, cells]), fmt='%d')
+        fi.write('$EndElements\n')
@@ -153,6 +153,131 @@ WRAPPER_REGISTRATION_R3Vector = [
 ]
 
 
+WRAPPER_DEFINITION_RMatrix =\
+    """
+#include <numpy/arrayobject.h>
+
+PyObject * RMatrix_getArray(GIMLI::RMatrix & mat){
+    import_array2("Cannot import numpy c-api from pygimli hand_make_wrapper", NULL);
+    // rows are stored separately, so we can only offer one bulk copy
+    npy_intp dims[2] = {(npy_intp)mat.rows(), (npy_intp)mat.cols()};
+    PyObject * ret = PyArray_SimpleNew(2, dims, NPY_DOUBLE);
+    if (dims[0] * dims[1] > 0){
+        mat.dumpData((double *)PyArray_DATA(
+                            reinterpret_cast<PyArrayObject*>(ret)));
+    }
+    return ret;
+}
+
+void RMatrix_setArray(GIMLI::RMatrix & mat, PyObject * arr){
+    if (_import_array() < 0) bp::throw_error_already_set();
+
+    PyArrayObject * a = (PyArrayObject *)PyArray_FROMANY(arr, NPY_DOUBLE,
+                                           2, 2, NPY_ARRAY_IN_ARRAY);
+    if (!a) bp::throw_error_already_set();
+    mat.fromData((double *)PyArray_DATA(a),
+                 (GIMLI::Index)PyArray_DIM(a, 0),
+                 (GIMLI::Index)PyArray_DIM(a, 1));
+    Py_DECREF(a);
+}
+
+"""
+WRAPPER_REGISTRATION_RMatrix = [
+    """def("array", &RMatrix_getArray,
+       "PyGIMLI Helper Function: copy the matrix into a 2D numpy array with one bulk copy ");""",
+    """def("setArray", &RMatrix_setArray,
+       "PyGIMLI Helper Function: fill the matrix from a 2D numpy array with one bulk copy ");""",
+]
+
+
+WRAPPER_DEFINITION_SparseMatrix =\
+    """
+#include <numpy/arrayobject.h>
+
+PyObject * %(name)s_createView_(PyObject * owner, void * data,
+                                 npy_intp length, int typenum,
+                                 bool writeable){
+    import_array2("Cannot import numpy c-api from pygimli hand_make_wrapper", NULL);
+    PyObject * ret = PyArray_SimpleNewFromData(1, &length, typenum, data);
+    if (!writeable){
+        PyArray_CLEARFLAGS(reinterpret_cast<PyArrayObject*>(ret),
+                           NPY_ARRAY_WRITEABLE);
+    }
+    // the view holds a reference to the matrix to keep the memory alive
+    Py_INCREF(owner);
+    PyArray_SetBaseObject(reinterpret_cast<PyArrayObject*>(ret), owner);
+    return ret;
+}
+
+PyObject * %(name)s_getColPtrArray(bp::object self){
+    const %(type)s & mat = bp::extract< const %(type)s & >(self);
+    return %(name)s_createView_(self.ptr(),
+                                (void *)mat.vecColPtr().data(),
+                                (npy_intp)mat.vecColPtr().size(),
+                                NPY_INT, false);
+}
+
+PyObject * %(name)s_getRowIdxArray(bp::object self){
+    const %(type)s & mat = bp::extract< const %(type)s & >(self);
+    return %(name)s_createView_(self.ptr(),
+                                (void *)mat.vecRowIdx().data(),
+                                (npy_intp)mat.vecRowIdx().size(),
+                                NPY_INT, false);
+}
+
+PyObject * %(name)s_getValsArray(bp::object self){
+    %(type)s & mat = bp::extract< %(type)s & >(self);
+    return %(name)s_createView_(self.ptr(),
+                                (void *)mat.vecVals().data(),
+                                (npy_intp)mat.vecVals().size(),
+                                %(npyType)s, true);
+}
+
+void %(name)s_setCRSArrays(%(type)s & mat,
+                           PyObject * colPtr, PyObject * rowIdx,
+                           PyObject * vals, GIMLI::Index cols){
+    if (_import_array() < 0) bp::throw_error_already_set();
+
+    PyArrayObject * c = (PyArrayObject *)PyArray_FROMANY(colPtr, NPY_INT,
+                                           1, 1, NPY_ARRAY_IN_ARRAY);
+    if (!c) bp::throw_error_already_set();
+    PyArrayObject * r = (PyArrayObject *)PyArray_FROMANY(rowIdx, NPY_INT,
+                                           1, 1, NPY_ARRAY_IN_ARRAY);
+    if (!r) { Py_DECREF(c); bp::throw_error_already_set(); }
+    PyArrayObject * v = (PyArrayObject *)PyArray_FROMANY(vals, %(npyType)s,
+                                           1, 1, NPY_ARRAY_IN_ARRAY);
+    if (!v) { Py_DECREF(c); Py_DECREF(r); bp::throw_error_already_set(); }
+
+    const int * cData = (const int *)PyArray_DATA(c);
+    const int * rData = (const int *)PyArray_DATA(r);
+    std::vector < int > vColPtr(cData, cData + PyArray_SIZE(c));
+    std::vector < int > vRowIdx(rData, rData + PyArray_SIZE(r));
+    %(vectorType)s vVals(PyArray_SIZE(v));
+    if (vVals.size() > 0){
+        std::memcpy((void *)vVals.data(), PyArray_DATA(v),
+                    vVals.size() * sizeof(%(valueType)s));
+    }
+    Py_DECREF(c);
+    Py_DECREF(r);
+    Py_DECREF(v);
+
+    mat = %(type)s(vColPtr, vRowIdx, vVals);
+    // the constructor counts the columns up to the last non-zero entry
+    if (cols > mat.cols()) mat.setCols(cols);
+}
+
+"""
+WRAPPER_REGISTRATION_SparseMatrix = [
+    """def("vecColPtrArray", &%(name)s_getColPtrArray,
+       "PyGIMLI Helper Function: read-only numpy view (no copy) on the row pointers of the CRS storage ");""",
+    """def("vecRowIdxArray", &%(name)s_getRowIdxArray,
+       "PyGIMLI Helper Function: read-only numpy view (no copy) on the column indices of the CRS storage ");""",
+    """def("vecValsArray", &%(name)s_getValsArray,
+       "PyGIMLI Helper Function: numpy view (no copy) on the values of the CRS storage ");""",
+    """def("setCRSArrays", &%(name)s_setCRSArrays,
+       "PyGIMLI Helper Function: fill from numpy CRS arrays (colPtr, rowIdx, vals) and column count with one bulk copy each ");""",
+]
+
 WRAPPER_DEFINITION_General = \
     """
 bool checkDataWrapper()
@@ -223,6 +348,30 @@ def apply(mb):
     #rt.add_declaration_code(WRAPPER_DEFINITION_IndexArray)
     #apply_reg(rt, WRAPPER_REGISTRATION_IndexArray)
 
+    print("Register 'Matrix<double>' handmade wrapper")
+    try:
+        rt = mb.class_('Matrix<double>')
+        rt.add_declaration_code(WRAPPER_DEFINITION_RMatrix)
+        apply_reg(rt, WRAPPER_REGISTRATION_RMatrix)
+    except Exception as e:
+        print("Failed to register 'Matrix<double>' handmade wrapper:", e)
+
+    for cls, name, vType, vecType, npyType in [
+            ('SparseMatrix<double>', 'RSparseMatrix', 'double',
+             'GIMLI::RVector', 'NPY_DOUBLE'),
+            ('SparseMatrix< std::complex< double > >', 'CSparseMatrix',
+             'GIMLI::Complex', 'GIMLI::CVector', 'NPY_CDOUBLE')]:
+        print("Register '{0}' handmade wrapper".format(cls))
+        args = {'name': name, 'type': 'GIMLI::' + name, 'valueType': vType,
+                'vectorType': vecType, 'npyType': npyType}
+        try:
+            rt = mb.class_(cls)
+            rt.add_declaration_code(WRAPPER_DEFINITION_SparseMatrix % args)
+            apply_reg(rt,
+                      [r % args for r in WRAPPER_REGISTRATION_SparseMatrix])
+        except Exception as e:
+            print("Failed to register '{0}' handmade wrapper:".format(cls), e)
+
     rt = mb.class_('Vector< GIMLI::Pos >')
     rt.add_declaration_code(WRAPPER_DEFINITION_R3Vector)
     apply_reg(rt, WRAPPER_REGISTRATION_R3Vector)
@@ -65,6 +65,12 @@ public:
 
     inline RVector geometricFactor() { return k_; }
 
+    /*! Abscissae of the digital (J0) Hankel filter. */
+    inline RVector filterAbscissae() const { return myx_; }
+
+    /*! Weights of the digital (J0) Hankel filter. */
+    inline RVector filterWeights() const { return myw_; }
+
     template < class Vec > Vec rhoaT(const Vec & rho, const RVector & thk){
         Vec tmp;
         tmp  = pot1dT<Vec>(am_, rho, thk);
@@ -1087,6 +1087,9 @@ public:
     inline Index nVals() const { return vals_.size(); }
     inline Index cols() const { return cols_; }
     inline Index rows() const { return rows_; }
+    /*! Set the number of columns, e.g., for trailing empty columns that
+     * cannot be derived from the column indices. */
+    inline void setCols(Index cols) { cols_ = cols; }
     inline Index nCols() const { return cols(); }
     inline Index nRows() const { return rows(); }
 
@@ -917,128 +917,80 @@ def asvector(array):
 # ##########################
 
 
-def __GLOBAL__response_mt_shm_(fop, model, shm, i):
-    resp = fop.response_mt(model, i)
-
-    for j in range(len(resp)):
-        shm[j] = resp[j]
-
-
 def __ModellingBase__createJacobian_mt__(self, model, resp):
-    from math import ceil
-    from multiprocessing import Process, Array
-    import numpy as np
+    """Brute force Jacobian using a persistent pool of worker processes.
 
-    nModel = len(model)
-    # nData = len(resp)  # not used
-
-    fak = 1.05
+    The pool is started on first use with multiThreadJacobian() workers,
+    limited to the CPU budget (see :py:mod:`pygimli.core.parallel`), and
+    stays alive for later calls (see :py:mod:`pygimli.core.workerpool`).
+    """
+    from .workerpool import workerPool
 
-    dModel = pgcore.RVector(len(model))
     nProcs = self.multiThreadJacobian()
+    pool = None
+    if nProcs > 1:
+        pool = workerPool(self, nProcs)
 
-    if sys.platform == 'win32' or sys.platform == 'darwin':
-        # strange pickle problem: see  python test_PhysicsManagers.py ves
-        from .logger import warn
-        warn('Multiprocess Jacobian currently unavailable for Win32 and Mac.')
-        nProcs = 1
-
-    if nProcs == 1:
+    if pool is None:
         self.createJacobian(model, resp)
         return
 
-    shm = []
+    if self.verbose():
+        print("Jacobian MT: {0} parameters on {1} workers".format(
+            len(model), pool.nWorkers))
 
     oldBertThread = self.threadCount()
     self.setThreadCount(1)
+    try:
+        J = pool.jacobian(model, resp, fak=1.05)
+    finally:
+        self.setThreadCount(oldBertThread)
 
-    # print("Model/Data/nProcs", nModel, nData, nProcs,
-    #       int(ceil(float(nModel)/nProcs)))
-    for pCount in range(int(ceil(float(nModel) / nProcs))):
-        procs = []
-        if self.verbose():
-            print("Jacobian MT:(", pCount * nProcs, "--",
-                  (pCount + 1) * nProcs, ") /", nModel, '... ')
-
-        for i in range(int(pCount * nProcs), int((pCount + 1) * nProcs)):
-            if i < nModel:
-                modelChange = pgcore.RVector(model)
-                modelChange[i] *= fak
-                dModel[i] = modelChange[i] - model[i]
-
-                shm.append(Array('d', len(resp)))
-                procs.append(
-                    Process(target=__GLOBAL__response_mt_shm_,
-                            args=(self, modelChange, shm[i], i)))
-
-        for i, p in enumerate(procs):
-            p.start()
-
-        for i, p in enumerate(procs):
-            p.join()
-
-        # if self.verbose():
-        #     print(dur(), 's')
-    self.setThreadCount(oldBertThread)
-
-    for i in range(nModel):
-        dData = np.array(shm[i]) - resp
-        self._J.setCol(i, dData / dModel[i])
+    # J holds one row per model parameter, i.e., the transposed Jacobian
+    if hasattr(self._J, 'setArray'):
+        self._J.setArray(np.ascontiguousarray(J.T))
+    else:
+        self._J.resize(J.shape[1], J.shape[0])
+        for i, row in enumerate(J.T):
+            self._J.setRow(i, row)
 
 
 def __ModellingBase__responses_mt__(self, models, respos):
+    """Responses for multiple models (N, nModel) into respos (N, nData)."""
+    from .workerpool import workerPool
 
-    nModel = len(models)
     nProcs = self.multiThreadJacobian()
-
-    if nProcs == 1:
+    pool = None
+    if nProcs > 1:
+        if models.ndim != 2:
+            raise BaseException("models need to be a matrix(N, nModel):" +
+                                str(models.shape))
+        if respos.ndim != 2:
+            raise BaseException("respos need to be a matrix(N, nData):" +
+                                str(respos.shape))
+        pool = workerPool(self, nProcs)
+
+    if pool is None:
         for i, m in enumerate(models):
             respos[i] = self.response_mt(m, i)
         return
 
-    from math import ceil
-    from multiprocessing import Process, Array
-    import numpy as np
-
-    if models.ndim != 2:
-        raise BaseException("models need to be a matrix(N, nModel):" +
-                            str(models.shape))
-    if respos.ndim != 2:
-        raise BaseException("respos need to be a matrix(N, nData):" +
-                            str(respos.shape))
-
-    nData = len(respos[0])
-    shm = []
-
     oldBertThread = self.threadCount()
     self.setThreadCount(1)
+    try:
+        respos[:] = pool.responses(models, respos.shape[1])
+    finally:
+        self.setThreadCount(oldBertThread)
 
-    # print("*"*100)
-    # print(nModel, nProcs)
-    # print("*"*100)
-    for pCount in range(int(ceil(nModel / nProcs))):
-        procs = []
-        if self.verbose():
-            print(pCount * nProcs, "/", nModel)
-        for i in range(int(pCount * nProcs), int((pCount + 1) * nProcs)):
-
-            if i < nModel:
-                shm.append(Array('d', nData))
-                procs.append(
-                    Process(target=__GLOBAL__response_mt_shm_,
-                            args=(self, models[i], shm[i], i)))
-
-        for i, p in enumerate(procs):
-            p.start()
-
-        for i, p in enumerate(procs):
-            p.join()
 
-    self.setThreadCount(oldBertThread)
+def __ModellingBase__closeWorkerPool__(self):
+    """Stop the worker processes of the multiprocess Jacobian.
 
-    for i in range(nModel):
-        resp = np.array(shm[i])
-        respos[i] = resp
+    Needed after changing the operator, since the workers hold a copy of
+    the operator from the time they were started.
+    """
+    from .workerpool import closeWorkerPool
+    closeWorkerPool(self)
 
 
 class ModellingBaseMT__(pgcore.ModellingBase):
@@ -1061,6 +1013,7 @@ class ModellingBaseMT__(pgcore.ModellingBase):
 
 ModellingBaseMT__.createJacobian_mt = __ModellingBase__createJacobian_mt__
 ModellingBaseMT__.responses = __ModellingBase__responses_mt__
+ModellingBaseMT__.closeWorkerPool = __ModellingBase__closeWorkerPool__
 
 ModellingBase = ModellingBaseMT__
 
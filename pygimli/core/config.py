@@ -22,24 +22,58 @@ rc = {
 }
 
 
+def _cgroupCPULimit():
+    """Return the CPU quota of the cgroup (v2 or v1) as number of cores.
+
+    Returns None if there is no quota, e.g., outside a container or if the
+    cgroup filesystem is not available.
+    """
+    try:
+        with open('/sys/fs/cgroup/cpu.max', 'rt') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            return float(quota) / float(period)
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us', 'rt') as f:
+            quota = float(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us', 'rt') as f:
+            period = float(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
 def getCPUCount():
-    """Return number of processors on multiple platoforms."""
-    # Windows
-    if os.name == 'nt':
-        return int(os.getenv('NUMBER_OF_PROCESSORS'))
-    # Linux
-    elif sys.platform == 'linux2':
-        retv = 0
-        with open('/proc/cpuinfo', 'rt') as cpuinfo:
-            for line in cpuinfo:
-                if line[:9] == 'processor':
-                    retv += 1
-        return retv
-
-    # Please add similar hacks for MacOSX, Solaris, Irix,
-    # FreeBSD, HPUX, etc.
+    """Return the number of processors usable by this process.
+
+    Respects the CPU affinity mask (e.g., taskset, batch schedulers) and the
+    CPU quota of the cgroup (e.g., docker --cpus) on Linux. The environment
+    variable PYGIMLI_NUM_CPUS overrides the detection.
+
+    See Also
+    --------
+    pygimli.core.parallel.cpuBudget
+    """
+    env = os.getenv('PYGIMLI_NUM_CPUS')
+    if env:
+        return max(1, int(env))
+
+    if hasattr(os, 'sched_getaffinity'):
+        nCPU = len(os.sched_getaffinity(0))
     else:
-        raise RuntimeError('unknown platform')
+        nCPU = os.cpu_count() or 1
+
+    limit = _cgroupCPULimit()
+    if limit is not None:
+        nCPU = min(nCPU, max(1, int(limit)))
+
+    return max(1, nCPU)
 
 
 def getConfigPath():
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Execution context for parallel code paths.
+
+All parallel code in pyGIMLi asks this module how many worker processes it
+may start and how many C++/BLAS threads every worker may use. The number
+of usable cores (see :py:func:`pygimli.core.config.getCPUCount`) is the
+budget of the main process. Worker processes get their share of the budget
+with :py:func:`initWorker`, so nested parallel sections inside a worker
+only use the cores of this worker instead of oversubscribing the machine.
+
+Example
+-------
+>>> import pygimli as pg
+>>> from pygimli.core.parallel import parallel, cpuBudget
+>>> with parallel(cpus=2):
+...     cpuBudget() <= 2
+True
+"""
+import os
+from contextlib import contextmanager
+
+from .config import getCPUCount
+
+# environment variables of the common OpenMP/BLAS implementations
+_THREAD_ENV = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+               'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS')
+
+# budgets of the enclosing parallel() sections
+__budget__ = []
+
+
+def cpuBudget():
+    """Return the number of cores available to the current code section."""
+    if len(__budget__) > 0:
+        return __budget__[-1]
+    return getCPUCount()
+
+
+def workerCount(nWorkers=None, nTasks=None):
+    """Return the number of worker processes for a parallel section.
+
+    Parameters
+    ----------
+    nWorkers: int [None]
+        Requested number of workers. None or 0 uses the whole budget.
+    nTasks: int [None]
+        Number of independent tasks, more workers would only idle.
+
+    Returns
+    -------
+    n: int
+        Number of workers, at least 1 and at most :py:func:`cpuBudget`.
+    """
+    n = cpuBudget()
+    if nWorkers is not None and nWorkers > 0:
+        n = min(n, int(nWorkers))
+    if nTasks is not None:
+        n = min(n, int(nTasks))
+    return max(1, n)
+
+
+def threadsPerWorker(nWorkers):
+    """Return the C++/BLAS threads for each of nWorkers workers."""
+    return max(1, cpuBudget() // max(1, int(nWorkers)))
+
+
+def _setThreads(nThreads):
+    """Set C++ and OpenMP/BLAS threads, return a function to restore."""
+    from .core import pgcore
+
+    oldCore = pgcore.threadCount()
+    oldEnv = {k: os.environ.get(k) for k in _THREAD_ENV}
+
+    pgcore.setThreadCount(nThreads)
+    for k in _THREAD_ENV:
+        os.environ[k] = str(nThreads)
+
+    # already loaded BLAS libraries ignore the environment
+    limiter = None
+    try:
+        from threadpoolctl import threadpool_limits
+        limiter = threadpool_limits(limits=nThreads)
+    except ImportError:
+        pass
+
+    def restore():
+        pgcore.setThreadCount(oldCore)
+        for k, v in oldEnv.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+        if limiter is not None:
+            limiter.restore_original_limits()
+
+    return restore
+
+
+@contextmanager
+def parallel(cpus=None, threads=None):
+    """Limit the cores of the enclosed code section.
+
+    Nested sections get at most the budget of the enclosing section.
+
+    Parameters
+    ----------
+    cpus: int [None]
+        CPU budget of the section. Default is the current budget.
+    threads: int [None]
+        C++/BLAS threads of the section. Default is the budget.
+
+    Yields
+    ------
+    budget: int
+        The CPU budget of the section.
+    """
+    budget = cpuBudget()
+    if cpus is not None and cpus > 0:
+        budget = max(1, min(int(cpus), budget))
+
+    if threads is None:
+        threads = budget
+
+    __budget__.append(budget)
+    restore = _setThreads(max(1, min(int(threads), budget)))
+    try:
+        yield budget
+    finally:
+        restore()
+        __budget__.pop()
+
+
+def initWorker(nCPUs=1):
+    """Set the budget of a freshly started worker process.
+
+    Call this first in every worker process. The budget is also inherited
+    by workers started from this worker, including the 'spawn' method.
+    """
+    nCPUs = max(1, int(nCPUs))
+    os.environ['PYGIMLI_NUM_CPUS'] = str(nCPUs)
+    __budget__[:] = [nCPUs]
+    _setThreads(nCPUs)
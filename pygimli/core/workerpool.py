@@ -0,0 +1,425 @@
+# -*- coding: utf-8 -*-
+"""Persistent process pool for brute force Jacobians and multiple responses.
+
+The pool is created once per forward operator and keeps its worker
+processes alive between calls. Inputs and results are exchanged over
+shared memory blocks, the work is handed out in small chunks through a
+queue so faster workers simply fetch more chunks. Other parallel code
+paths use the pool by :py:func:`parallelMap`.
+"""
+import sys
+import time
+import weakref
+
+import numpy as np
+
+from .logger import critical, warn
+from .parallel import initWorker, threadsPerWorker, workerCount
+
+
+def _attachSharedMemory(name):
+    """Attach to an existing shared memory block.
+
+    Workers share the resource tracker of the main process, which creates
+    and unlinks the blocks, so attaching must not track them again.
+    """
+    from multiprocessing import shared_memory
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # python < 3.13, registering again is a no-op there
+        return shared_memory.SharedMemory(name=name)
+
+
+def _releaseSharedMemory(shm, unlink=False):
+    """Close (and unlink) a shared memory block.
+
+    Closing fails with BufferError while numpy views of the block exist,
+    the mapping is then released together with the last view. Unlinking
+    is always done, so the block cannot leak.
+    """
+    try:
+        shm.close()
+    except BufferError:
+        pass
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _runTask(fop, kind, inp, out, start, stop, fak, array):
+    """Compute one chunk of work into shared memory.
+
+    All views of the shared memory are local to this function, so they are
+    released before the blocks are closed. Returns the wall times and
+    results (if not written into shared memory) of 'map' chunks.
+    """
+    if kind == 'map':
+        fun, args = inp
+        res = array(out[0], out[1]) if out is not None else None
+        times, results = [], []
+        for k, a in enumerate(args):
+            tic = time.perf_counter()
+            r = fun(fop, *a)
+            times.append(time.perf_counter() - tic)
+            if res is None:
+                results.append(np.asarray(r))
+            else:
+                res[out[2][k]:out[2][k+1]] = r
+        return times, results
+
+    if kind == 'jacobian':
+        nModel, nData = out[1]
+        vals = array(*inp)
+        model, resp = vals[:nModel], vals[nModel:nModel+nData]
+        J = array(*out)
+        for i in range(start, stop):
+            modelChange = np.array(model)
+            modelChange[i] *= fak
+            dModel = modelChange[i] - model[i]
+            r = np.asarray(fop.response_mt(modelChange, i))
+            J[i] = (r - resp) / dModel
+    else:
+        models = array(*inp)
+        resps = array(*out)
+        for i in range(start, stop):
+            resps[i] = fop.response_mt(models[i], i)
+    return None
+
+
+def _workerLoop(fop, tasks, done, nThreads):
+    """Process chunks of work until None is received."""
+    initWorker(nThreads)
+    if hasattr(fop, 'setThreadCount'):
+        fop.setThreadCount(nThreads)
+    blocks = {}
+
+    def _array(name, shape):
+        if name not in blocks:
+            blocks[name] = _attachSharedMemory(name)
+        return np.ndarray(shape, dtype=float, buffer=blocks[name].buf)
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        job, kind, inp, out, start, stop, fak = task
+        try:
+            payload = _runTask(fop, kind, inp, out, start, stop, fak, _array)
+            done.put((job, start, stop, None, payload))
+        except Exception as e:
+            done.put((job, start, stop, repr(e), None))
+
+    for shm in blocks.values():
+        _releaseSharedMemory(shm)
+
+
+class ModellingPool(object):
+    """Persistent worker processes for a forward operator.
+
+    Workers call fop.response_mt() for chunks of model changes
+    (Jacobian columns) or complete models (multiple responses) and write
+    straight into shared memory.
+
+    Note, the workers hold a copy of the operator from the time they were
+    started. The pool is therefore closed by :py:func:`closeWorkerPool`
+    whenever the operator changes (data, mesh, regions, transformation)
+    and at the start of every inversion run, so the next call starts fresh
+    workers. Operators changed otherwise need to call it themselves.
+
+    Attributes
+    ----------
+    nWorkers: int
+        Number of worker processes.
+    nThreads: int
+        C++/BLAS threads of every worker, their share of the CPU budget
+        (see :py:mod:`pygimli.core.parallel`).
+    method: str
+        Multiprocessing start method ('fork', 'spawn', 'forkserver').
+        With 'spawn' and 'forkserver' the operator needs to be picklable.
+        Default is 'fork' on Linux and 'spawn' on Windows and macOS.
+    """
+
+    def __init__(self, fop, nWorkers, method=None):
+        """Start nWorkers processes for fop."""
+        import multiprocessing
+        from multiprocessing import resource_tracker
+
+        # workers need to inherit the tracker of the shared memory blocks
+        resource_tracker.ensure_running()
+
+        if method is None:
+            method = 'fork' if sys.platform.startswith('linux') else 'spawn'
+
+        self.nWorkers = nWorkers
+        self.nThreads = threadsPerWorker(nWorkers)
+        self.method = method
+        self._ctx = multiprocessing.get_context(method)
+        self._tasks = self._ctx.Queue()
+        self._done = self._ctx.Queue()
+        self._blocks = {}
+        self._job = 0
+
+        self._procs = [self._ctx.Process(target=_workerLoop,
+                                         args=(fop, self._tasks, self._done,
+                                               self.nThreads),
+                                         daemon=True)
+                       for _ in range(nWorkers)]
+        for p in self._procs:
+            p.start()
+
+        self._finalizer = weakref.finalize(self, ModellingPool._shutdown,
+                                           self._procs, self._tasks,
+                                           self._blocks)
+
+    @staticmethod
+    def _shutdown(procs, tasks, blocks):
+        for p in procs:
+            if p.is_alive():
+                tasks.put(None)
+        for p in procs:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+        for shm in blocks.values():
+            _releaseSharedMemory(shm, unlink=True)
+        blocks.clear()
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        self._finalizer()
+
+    @property
+    def alive(self):
+        """True if all workers are running."""
+        return self._finalizer.alive and all(p.is_alive()
+                                             for p in self._procs)
+
+    def _buffer(self, key, shape):
+        """Shared array for key, the memory block is reused if large
+        enough."""
+        from multiprocessing import shared_memory
+        size = max(int(np.prod(shape)) * 8, 8)
+        shm = self._blocks.get(key)
+        if shm is None or shm.size < size:
+            if shm is not None:
+                _releaseSharedMemory(shm, unlink=True)
+            shm = shared_memory.SharedMemory(create=True, size=size)
+            self._blocks[key] = shm
+        return (shm.name, tuple(shape)), np.ndarray(shape, dtype=float,
+                                                    buffer=shm.buf)
+
+    def _chunks(self, n, chunkSize=None):
+        """Start and stop indices of the chunks for n items."""
+        if chunkSize is None:
+            chunkSize = max(1, n // (self.nWorkers * 4))
+        return [(start, min(start + chunkSize, n))
+                for start in range(0, n, chunkSize)]
+
+    def _run(self, kind, inp, out, n, fak=1.0, chunkSize=None):
+        """Distribute n items in chunks and wait for all of them."""
+        return self._process([(kind, inp, out, start, stop, fak)
+                              for start, stop in self._chunks(n, chunkSize)])
+
+    def _process(self, chunks):
+        """Hand out chunks (kind, inp, out, start, stop, fak) and wait for
+        all of them. Returns the chunk results ordered by start."""
+        import queue
+
+        self._job += 1
+        for chunk in chunks:
+            self._tasks.put((self._job,) + tuple(chunk))
+
+        nChunks = len(chunks)
+        payloads = {}
+        errors = []
+        while nChunks > 0:
+            try:
+                job, start, _, err, payload = self._done.get(timeout=1)
+            except queue.Empty:
+                if not all(p.is_alive() for p in self._procs):
+                    self.close()
+                    critical("Worker process died, exit codes:",
+                             [p.exitcode for p in self._procs])
+                continue
+            if job != self._job:
+                continue
+            nChunks -= 1
+            if err is not None:
+                errors.append(err)
+            payloads[start] = payload
+
+        if len(errors) > 0:
+            critical("Worker failed:", errors[0])
+
+        return [payloads[start] for start in sorted(payloads)]
+
+    def jacobian(self, model, resp, fak=1.05, chunkSize=None):
+        """Brute force Jacobian as (nModel, nData) array, i.e., one row per
+        model parameter (Jacobian column)."""
+        model = np.asarray(model, dtype=float)
+        resp = np.asarray(resp, dtype=float)
+        nModel, nData = len(model), len(resp)
+
+        inp, vals = self._buffer('in', (nModel + nData,))
+        vals[:nModel] = model
+        vals[nModel:] = resp
+        out, J = self._buffer('out', (nModel, nData))
+
+        self._run('jacobian', inp, out, nModel, fak=fak, chunkSize=chunkSize)
+        # the shared block is reused by the next call
+        return J.copy()
+
+    def responses(self, models, nData, chunkSize=None):
+        """Responses for models (N, nModel) as (N, nData) array."""
+        models = np.asarray(models, dtype=float)
+        inp, vals = self._buffer('in', models.shape)
+        vals[:] = models
+        out, resps = self._buffer('out', (len(models), nData))
+
+        self._run('responses', inp, out, len(models), chunkSize=chunkSize)
+        return resps.copy()
+
+    def map(self, fun, args, sizes=None, chunkSize=None):
+        """Call fun(fop, *a) on the workers for all argument tuples a.
+
+        Parameters
+        ----------
+        fun: callable
+            Function of the operator copy of the worker and the arguments.
+            Needs to be picklable, i.e., defined on module level.
+        args: list
+            Argument tuples, one per call.
+        sizes: iterable [None]
+            Result sizes of the calls. If given, the results are written
+            into shared memory, otherwise they are sent back pickled.
+
+        Returns
+        -------
+        results: array | list
+            Concatenated results if sizes are given, else list of arrays.
+        times: array
+            Wall time of every call.
+        """
+        args = list(args)
+        chunks = []
+        if sizes is None:
+            for start, stop in self._chunks(len(args), chunkSize):
+                chunks.append(('map', (fun, args[start:stop]), None,
+                               start, stop, 1.0))
+        else:
+            offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(int)
+            (name, shape), res = self._buffer('map', (int(offsets[-1]),))
+            for start, stop in self._chunks(len(args), chunkSize):
+                chunks.append(('map', (fun, args[start:stop]),
+                               (name, shape, offsets[start:stop+1].tolist()),
+                               start, stop, 1.0))
+
+        payloads = self._process(chunks)
+        times = np.concatenate([p[0] for p in payloads])
+        if sizes is None:
+            return [r for p in payloads for r in p[1]], times
+
+        return res.copy(), times
+
+
+def workerPool(fop, nWorkers, method=None):
+    """Return the running worker pool of fop, or start a new one.
+
+    nWorkers is limited to the CPU budget of the current section, see
+    :py:func:`pygimli.core.parallel.workerCount`.
+    The start method is taken from fop.workerPoolMethod if not given.
+    Returns None (with a single warning) if no pool can be started, e.g.,
+    if the operator cannot be pickled for the 'spawn' start method.
+    Operators based on the C++ core need to define __reduce__ for this.
+    """
+    if method is None:
+        method = getattr(fop, 'workerPoolMethod', None)
+
+    nWorkers = workerCount(nWorkers)
+    if nWorkers < 2:
+        return None
+
+    pool = getattr(fop, '_workerPool', None)
+    if pool is not None:
+        if pool.alive and pool.nWorkers == nWorkers and \
+                (method is None or pool.method == method):
+            return pool
+        pool.close()
+        fop._workerPool = None
+
+    if getattr(fop, '_workerPoolFailed', None) == (nWorkers, method):
+        return None
+
+    try:
+        pool = ModellingPool(fop, nWorkers, method=method)
+    except Exception as e:
+        warn('Cannot start worker processes, calculating serial '
+             '(for start method "spawn" the operator needs to be '
+             'picklable):', e)
+        fop._workerPoolFailed = (nWorkers, method)
+        return None
+
+    fop._workerPool = pool
+    return pool
+
+
+def closeWorkerPool(fop):
+    """Stop the worker pool of fop, if there is one.
+
+    Needed after changing fop, since the workers hold a copy of it from the
+    time they were started. The next call starts fresh workers.
+    """
+    pool = getattr(fop, '_workerPool', None)
+    if pool is not None:
+        pool.close()
+    if pool is not None or getattr(fop, '_workerPoolFailed', None):
+        fop._workerPool = None
+        fop._workerPoolFailed = None
+
+
+def parallelMap(fop, fun, args, nWorkers=1, sizes=None):
+    """Call fun(fop, *a) for all argument tuples a, possibly in parallel.
+
+    The calls are distributed over the persistent worker pool of fop (see
+    :py:func:`workerPool`), which keeps its copy of fop between calls.
+    Without pool, i.e., for one worker or if no pool can be started, the
+    calls are evaluated one after another.
+
+    Parameters
+    ----------
+    fop: object
+        Forward operator (or any object) passed to fun.
+    fun: callable
+        Function fun(fop, *a), needs to be picklable (module level).
+    args: list
+        Argument tuples, one per call.
+    nWorkers: int [1]
+        Number of worker processes.
+    sizes: iterable [None]
+        Result sizes of the calls to exchange them over shared memory.
+
+    Returns
+    -------
+    results: array | list
+        Concatenated results if sizes are given, else list of arrays.
+    times: array
+        Wall time of every call.
+    """
+    args = list(args)
+    pool = workerPool(fop, nWorkers) if len(args) > 1 else None
+    if pool is not None:
+        return pool.map(fun, args, sizes=sizes)
+
+    results, times = [], []
+    for a in args:
+        tic = time.perf_counter()
+        results.append(np.asarray(fun(fop, *a)))
+        times.append(time.perf_counter() - tic)
+
+    if sizes is not None:
+        results = np.concatenate(results) if results else np.zeros(0)
+
+    return results, np.array(times)
@@ -13,7 +13,7 @@ from .inversion import (Inversion, MarquardtInversion,
 
 from .lsqrinversion import LSQRInversion  # circular import, why?
 
-from .methodManager import (fit, MethodManager, MethodManager1d,
+from .methodManager import (fit, fitMany, MethodManager, MethodManager1d,
                             ParameterInversionManager,
                             MeshMethodManager,
                             PetroInversionManager,
@@ -22,8 +22,11 @@ from .methodManager import (fit, MethodManager, MethodManager1d,
 from .timelapse import MultiFrameModelling
 
 from .linesearch import lineSearch
+from .telemetry import Telemetry
+from .globalopt import GlobalOptimizer, globalOptimization
 
-from .resolution import resolutionMatrix
+from .resolution import (resolutionMatrix, modelResolutionDiagonal,
+                         modelPosteriorStd)
 
 from .harmfit import HarmFunctor, harmfit, harmfitNative
 
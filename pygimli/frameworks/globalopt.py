@@ -0,0 +1,424 @@
+# -*- coding: utf-8 -*-
+"""pyGIMLi - Global optimization for bounded forward problems.
+
+Population based derivative-free searches (differential evolution, CMA-ES,
+simulated annealing) for any forward operator. The models of a generation
+are computed as one batch, either by a vectorized `batchResponse` of the
+forward operator or on a pool of worker processes.
+
+Example
+-------
+>>> import numpy as np
+>>> import pygimli as pg
+>>> x = np.linspace(0, 1, 11)
+>>> fop = pg.frameworks.ParameterModelling(lambda x, a, b: a + b*x)
+>>> fop.dataSpace = x
+>>> opt = pg.frameworks.GlobalOptimizer(fop, lower=[-5, -5], upper=[5, 5],
+...                                     seed=1337)
+>>> model = opt.run(1 + 2*x, absoluteError=0.01, method='DE', maxGen=300)
+>>> np.allclose(model, [1, 2], atol=1e-3)
+True
+"""
+import numpy as np
+
+import pygimli as pg
+
+from .linesearch import responses
+
+
+class GlobalOptimizer(object):
+    """Global search of a bounded model minimizing the data misfit.
+
+    The parameters are searched in the unit cube, which is mapped linearly
+    or logarithmically (logScale) onto the bounds. The objective is the
+    error-weighted data misfit chi^2 = mean(((data - response) / error)^2).
+
+    All random numbers are drawn from one generator initialized with seed,
+    i.e., runs with the same seed (and the same forward operator) give the
+    same result independent of the number of workers.
+
+    Attributes
+    ----------
+    model: array
+        Best model found.
+    chi2: float
+        Misfit of the best model.
+    response: array
+        Response of the best model.
+    population: array (popSize, nPar)
+        Models of the last generation.
+    fitness: array (popSize)
+        Misfit of the models of the last generation.
+    history: list
+        Best misfit after every generation.
+    nEvaluations: int
+        Number of forward computations.
+    """
+
+    methods = ('DE', 'CMAES', 'SA')
+
+    def __init__(self, fop, lower, upper, logScale=False, nWorkers=1,
+                 seed=None, verbose=False):
+        """Initialize with forward operator and parameter bounds.
+
+        Parameters
+        ----------
+        fop: pg.Modelling
+            Forward operator. A `batchResponse(models)` method is used to
+            compute a whole generation at once.
+        lower, upper: float | iterable
+            Lower and upper bounds of the parameters. For scalar bounds
+            the parameter count is taken from the forward operator.
+        logScale: bool | iterable [False]
+            Search (some) parameters in logarithmic scale, needs positive
+            bounds.
+        nWorkers: int [1]
+            Number of worker processes for operators without batchResponse
+            (see :py:func:`pygimli.frameworks.linesearch.responses`).
+        seed: int [None]
+            Seed of the random generator.
+        verbose: bool [False]
+            Print the best misfit of every generation.
+        """
+        self.fop = fop
+        self.nWorkers = nWorkers
+        self.verbose = verbose
+        self.rng = np.random.default_rng(seed)
+
+        nPar = max(np.size(lower), np.size(upper))
+        if nPar == 1 and hasattr(fop, 'parameterCount'):
+            nPar = max(1, fop.parameterCount)
+
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=float),
+                                     (nPar,)).copy()
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=float),
+                                     (nPar,)).copy()
+        self.logScale = np.broadcast_to(np.asarray(logScale, dtype=bool),
+                                        (nPar,)).copy()
+
+        if np.any(self.upper <= self.lower):
+            pg.critical("Upper bounds need to be larger than lower bounds.")
+        if np.any(self.lower[self.logScale] <= 0):
+            pg.critical("Logarithmic parameters need positive bounds.")
+
+        # logarithm only of the log-scaled (positive) bounds
+        self._lo, self._hi = self.lower.copy(), self.upper.copy()
+        self._lo[self.logScale] = np.log(self.lower[self.logScale])
+        self._hi[self.logScale] = np.log(self.upper[self.logScale])
+
+        self.dataVals = None
+        self.errorVals = None
+        self.model = None
+        self.chi2 = np.inf
+        self.response = None
+        self.population = None
+        self.fitness = None
+        self.history = []
+        self.nEvaluations = 0
+
+    @property
+    def nPar(self):
+        """Number of parameters."""
+        return len(self.lower)
+
+    def toModel(self, u):
+        """Map unit cube coordinates u (..., nPar) onto models."""
+        m = self._lo + np.asarray(u) * (self._hi - self._lo)
+        return np.where(self.logScale, np.exp(m), m)
+
+    def toUnit(self, model):
+        """Map models (..., nPar) onto unit cube coordinates."""
+        m = np.asarray(model, dtype=float)
+        m = np.where(self.logScale, np.log(np.abs(m) + 1e-300), m)
+        return (m - self._lo) / (self._hi - self._lo)
+
+    def responses(self, models):
+        """Forward responses (N, nData) of a batch of models."""
+        resp = responses(self.fop, models, nWorkers=self.nWorkers)
+        self.nEvaluations += len(models)
+        return np.asarray(resp, dtype=float).reshape(len(models), -1)
+
+    def misfit(self, models):
+        """Error-weighted misfit chi^2 for a batch of models.
+
+        Models with failing (non-finite) responses get an infinite misfit.
+        """
+        resp = self.responses(models)
+        chi2 = np.mean(((resp - self.dataVals) / self.errorVals)**2, axis=1)
+        chi2[~np.isfinite(chi2)] = np.inf
+
+        best = np.argmin(chi2)
+        if chi2[best] < self.chi2:
+            self.chi2 = chi2[best]
+            self.model = np.asarray(models[best]).copy()
+            self.response = resp[best].copy()
+
+        return chi2
+
+    def _evaluate(self, U):
+        """Misfit for unit cube coordinates U (N, nPar)."""
+        return self.misfit(self.toModel(U))
+
+    def _generation(self, gen, U, fit):
+        """Store generation, return True if the search can stop."""
+        self.population = self.toModel(U)
+        self.fitness = fit.copy()
+        self.history.append(self.chi2)
+        if self.verbose:
+            pg.info("Generation {0}: chi^2 = {1:.4g} ({2} responses)".format(
+                gen, self.chi2, self.nEvaluations))
+
+        return self._chi2Target is not None and self.chi2 <= self._chi2Target
+
+    def run(self, dataVals, errorVals=None, method='DE', popSize=None,
+            maxGen=100, startModel=None, chi2Target=None, **kwargs):
+        """Search the model with the smallest data misfit.
+
+        Parameters
+        ----------
+        dataVals: iterable
+            Data values.
+        errorVals: iterable
+            Relative error values. dv / v
+            Can be omitted if absoluteError and/or relativeError kwargs given
+        method: str ['DE']
+            'DE' - Differential evolution (rand/1/bin, dithered)
+            'CMAES' - Covariance matrix adaptation evolution strategy
+            'SA' - Simulated annealing of popSize independent chains
+        popSize: int [None]
+            Models per generation. Default is 10*nPar for DE and SA, and
+            4 + 3 log(nPar) for CMA-ES.
+        maxGen: int [100]
+            Maximum number of generations.
+        startModel: iterable [None]
+            Model placed into the first generation (center for CMA-ES).
+        chi2Target: float [None]
+            Stop if the best misfit is smaller.
+
+        Keyword Arguments
+        -----------------
+        absoluteError : float | iterable
+            absolute error in units of dataVals
+        relativeError : float | iterable
+            relative error related to dataVals
+        F: float | (float, float) [(0.5, 1.0)]
+            DE mutation factor, a range is dithered every generation.
+        CR: float [0.7]
+            DE crossover probability.
+        sigma: float [0.3]
+            CMA-ES initial step size in the unit cube.
+        T0: float [None]
+            SA start temperature, default is the median initial misfit.
+        cooling: float [0.95]
+            SA temperature factor per generation.
+        step: float [0.2]
+            SA initial proposal width in the unit cube.
+
+        Returns
+        -------
+        model: array
+            Best model found.
+        """
+        if errorVals is None:  # use absoluteError and/or relativeError
+            absErr = kwargs.pop("absoluteError", 0)
+            relErr = kwargs.pop("relativeError", 0)
+            if np.any(np.isclose(absErr + relErr, 0, atol=0)):
+                pg.critical("Zero error occurred, check abs/relErr")
+
+            errorVals = np.abs(absErr / np.asarray(dataVals)) + relErr
+
+        self.dataVals = np.asarray(dataVals, dtype=float)
+        self.errorVals = np.abs(np.asarray(errorVals, dtype=float) *
+                                self.dataVals)
+        if np.any(self.errorVals <= 0):
+            pg.critical("Zero error occurred, check errorVals")
+
+        self.model = None
+        self.chi2 = np.inf
+        self.response = None
+        self.history = []
+        self.nEvaluations = 0
+        self._chi2Target = chi2Target
+
+        u0 = None
+        if startModel is not None:
+            u0 = np.clip(self.toUnit(startModel), 0, 1)
+
+        method = method.upper().replace('-', '')
+        if method == 'DE':
+            self._runDE(popSize or 10 * self.nPar, maxGen, u0, **kwargs)
+        elif method == 'CMAES':
+            self._runCMAES(popSize, maxGen, u0, **kwargs)
+        elif method == 'SA':
+            self._runSA(popSize or 10 * self.nPar, maxGen, u0, **kwargs)
+        else:
+            pg.critical("Unknown method", method, "choose from",
+                        self.methods)
+
+        return self.model
+
+    def _initialPopulation(self, popSize, u0):
+        """Latin hypercube sample of the unit cube."""
+        U = (self.rng.permuted(np.tile(np.arange(popSize), (self.nPar, 1)),
+                               axis=1).T +
+             self.rng.random((popSize, self.nPar))) / popSize
+        if u0 is not None:
+            U[0] = u0
+        return U
+
+    def _runDE(self, popSize, maxGen, u0, F=(0.5, 1.0), CR=0.7):
+        """Differential evolution (rand/1/bin)."""
+        popSize = max(popSize, 4)
+        U = self._initialPopulation(popSize, u0)
+        fit = self._evaluate(U)
+        if self._generation(0, U, fit):
+            return
+
+        idx = np.arange(popSize)
+        for gen in range(1, maxGen + 1):
+            # three distinct partners different from the target
+            R = self.rng.random((popSize, popSize))
+            R[idx, idx] = np.inf
+            r = np.argpartition(R, 3, axis=1)[:, :3]
+
+            f = self.rng.uniform(*F) if np.size(F) == 2 else F
+            V = U[r[:, 0]] + f * (U[r[:, 1]] - U[r[:, 2]])
+
+            cross = self.rng.random((popSize, self.nPar)) < CR
+            cross[idx, self.rng.integers(self.nPar, size=popSize)] = True
+            T = np.where(cross, V, U)
+
+            # out of bounds: random point between parent and bound
+            rnd = self.rng.random(T.shape)
+            T = np.where(T < 0, U * rnd, T)
+            T = np.where(T > 1, U + rnd * (1 - U), T)
+
+            fitT = self._evaluate(T)
+            better = fitT <= fit
+            U[better] = T[better]
+            fit[better] = fitT[better]
+
+            if self._generation(gen, U, fit):
+                return
+
+    def _runCMAES(self, popSize, maxGen, u0, sigma=0.3):
+        """CMA-ES with projection of candidates onto the bounds.
+
+        Projected candidates are ranked with a quadratic penalty of their
+        distance to the bounds.
+        """
+        n = self.nPar
+        lam = popSize or 4 + int(3 * np.log(n))
+        lam = max(lam, 4)
+        mu = lam // 2
+        w = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        w /= w.sum()
+        mueff = 1 / np.sum(w**2)
+
+        cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        cs = (mueff + 2) / (n + mueff + 5)
+        c1 = 2 / ((n + 1.3)**2 + mueff)
+        cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) /
+                  ((n + 2)**2 + mueff))
+        damps = 1 + 2 * max(0, np.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+        chiN = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n**2))
+
+        m = np.full(n, 0.5) if u0 is None else u0.copy()
+        pc = np.zeros(n)
+        ps = np.zeros(n)
+        B = np.eye(n)
+        D = np.ones(n)
+        C = np.eye(n)
+
+        for gen in range(maxGen + 1):
+            Y = (self.rng.standard_normal((lam, n)) * D).dot(B.T)
+            X = m + sigma * Y
+            U = np.clip(X, 0, 1)
+            fit = self._evaluate(U)
+            if self._generation(gen, U, fit):
+                return
+
+            finite = np.isfinite(fit)
+            scale = np.median(fit[finite]) if np.any(finite) else 1.0
+            pen = fit + max(scale, 1.0) * np.sum((X - U)**2, axis=1)
+            Ysel = Y[np.argsort(pen)[:mu]]
+
+            yw = w.dot(Ysel)
+            m = m + sigma * yw
+
+            invSqrtC = (B / D).dot(B.T)
+            ps = (1 - cs) * ps + np.sqrt(cs * (2 - cs) * mueff) * \
+                invSqrtC.dot(yw)
+            hsig = np.linalg.norm(ps) / \
+                np.sqrt(1 - (1 - cs)**(2 * (gen + 1))) / chiN < \
+                1.4 + 2 / (n + 1)
+            pc = (1 - cc) * pc + hsig * np.sqrt(cc * (2 - cc) * mueff) * yw
+
+            C = (1 - c1 - cmu) * C + \
+                c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * C) + \
+                cmu * (Ysel.T * w).dot(Ysel)
+            sigma *= np.exp((cs / damps) * (np.linalg.norm(ps) / chiN - 1))
+
+            C = np.triu(C) + np.triu(C, 1).T
+            D2, B = np.linalg.eigh(C)
+            D = np.sqrt(np.maximum(D2, 1e-20))
+
+            if sigma * D.max() < 1e-12:  # collapsed distribution
+                return
+
+    def _runSA(self, popSize, maxGen, u0, T0=None, cooling=0.95, step=0.2):
+        """Simulated annealing of popSize independent Metropolis chains.
+
+        The proposal width shrinks with the square root of the temperature.
+        """
+        U = self._initialPopulation(popSize, u0)
+        fit = self._evaluate(U)
+        if self._generation(0, U, fit):
+            return
+
+        finite = np.isfinite(fit)
+        if T0 is None:
+            T0 = np.median(fit[finite]) if np.any(finite) else 1.0
+        T0 = max(T0, 1e-12)
+
+        T = T0
+        for gen in range(1, maxGen + 1):
+            width = step * max(np.sqrt(T / T0), 1e-3)
+            P = U + width * self.rng.standard_normal(U.shape)
+            P = np.abs(P)  # reflect at both bounds
+            P = np.where(P > 1, 2 - P, P)
+            P = np.clip(P, 0, 1)
+
+            fitP = self._evaluate(P)
+            with np.errstate(over='ignore', invalid='ignore'):
+                accept = (fitP <= fit) | \
+                    (self.rng.random(popSize) < np.exp(-(fitP - fit) / T))
+
+            U[accept] = P[accept]
+            fit[accept] = fitP[accept]
+            T *= cooling
+
+            if self._generation(gen, U, fit):
+                return
+
+
+def globalOptimization(fop, dataVals, errorVals=None, lower=0, upper=1,
+                       method='DE', logScale=False, nWorkers=1, seed=None,
+                       **kwargs):
+    """Search the best fitting bounded model with a global method.
+
+    Shortcut for :py:class:`GlobalOptimizer`, keyword arguments are passed
+    to :py:meth:`GlobalOptimizer.run`.
+
+    Returns
+    -------
+    model: array
+        Best model found.
+    chi2: float
+        Error-weighted misfit of the model.
+    """
+    opt = GlobalOptimizer(fop, lower, upper, logScale=logScale,
+                          nWorkers=nWorkers, seed=seed,
+                          verbose=kwargs.pop('verbose', False))
+    model = opt.run(dataVals, errorVals, method=method, **kwargs)
+    return model, opt.chi2
@@ -3,14 +3,43 @@
 
 Basic inversion frameworks that usually needs a forward operator to run.
 """
+import time
+from contextlib import nullcontext
+from functools import wraps
 from math import sqrt
+
 import numpy as np
 import pygimli as pg
 from pygimli.solver.leastsquares import lsqr as lssolver
 from pygimli.core.trans import str2Trans
 from pygimli.utils import prettyFloat as pf
-from pygimli.utils.sparseMat2Numpy import sparseMatrix2Dense
 from .linesearch import lineSearch
+from .telemetry import Telemetry
+
+
+def _telemetryRun(run):
+    """Decorate an inversion run() by the telemetry keyword argument.
+
+    With telemetry=True (or a Telemetry instance), the forward operator is
+    instrumented and the phases of this run are recorded into
+    self.telemetry. Later runs without telemetry do not record into it.
+    """
+    @wraps(run)
+    def wrapper(self, *args, **kwargs):
+        telemetry = kwargs.pop('telemetry', False)
+        if not telemetry:
+            return run(self, *args, **kwargs)
+
+        self.telemetry = Telemetry() if telemetry is True else telemetry
+        self.telemetry.instrument(self.fop)
+        self._recording = True
+        try:
+            return run(self, *args, **kwargs)
+        finally:
+            self._recording = False
+            self.telemetry.release()
+
+    return wrapper
 
 
 class InversionBase(object):
@@ -47,6 +76,9 @@ class InversionBase(object):
         self.G = None
         self._jacobianOutdated = False
         self.lineSearchMethod = None  # auto inter-quad
+        self.lineSearchWorkers = 1  # processes for trial responses
+        self.telemetry = None  # Telemetry of the last run(telemetry=True)
+        self._recording = False  # telemetry records the running run()
         # self.minTau/maxTau
 
     @property
@@ -358,22 +390,35 @@ class InversionBase(object):
         self._dataVals = None
         self._errorVals = None
 
+    def _phase(self, name):
+        """Context timing phase name if telemetry is active."""
+        if not self._recording:
+            return nullcontext()
+        return self.telemetry.phase(name)
+
     def oneStep(self):
         """Carry out one iteration step (e.g. good for coupling etc.)."""
-        dModel = self.modelUpdate()
+        with self._phase('modelUpdate'):
+            dModel = self.modelUpdate()
         print("dM: ", dModel)
-        tau, responseLS = lineSearch(self, dModel)
+        method = self.lineSearchMethod or "auto"
+        with self._phase('lineSearch'):
+            tau, responseLS = lineSearch(self, dModel, method=method,
+                                         nWorkers=self.lineSearchWorkers)
         print("tau: ", tau)
         pg.debug(f"tau={tau}")
-        if tau >= 0.95:  # practically 1
+        # exact and armijo return the response belonging to tau
+        exact = method.lower().startswith(("exact", "armijo"))
+        if tau >= 0.95 and not exact:  # practically 1
             tau = 1
 
         self.model = self.modelTrans.update(self.model, dModel*tau)
-        if tau == 1.0:
+        if responseLS is not None and (tau == 1.0 or exact):
             self.response = responseLS
         else:  # compute new response
             self.response = self.fop.response(self.model)
 
+    @_telemetryRun
     def run(self, dataVals, errorVals=None, **kwargs):
         """Run inversion.
 
@@ -418,11 +463,18 @@ class InversionBase(object):
             Starting model is also a reference to constrain against
         showProgress : bool
             Show progress in form of updating models
+        telemetry : bool | Telemetry [False]
+            Record time and memory of all phases and iterations into
+            self.telemetry (see :py:class:`pygimli.frameworks.Telemetry`).
         verbose : bool
             Verbose output on the console
         debug : bool
             Even more verbose console and file output
         """
+        # workers of a previous run may hold an outdated operator copy
+        if hasattr(self.fop, 'closeWorkerPool'):
+            self.fop.closeWorkerPool()
+
         self.reset()
         if errorVals is None:  # use absoluteError and/or relativeError instead
             absErr = kwargs.pop("absoluteError", 0)
@@ -516,6 +568,8 @@ class InversionBase(object):
         self.modelHistory = [startModel]
 
         for i in range(1, maxIter+1):
+            if self._recording:
+                self.telemetry.iter = i
             if self._preStep and callable(self._preStep):
                 self._preStep(i, self)
 
@@ -523,7 +577,8 @@ class InversionBase(object):
                 print("-" * 80)
                 print("inv.iter", i, "... ", end='')
 
-            self.oneStep()
+            with self._phase('oneStep'):
+                self.oneStep()
             if np.isnan(self.model).any():
                 pg.info(self.model)
                 pg.critical('invalid model')
@@ -602,9 +657,10 @@ class InversionBase(object):
         if error_weighted:
             tData /= self.dataTrans.error(self.response, self.errorVals)
         if numpy_matrix:
-            return np.reshape(tData, [-1, 1]) * \
-                pg.utils.gmat2numpy(self.fop.jacobian()) * \
-                np.reshape(tModel, [1, -1])
+            J = pg.utils.gmat2numpy(self.fop.jacobian(), copy=True)
+            J *= np.reshape(tData, [-1, 1])
+            J *= np.reshape(tModel, [1, -1])
+            return J
         else:
             return pg.matrix.MultLeftRightMatrix(self.fop.jacobian(),
                                                 tData, tModel)
@@ -694,7 +750,9 @@ class GaussNewtonInversion(InversionBase):
             deltaG = (self.c - self.G * model) * sqrt(self.my)
             rhs = pg.cat(rhs, deltaG)
 
-        dM = lssolver(self.A, rhs, maxiter=self.LSiter, verbose=self.verbose)
+        with self._phase('lssolver'):
+            dM = lssolver(self.A, rhs, maxiter=self.LSiter,
+                          verbose=self.verbose)
         return dM
 
 
@@ -780,6 +838,11 @@ class ClassicInversion(object):
         self._fop = None
         self._lam = 20      # lambda regularization
         self.chi2History = []
+        self.jacobianStats = []  # Jacobian path per iteration
+        self._lastStep = None
+        self._jacobianValid = False  # fop holds a computed Jacobian
+        self.telemetry = None  # Telemetry of the last run(telemetry=True)
+        self._recording = False  # telemetry records the running run()
 
         # cache: keep startmodel if set explicitly or calculated from FOP, will
         # be recalulated for every run if not set explicitly
@@ -841,6 +904,7 @@ class ClassicInversion(object):
     def setForwardOperator(self, fop):
         """Set forward operator."""
         self._fop = fop
+        self._jacobianValid = False
         # we need to initialize the regionmanager by calling it once
         self._fop.regionManager()
         self._inv.setForwardOperator(fop)
@@ -1264,6 +1328,7 @@ class ClassicInversion(object):
         """Set weighting factors for the invidual rows of the C matrix."""
         self.inv.setCWeight(cWeight)
 
+    @_telemetryRun
     def run(self, dataVals, errorVals=None, **kwargs):
         """Run inversion.
 
@@ -1307,14 +1372,41 @@ class ClassicInversion(object):
             Robust (L1 norm mimicking) model roughness reweighting
         isReference : bool [False]
             Starting model is also a reference to constrain against
+        jacobianUpdate : str ['full']
+            Jacobian strategy for the iterations:
+            'full' - recompute the Jacobian in every iteration
+            'reuse' - keep an existing Jacobian of matching size
+            'broyden' - keep the Jacobian and update it by rank-one (Broyden)
+            updates from the observed response changes. It is recomputed if
+            the relative error of the linear response prediction of the last
+            iteration exceeds jacobianTolerance. The path taken in every
+            iteration is stored in self.jacobianStats.
+        jacobianTolerance : float [0.2]
+            Maximum relative prediction error for Broyden updates.
         showProgress : bool
             Show progress in form of updating models
+        telemetry : bool | Telemetry [False]
+            Record wall time, calls and peak memory of all phases and
+            iterations into self.telemetry, see
+            :py:class:`pygimli.frameworks.Telemetry`. Forward response,
+            Jacobian and constraints are timed at the forward operator, the
+            remaining (self) time of 'oneStep' is spent in the model update
+            (solver) and line search of the core inversion.
         verbose : bool
             Verbose output on the console
         debug : bool
             Even more verbose console and file output
         """
+        # workers of a previous run may hold an outdated operator copy
+        if hasattr(self.fop, 'closeWorkerPool'):
+            self.fop.closeWorkerPool()
+
         self.reset()
+        jacobianUpdate = kwargs.pop('jacobianUpdate', 'full')
+        jacobianTolerance = kwargs.pop('jacobianTolerance', 0.2)
+        if jacobianUpdate not in ('full', 'reuse', 'broyden'):
+            pg.critical("Unknown Jacobian update:", jacobianUpdate)
+
         if errorVals is None:  # use absoluteError and/or relativeError instead
             absErr = kwargs.pop("absoluteError", 0)
             relErr = kwargs.pop("relativeError",
@@ -1419,7 +1511,8 @@ class ClassicInversion(object):
 
         # self.inv.start()  # start is reset() and run() so better run?
         self.inv.setMaxIter(0)
-        self.inv.start()
+        with self._phase('start'):
+            self.inv.start()
         self.maxIter = maxIterTmp
         if self.verbose:
             print("inv.iter 0 ... chi² = {:7.2f}".format(self.chi2()))
@@ -1434,8 +1527,12 @@ class ClassicInversion(object):
         lastPhi = self.phi()
         self.chi2History = [self.chi2()]
         self.modelHistory = [startModel]
+        self.jacobianStats = []
+        self._lastStep = None
 
         for i in range(1, maxIter+1):
+            if self._recording:
+                self.telemetry.iter = i
             if self._preStep and callable(self._preStep):
                 self._preStep(i, self)
 
@@ -1443,15 +1540,30 @@ class ClassicInversion(object):
                 print("-" * 80)
                 print("inv.iter", i, "... ", end='')
 
+            with self._phase('prepareJacobian'):
+                stats = self._prepareJacobian(i, jacobianUpdate,
+                                              jacobianTolerance)
+            tic = time.perf_counter()
             try:
-                if hasattr(self, "oneStep"):
-                    self.oneStep()
-                else:
-                    self.inv.oneStep()
+                with self._phase('oneStep'):
+                    if hasattr(self, "oneStep"):
+                        self.oneStep()
+                    else:
+                        self.inv.oneStep()
             except RuntimeError as e:
                 print(e)
                 pg.error('One step failed. '
                          'Aborting and going back to last model')
+                # the Jacobian may belong to the failed step
+                self._jacobianValid = False
+                self._lastStep = None
+            else:
+                self._jacobianValid = True
+
+            stats["time"] = time.perf_counter() - tic
+            self.jacobianStats.append(stats)
+            if self.verbose and jacobianUpdate != 'full':
+                print("({} Jacobian) ".format(stats["path"]), end='')
 
             if np.isnan(self.model).any():
                 print(self.model)
@@ -1469,11 +1581,12 @@ class ClassicInversion(object):
             if self._postStep and callable(self._postStep):
                 self._postStep(i, self)
 
-            if self.robustData:
-                self.inv.robustWeighting()
+            with self._phase('reweighting'):
+                if self.robustData:
+                    self.inv.robustWeighting()
 
-            if self.blockyModel:
-                self.inv.constrainBlocky()
+                if self.blockyModel:
+                    self.inv.constrainBlocky()
 
             phi = self.phi()
             dPhi = phi / lastPhi
@@ -1502,6 +1615,7 @@ class ClassicInversion(object):
             lam *= self.inv.lambdaFactor()
             self.inv.setLambda(lam)
 
+        self.inv.setRecalcJacobian(True)
         # will never work as expected until we unpack kwargs .. any idea for
         # better strategy?
         # if len(kwargs.keys()) > 0:
@@ -1510,6 +1624,60 @@ class ClassicInversion(object):
         self.model = self.inv.model()
         return self.model
 
+    _phase = InversionBase._phase
+
+    def _prepareJacobian(self, i, update, tol):
+        """Decide whether the next step recomputes the Jacobian.
+
+        For Broyden updates, the response change of the last step is
+        compared to its linear prediction J*dm. If the relative prediction
+        error is below tol, the Jacobian is updated by the rank-one secant
+        correction (df - J dm) dm^T / (dm^T dm), otherwise recomputed.
+
+        Returns
+        -------
+        stats : dict
+            iteration, path ('full', 'reuse' or 'broyden') and relative
+            prediction error (or None)
+        """
+        model = np.array(self.inv.model())
+        response = np.array(self.inv.response())
+        lastStep, self._lastStep = self._lastStep, (model, response)
+        stats = dict(iter=i, path='full', predictionError=None)
+        J = self.fop.jacobian()
+        if update == 'full' or not self._jacobianValid or \
+                J.rows() != len(response) or J.cols() != len(model):
+            self.inv.setRecalcJacobian(True)
+            return stats
+
+        stats['path'] = 'reuse'
+        if update == 'broyden' and lastStep is not None:
+            dModel = model - lastStep[0]
+            dResponse = response - lastStep[1]
+            if not isinstance(J, pg.Matrix):
+                pg.warn("Broyden update needs a dense Jacobian, got", type(J))
+                stats['path'] = 'full'
+            elif np.any(dModel):
+                u = dResponse - J.mult(dModel)
+                err = np.linalg.norm(u) / max(np.linalg.norm(dResponse),
+                                              1e-300)
+                stats['predictionError'] = err
+                if err > tol:
+                    stats['path'] = 'full'
+                else:
+                    A = pg.utils.gmat2numpy(J)
+                    A += np.outer(u, dModel / dModel.dot(dModel))
+                    if hasattr(J, 'setArray'):
+                        J.setArray(np.ascontiguousarray(A))
+                    else:
+                        for j, row in enumerate(A):
+                            J.setRow(j, row)
+
+                    stats['path'] = 'broyden'
+
+        self.inv.setRecalcJacobian(stats['path'] == 'full')
+        return stats
+
     def showProgress(self, style='all'):
         r"""Show inversion progress after every iteration.
 
@@ -1597,13 +1765,10 @@ class ClassicInversion(object):
         if error_weighted:
             tData *= self.dataTrans.error(self.response, self.errorVals)
         if numpy_matrix:
-            J = self.fop.jacobian()
-            if isinstance(J, pg.SparseMapMatrix):
-                J = sparseMatrix2Dense(self.fop.jacobian())
-
-            return np.reshape(tData, [-1, 1]) * \
-                pg.utils.gmat2numpy(J) * \
-                np.reshape(tModel, [1, -1])
+            J = pg.utils.gmat2numpy(self.fop.jacobian(), copy=True)
+            J *= np.reshape(tData, [-1, 1])
+            J *= np.reshape(tModel, [1, -1])
+            return J
         else:
             return pg.matrix.MultLeftRightMatrix(self.fop.jacobian(),
                                                 tData, tModel)
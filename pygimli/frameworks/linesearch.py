@@ -5,6 +5,54 @@ Linesearch procedures used by various inversion frameworks.
 """
 import numpy as np
 
+import pygimli as pg
+from pygimli.core.parallel import workerCount
+from pygimli.core.workerpool import parallelMap
+
+
+def _response(fop, model):
+    """Response of one model (in a worker process)."""
+    return fop.response(model)
+
+
+def responses(fop, models, nWorkers=1):
+    """Forward responses for a batch of (trial) models.
+
+    Forward operators with a vectorized `batchResponse` (e.g.
+    Block1DModelling, ParameterModelling) compute all models at once.
+    Otherwise the models are distributed over the persistent worker pool
+    of the operator (see :py:func:`pygimli.core.workerpool.parallelMap`)
+    or computed one after another. The number of processes is limited by
+    the CPU budget (see :py:mod:`pygimli.core.parallel`).
+
+    Parameters
+    ----------
+    fop : pg.Modelling
+        Forward operator
+    models : iterable
+        Models to compute the response for
+    nWorkers : int [1]
+        Number of processes
+
+    Returns
+    -------
+    resp : np.array (len(models), nData)
+    """
+    models = [np.asarray(m) for m in models]
+    if hasattr(fop, "batchResponse"):
+        return np.asarray(fop.batchResponse(np.array(models)))
+
+    # with known data size the workers write into shared memory, otherwise
+    # they send their responses back
+    sizes = None
+    data = getattr(fop, "data", None)
+    if isinstance(data, pg.DataContainer) and data.size() > 0:
+        sizes = [data.size()] * len(models)
+
+    resps, _ = parallelMap(fop, _response, [(m,) for m in models],
+                           nWorkers=nWorkers, sizes=sizes)
+    return np.reshape(resps, (len(models), -1))
+
 
 def tauVector(taumin=0.01, taumax=1, logScale=False, n=21):
     """Generate a vector of tau values."""
@@ -29,17 +77,19 @@ def lineSearchExact(inv, dM, taus=None, show=False, **kwargs):
         maximum value
     logScale : bool
         use logarithmic scaling, otherwise linear
+    nWorkers : int [1]
+        number of processes to compute the trial responses (see
+        :py:func:`responses`)
     show : bool
         show curve
     """
+    nWorkers = kwargs.pop("nWorkers", 1)
     if taus is None:
         taus = tauVector(**kwargs)
 
-    phis = np.zeros_like(taus)
-    for i, tau in enumerate(taus):
-        newModel = inv.modelTrans.update(inv.model, dM*tau)
-        newResponse = inv.fop.response(newModel)
-        phis[i] = inv.phi(newModel, newResponse)
+    models = [inv.modelTrans.update(inv.model, dM*tau) for tau in taus]
+    resps = responses(inv.fop, models, nWorkers=nWorkers)
+    phis = np.array([inv.phi(m, r) for m, r in zip(models, resps)])
 
     if show:
         import matplotlib.pyplot as plt
@@ -48,7 +98,64 @@ def lineSearchExact(inv, dM, taus=None, show=False, **kwargs):
         else:
             plt.plot(taus, phis)
 
-    return taus[np.argmin(phis)], newResponse
+    iMin = np.argmin(phis)
+    return taus[iMin], resps[iMin]
+
+
+def lineSearchArmijo(inv, dM, tau0=1.0, c1=1e-4, rho=0.5, maxIter=10,
+                     nBatch=None, **kwargs):
+    """Backtracking line search satisfying the Armijo condition.
+
+    Starting from tau0, the step is reduced by rho until the sufficient
+    decrease condition phi(tau) <= phi(0) + c1 * tau * dPhi/dtau is met,
+    so that a good full step costs only one forward response. If the
+    inversion offers a gradient, it is used for the slope dPhi/dtau,
+    otherwise simple decrease is required. nBatch successive trial steps
+    are computed at once, e.g. in parallel by nWorkers processes.
+
+    Parameters
+    ----------
+    inv : pg.Inversion
+        pygimli Inversion (or any derived class) instance
+    dM : iterable
+        model update direction
+    tau0 : float [1]
+        initial step length
+    c1 : float [1e-4]
+        sufficient decrease factor
+    rho : float [0.5]
+        backtracking factor
+    maxIter : int [10]
+        maximum number of trial steps
+    nBatch : int [nWorkers]
+        number of trial steps computed in one batch
+    nWorkers : int [1]
+        number of processes to compute the trial responses
+
+    Returns
+    -------
+    tau : float
+        step length (0 if no decrease was found)
+    response : array | None
+        forward response for tau
+    """
+    nWorkers = kwargs.pop("nWorkers", 1)
+    nBatch = nBatch or workerCount(nWorkers)
+    phi0 = inv.phi()
+    slope = 0.0
+    if hasattr(inv, "gradient"):  # gradient() is half of dPhi/dm
+        slope = min(2 * np.dot(inv.gradient(), dM), 0.0)
+
+    taus = tau0 * rho**np.arange(maxIter)
+    for i in range(0, maxIter, nBatch):
+        tau = taus[i:i+nBatch]
+        models = [inv.modelTrans.update(inv.model, dM*t) for t in tau]
+        resps = responses(inv.fop, models, nWorkers=nWorkers)
+        for t, m, r in zip(tau, models, resps):
+            if inv.phi(m, r) <= phi0 + c1 * t * slope:
+                return t, r
+
+    return 0.0, None
 
 def lineSearchInter(inv, dM, taus=None, show=False, **kwargs):
     """Optimizes line search parameter by linear response interpolation.
@@ -68,6 +175,7 @@ def lineSearchInter(inv, dM, taus=None, show=False, **kwargs):
     show : bool
         show curve
     """
+    kwargs.pop("nWorkers", None)  # only one response needed
     if taus is None:
         taus = tauVector(**kwargs)
 
@@ -115,11 +223,11 @@ def lineSearchQuad(inv, dm, tautest=0.3, tau1=1, show=False, **kwargs):
     """Optimize line search by fitting parabola by Phi(tau) curve."""
     y0 = inv.phi()
     x1 = tau1
-    fullModel = np.exp(dm*x1)*inv.model
-    fullResponse = inv.fop.response(fullModel)
+    fullModel = inv.modelTrans.update(inv.model, dm*x1)
     xt = tautest
-    testModel = np.exp(dm*xt)*inv.model
-    testResponse = inv.fop.response(testModel)
+    testModel = inv.modelTrans.update(inv.model, dm*xt)
+    fullResponse, testResponse = responses(
+        inv.fop, [fullModel, testModel], nWorkers=kwargs.get("nWorkers", 1))
     y1 = inv.phi(fullModel, fullResponse)
     yt = inv.phi(testModel, testResponse)
     rt = (yt-y0) / xt
@@ -160,6 +268,7 @@ def lineSearch(inv, dm, method='auto', **kwargs):
         'exact' : function evaluation for every step
         'interp' : linear interpolation of response
         'quad' : fitting a parabola through 3 points
+        'armijo' : backtracking until sufficient decrease
         'auto': first try 'inter', then 'quad', else 0.1
     taus : array [None]
         array containing the tau values to test, alternatively:
@@ -169,6 +278,8 @@ def lineSearch(inv, dm, method='auto', **kwargs):
         maximum value
     logScale : bool [False]
         use logarithmic scaling, otherwise linear
+    nWorkers : int [1]
+        number of processes to compute trial responses at once
     show : bool [False]
         show line search curve
     """
@@ -178,6 +289,8 @@ def lineSearch(inv, dm, method='auto', **kwargs):
         return lineSearchInter(inv, dm, **kwargs)
     elif method.lower().startswith("quad"):
         return lineSearchQuad(inv, dm, **kwargs)
+    elif method.lower().startswith("armijo"):
+        return lineSearchArmijo(inv, dm, **kwargs)
     else:
         tau, response = lineSearchInter(inv, dm, **kwargs)
         if tau > 0.01 and tau <= 1:
@@ -80,7 +80,7 @@ class LSQRInversion(Inversion):
         tau, responseLS = lineSearch(self, dM)
         pg.debug(f"tau={tau}")
         self.model = tM.update(self.model, dM*tau)
-        if tau == 1.0:
+        if tau == 1.0 and responseLS is not None:
             self.inv.setResponse(responseLS)
         else:  # compute new response
             self.inv.setResponse(self.fop.response(self.model))
@@ -62,6 +62,9 @@ def fit(funct, data, err=None, **kwargs):
     """
     if isinstance(data, list):
         data = np.array(data)
+    if np.ndim(data) == 2:
+        models, response, _ = fitMany(funct, data, err, **kwargs)
+        return models, response
     if isinstance(err, (float, int)):
         err = np.full(len(data), err)
 
@@ -70,6 +73,139 @@ def fit(funct, data, err=None, **kwargs):
     return model, mgr.fw.response
 
 
+def fitMany(funct, data, err=None, startModel=None, limits=None, maxIter=20,
+            lam=1e-2, dPhi=1e-3, verbose=False, **kwargs):
+    """Fit many data vectors with the same function at once.
+
+    All data sets are fitted by a Levenberg-Marquardt scheme on stacked
+    arrays, i.e. every iteration needs one vectorized Jacobian and one
+    response computation for all (still active) data sets. The parameters
+    are fitted linearly (without transformation).
+
+    Parameters
+    ----------
+    funct: callable
+        Function with the first argument as data space followed by the
+        parameters, see :py:func:`fit`.
+    data: array (nSets, nData)
+        Data values, one data set per row.
+    err: float | array [0.01]
+        Relative data error values in %/100.
+    startModel: float | iterable | dict | array (nSets, nPar) [1]
+        Starting values for all sets, for each parameter (by name)
+        or for each set individually.
+    limits: {str: [min, max]}
+        Limit parameters by parameter name.
+    maxIter: int [20]
+        Maximum number of iterations.
+    lam: float [1e-2]
+        Initial Marquardt damping (relative to the diagonal).
+    dPhi: float [1e-3]
+        Relative chi^2 decrease below which a data set is converged.
+
+    Other Parameters
+    ----------------
+    *dataSpace*: iterable
+        Keyword argument of the data space of data.shape[1].
+        The name need to fit the first argument of funct.
+    jacobian: str ['fd']
+        Finite differences ('fd') or complex steps ('complex').
+
+    Returns
+    -------
+    models: array (nSets, nPar)
+        Fitted model parameters.
+    response: array (nSets, nData)
+        Model responses.
+    chi2: array (nSets)
+        Error-weighted chi-squared misfit for every data set.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> import pygimli as pg
+    >>> func = lambda t, a, b: a*np.exp(-t/b)
+    >>> t = np.linspace(0.1, 2, 20)
+    >>> data = func(t, np.array([[1.], [2.]]), np.array([[0.5], [1.]]))
+    >>> models, resp, chi2 = pg.frameworks.fitMany(func, data, t=t)
+    >>> print(np.round(models, 4))
+    [[1.  0.5]
+     [2.  1. ]]
+    """
+    fop = pg.frameworks.ParameterModelling(
+        funct, jacobian=kwargs.pop('jacobian', 'fd'))
+    fop.dataSpace = np.asarray(kwargs.pop(fop.dataSpaceName))
+    names = list(fop.params.keys())
+    data = np.atleast_2d(data)
+    nS, nP = len(data), len(names)
+
+    if err is None:
+        err = 0.01
+    err = np.broadcast_to(err, data.shape) * np.abs(data)
+    err[err == 0] = 1e-12
+
+    models = np.ones((nS, nP))
+    if isinstance(startModel, dict):
+        for k, v in startModel.items():
+            models[:, names.index(k)] = v
+    elif startModel is not None:
+        models = np.array(np.broadcast_to(startModel, (nS, nP)), dtype=float)
+
+    lower = np.full(nP, -np.inf)
+    upper = np.full(nP, np.inf)
+    for k, v in (limits or {}).items():
+        lower[names.index(k)], upper[names.index(k)] = v
+
+    models = np.clip(models, lower, upper)
+
+    def chiSquare(resp, ids):
+        return np.mean(((data[ids] - resp) / err[ids])**2, axis=1)
+
+    # trial steps may overflow, they are rejected by their misfit
+    with np.errstate(over='ignore', invalid='ignore'):
+        resp = fop.batchResponse(models)
+        chi2 = chiSquare(resp, slice(None))
+        lams = np.full(nS, float(lam))
+        active = np.arange(nS)
+        for it in range(maxIter):
+            if len(active) == 0:
+                break
+
+            J = fop.batchJacobian(models[active]) / err[active, :, np.newaxis]
+            dr = (data[active] - resp[active]) / err[active]
+            JTJ = np.einsum('sdi,sdj->sij', J, J)
+            JTr = np.einsum('sdi,sd->si', J, dr)
+            diag = np.einsum('sii->si', JTJ)
+            A = JTJ.copy()
+            A[:, np.arange(nP), np.arange(nP)] += \
+                lams[active, np.newaxis] * np.maximum(diag, 1e-12)
+            try:
+                dm = np.linalg.solve(A, JTr[:, :, np.newaxis])[:, :, 0]
+            except np.linalg.LinAlgError:
+                dm = np.array([np.linalg.lstsq(a, r, rcond=None)[0]
+                               for a, r in zip(A, JTr)])
+
+            mNew = np.clip(models[active] + dm, lower, upper)
+            rNew = fop.batchResponse(mNew)
+            cNew = chiSquare(rNew, active)
+            better = cNew < chi2[active]
+            ids = active[better]
+            converged = np.zeros(len(active), dtype=bool)
+            converged[better] = (chi2[ids] - cNew[better]) < dPhi * chi2[ids]
+            models[ids], resp[ids], chi2[ids] = mNew[better], rNew[better], \
+                cNew[better]
+            lams[ids] /= 3.0
+            lams[active[~better]] *= 5.0
+            converged |= lams[active] > 1e10
+            active = active[~converged]
+            if verbose:
+                pg.info('Iteration {}: {} of {} data sets active, median '
+                        'chi^2={:.3g}'.format(it + 1, len(active), nS,
+                                              np.median(chi2)))
+
+    return models, resp, chi2
+
+
 # TG: harmonicFit does not really belong here as it is no curve fit
 # We should rather use a class Decomposition
 
@@ -938,14 +1074,20 @@ class JointPetroInversionManager(MeshMethodManager):
     :py:mod:`pygimli.frameworks.JointModelling`.
     """
 
-    def __init__(self, petros, mgrs):
-        """Initialize with lists of managers and transformations."""
+    def __init__(self, petros, mgrs, nWorkers=1, backend="process"):
+        """Initialize with lists of managers and transformations.
+
+        The forward operators are evaluated concurrently by nWorkers
+        threads or processes (backend), see
+        :py:class:`pygimli.frameworks.modelling.FopDispatcher`.
+        """
         self.mgrs = mgrs
 
         self.fops = [pg.frameworks.PetroModelling(m.fop, p)
                      for p, m in zip(petros, mgrs)]
 
-        super().__init__(fop=pg.frameworks.JointModelling(self.fops))
+        super().__init__(fop=pg.frameworks.JointModelling(
+            self.fops, nWorkers=nWorkers, backend=backend))
 
         # just hold a local copy
         self.dataTrans = pg.trans.TransCumulative()
@@ -4,8 +4,12 @@
 
 These are basic modelling proxies.
 """
+import time
+
 import numpy as np
 import pygimli as pg
+from pygimli.core.parallel import parallel, threadsPerWorker, workerCount
+from pygimli.core.workerpool import closeWorkerPool, parallelMap
 
 DEFAULT_STYLES = {
     'Default': {
@@ -148,6 +152,7 @@ class Modelling(pg.core.ModellingBase):
 
     def setData(self, data):
         """Set data (actual version)."""
+        closeWorkerPool(self)
         if isinstance(data, pg.DataContainer):
             self.setDataContainer(data)
         else:
@@ -187,6 +192,7 @@ class Modelling(pg.core.ModellingBase):
             else:  # something like "10-1000"
                 raise Exception("Could not use transformation" + tm)
 
+        closeWorkerPool(self)
         self._modelTrans = tm
 
     def regionManager(self):
@@ -346,6 +352,7 @@ class Modelling(pg.core.ModellingBase):
         if self._regionsNeedUpdate is False:
             return
 
+        closeWorkerPool(self)
         # call super class her because self.regionManager() calls allways
         #  __applyRegionProperies itself
         rMgr = super().regionManager()
@@ -526,6 +533,32 @@ class Block1DModelling(Modelling):
 
         # self._applyRegionProperties()
 
+    def batchResponse(self, models, fops=None):
+        """Compute the responses of many 1D models at once.
+
+        Derived classes can override this with a vectorized implementation,
+        e.g., for laterally constrained inversion (LCModelling).
+
+        Parameters
+        ----------
+        models : array (nModels, nPar)
+            block models
+        fops : [Block1DModelling]
+            forward operators holding the individual data basis of every
+            model, by default self is used for all models
+
+        Returns
+        -------
+        responses : array (nModels, nData) | [array]
+            model responses, a list if the data sizes differ
+        """
+        fops = fops or [self] * len(models)
+        resp = [np.asarray(f.response(m)) for f, m in zip(fops, models)]
+        if len(set(len(r) for r in resp)) == 1:
+            return np.array(resp)
+
+        return resp
+
     def drawModel(self, ax, model, **kwargs):
         """Draw model into a given axis."""
         pg.viewer.mpl.drawModel1D(ax=ax,
@@ -728,6 +761,7 @@ class MeshModelling(Modelling):
 
     def setMesh(self, mesh, ignoreRegionManager=False):
         """Set mesh and specify whether region manager can be ignored."""
+        closeWorkerPool(self)
         # keep a copy, just in case
         self._baseMesh = mesh
 
@@ -880,14 +914,156 @@ class PetroModelling(MeshModelling):
 
 
 # 220817 to be changed later!!
+def _dispatcherResponse(dispatcher, i, model):
+    """Response of the i-th operator of a dispatcher (in a worker)."""
+    return dispatcher.fops[i].response(model)
+
+
+class FopDispatcher(object):
+    """Concurrent evaluation of independent forward operators.
+
+    The responses of all forward operators are computed on the persistent
+    worker pool of the dispatcher (backend='process', see
+    :py:func:`pygimli.core.workerpool.parallelMap`) or in a thread pool
+    (backend='thread') and written into a single preallocated array.
+    Threads only run concurrently for operators that release the GIL during
+    their response, which most pg and Python operators do not, so they
+    usually bring no speedup. Jacobians are always created in threads as
+    they have to remain in the memory of the calling process.
+    Wall times are accumulated per operator in `timings`.
+
+    Attributes
+    ----------
+    fops : list
+        Forward operators sharing the same model.
+    nWorkers : int
+        Number of concurrent workers, 1 evaluates serially. Limited by the
+        CPU budget, which is shared among the workers (see
+        :py:mod:`pygimli.core.parallel`).
+    backend : str ['process']
+        'process' or 'thread' (only for operators releasing the GIL) for
+        the response computation.
+    timings : dict
+        Accumulated seconds per operator for 'response' and 'jacobian'.
+    """
+
+    def __init__(self, fops, nWorkers=1, backend="process"):
+        """Initialize with list of forward operators."""
+        if backend not in ("thread", "process"):
+            pg.critical("Unknown backend:", backend)
+
+        self.fops = fops
+        self.nWorkers = nWorkers
+        self.backend = backend
+        self.offsets = None
+        self.resetTimings()
+
+    def resetTimings(self):
+        """Reset accumulated timings and call counts."""
+        self.timings = {"response": np.zeros(len(self.fops)),
+                        "jacobian": np.zeros(len(self.fops))}
+        self.calls = {"response": 0, "jacobian": 0}
+
+    def setDataSizes(self, sizes):
+        """Set data sizes of the operators to preallocate responses."""
+        self.offsets = np.cumsum(np.concatenate([[0], sizes])).astype(int)
+
+    def _workers(self):
+        return workerCount(self.nWorkers, len(self.fops))
+
+    def closeWorkerPool(self):
+        """Stop the worker pool holding copies of the operators."""
+        closeWorkerPool(self)
+
+    def _run(self, fun):
+        """Call fun(i) for all operators, return the wall time of each."""
+        def timed(i):
+            tic = time.perf_counter()
+            fun(i)
+            return time.perf_counter() - tic
+
+        nWorkers = self._workers()
+        if nWorkers == 1:
+            return np.array([timed(i) for i in range(len(self.fops))])
+
+        from concurrent.futures import ThreadPoolExecutor
+        with parallel(cpus=threadsPerWorker(nWorkers)):
+            with ThreadPoolExecutor(max_workers=nWorkers) as pool:
+                return np.array(list(pool.map(timed,
+                                              range(len(self.fops)))))
+
+    def _record(self, key, times):
+        if len(self.timings[key]) != len(times):
+            self.resetTimings()
+
+        self.timings[key] += times
+        self.calls[key] += 1
+
+    def response(self, model):
+        """Concatenated response of all operators for the same model."""
+        if self.offsets is None:
+            resps = [None] * len(self.fops)
+
+            def fun(i):
+                resps[i] = np.asarray(self.fops[i].response(model))
+
+            times = self._run(fun)
+            self.setDataSizes([len(r) for r in resps])
+            out = np.concatenate(resps)
+        elif self.backend == "process" and self._workers() > 1:
+            out, times = parallelMap(self, _dispatcherResponse,
+                                     [(i, model)
+                                      for i in range(len(self.fops))],
+                                     nWorkers=self._workers(),
+                                     sizes=np.diff(self.offsets))
+        else:
+            out = np.empty(self.offsets[-1])
+            off = self.offsets
+
+            def fun(i):
+                out[off[i]:off[i+1]] = self.fops[i].response(model)
+
+            times = self._run(fun)
+
+        self._record("response", times)
+        return out
+
+    def createJacobian(self, model):
+        """Create the Jacobian matrices of all operators."""
+        self._record("jacobian",
+                     self._run(lambda i: self.fops[i].createJacobian(model)))
+
+    def summary(self):
+        """Return table of accumulated wall times per operator."""
+        total = sum(t.sum() for t in self.timings.values())
+        lines = ["{:<24s}{:>12s}{:>12s}{:>8s}".format(
+            "operator", "response/s", "jacobian/s", "share")]
+        for i, f in enumerate(self.fops):
+            tR = self.timings["response"][i]
+            tJ = self.timings["jacobian"][i]
+            lines.append("{:<24s}{:>12.3f}{:>12.3f}{:>7.1f}%".format(
+                "{}: {}".format(i, type(f).__name__), tR, tJ,
+                100 * (tR + tJ) / max(total, 1e-12)))
+
+        lines.append("calls: {} responses, {} jacobians".format(
+            self.calls["response"], self.calls["jacobian"]))
+        return "\n".join(lines)
+
+
 # class JointModelling(Modelling):
 class JointModelling(MeshModelling):
-    """Cumulative (joint) forward operator."""
+    """Cumulative (joint) forward operator.
+
+    The forward operators can be evaluated concurrently (see
+    :py:class:`FopDispatcher`) using nWorkers threads or processes.
+    """
 
-    def __init__(self, fopList):
+    def __init__(self, fopList, nWorkers=1, backend="process"):
         """Initialize with lists of forward operators."""
         super().__init__()
         self.fops = fopList
+        self.dispatcher = FopDispatcher(self.fops, nWorkers=nWorkers,
+                                        backend=backend)
         self.jac = pg.matrix.BlockMatrix()
 
         # self.modelTrans = self.fops[0].modelTrans
@@ -901,34 +1077,43 @@ class JointModelling(MeshModelling):
         pModel = self._petroTrans.inv(sm)
         return pModel
 
+    @property
+    def timings(self):
+        """Accumulated wall times per forward operator."""
+        return self.dispatcher.timings
+
     def response(self, model):
         """Concatenate responses for all fops."""
-        resp = []
-        for f in self.fops:
-            resp.extend(f.response(model))
-        return resp
+        return self.dispatcher.response(model)
+
+    def closeWorkerPool(self):
+        """Stop the worker pools of the operator and the dispatcher."""
+        closeWorkerPool(self)
+        self.dispatcher.closeWorkerPool()
 
     def createJacobian(self, model):
         """Fill the individual Jacobian matrices."""
         self.initJacobian()
-        for f in self.fops:
-            f.createJacobian(model)
+        self.dispatcher.createJacobian(model)
 
     def setData(self, data):
         """Distribute list of data to the forward operators."""
         if len(data) != len(self.fops):
             pg.critical("Please provide data for all forward operators")
 
+        self.closeWorkerPool()
         self._data = data
         nData = 0
         for i, fi in enumerate(self.fops):
             fi.setData(data[i])
             self.jac.addMatrix(fi.jacobian(), nData, 0)
             nData += data[i].size()  # update total vector length
+        self.dispatcher.setDataSizes([d.size() for d in data])
         self.setJacobian(self.jac)
 
     def setMesh(self, mesh, **kwargs):  # to be removed from here
         """Set the parameter mesh to all fops."""
+        self.closeWorkerPool()
         for fi in self.fops:
             fi.setMesh(mesh)
 
@@ -939,15 +1124,33 @@ class JointModelling(MeshModelling):
         # self.setRegionManager(self.fops[0].regionManagerRef())
 
 
+def _flatResponses(resp):
+    """Concatenate batch responses (array or list of arrays)."""
+    if isinstance(resp, np.ndarray):
+        return resp.ravel()
+
+    return np.concatenate([np.ravel(r) for r in resp])
+
+
+def _soundingResponses(fop, start, stop, models):
+    """Batch responses of the soundings start:stop of an LCModelling."""
+    fops = fop._fops1D[start:stop]
+    return _flatResponses(fops[0].batchResponse(models, fops))
+
+
 class LCModelling(Modelling):
     """2D Laterally constrained (LC) modelling.
 
     2D Laterally constrained (LC) modelling based on BlockMatrices.
+    For Block1DModelling soundings, all soundings are computed at once by
+    their batchResponse method (possibly split over nWorkers processes) and
+    the Jacobian is a single sparse block-diagonal matrix.
     """
 
     def __init__(self, fop, **kwargs):
-        """Parameters: fop class ."""
+        """Parameters: fop class and nWorkers (processes) [1]."""
         super(LCModelling, self).__init__()
+        self.nWorkers = kwargs.pop("nWorkers", 1)
         self._singleRegion = False
         self._fopTemplate = fop
         self._fopKwargs = kwargs
@@ -956,6 +1159,8 @@ class LCModelling(Modelling):
         self._nSoundings = 0
         self._parPerSounding = 0
         self._jac = None
+        self._sJac = None
+        self._dataOffsets = None
 
         self.soundingPos = None
 
@@ -965,6 +1170,7 @@ class LCModelling(Modelling):
         Set a common data basis to all forward operators.
         If you want individual you need to set them manually.
         """
+        closeWorkerPool(self)
         for f in self._fops1D:
             f.setDataBasis(**kwargs)
 
@@ -980,24 +1186,70 @@ class LCModelling(Modelling):
             sm = pg.cat(sm, f.createDefaultStartModel(models[i]))
         return sm
 
+    @property
+    def _isBatch(self):
+        """Soundings can be computed at once by batchResponse."""
+        return len(self._fops1D) > 0 and \
+            isinstance(self._fops1D[0], Block1DModelling)
+
+    def _batchResponses(self, mods):
+        """Compute responses of all soundings (in parallel) as one vector."""
+        fops = self._fops1D
+        if not self._isBatch:
+            return np.concatenate([np.asarray(f.response(m))
+                                   for f, m in zip(fops, mods)])
+
+        nProcs = workerCount(self.nWorkers, len(fops))
+        if nProcs == 1 or self._dataOffsets is None:  # need the data sizes
+            return _flatResponses(fops[0].batchResponse(mods, fops))
+
+        args = [(ids[0], ids[-1] + 1, mods[ids])
+                for ids in np.array_split(np.arange(len(fops)), nProcs)]
+        sizes = [self._dataOffsets[b] - self._dataOffsets[a]
+                 for a, b, _ in args]
+        return parallelMap(self, _soundingResponses, args, nWorkers=nProcs,
+                           sizes=sizes)[0]
+
     def response(self, par):
         """Cut together forward responses of all soundings."""
         mods = np.asarray(par).reshape(self._nSoundings, self._parPerSounding)
-
-        resp = pg.Vector(0)
-        for i in range(self._nSoundings):
-            r = self._fops1D[i].response(mods[i])
-            # print("i:", i, mods[i], r)
-            resp = pg.cat(resp, r)
-
-        return resp
+        return self._batchResponses(mods)
 
     def createJacobian(self, par):
-        """Create Jacobian matrix by creating individual Jacobians."""
+        """Create Jacobian matrix by creating individual Jacobians.
+
+        For batch-enabled soundings, the brute-force Jacobian is computed by
+        one batch response per sounding parameter and written into a sparse
+        block-diagonal matrix.
+        """
         mods = np.asarray(par).reshape(self._nSoundings, self._parPerSounding)
+        if not self._isBatch or self._dataOffsets is None:
+            for i in range(self._nSoundings):
+                self._fops1D[i].createJacobian(mods[i])
+            return
 
-        for i in range(self._nSoundings):
-            self._fops1D[i].createJacobian(mods[i])
+        from scipy.sparse import csr_matrix
+
+        fak = 1.05
+        nPar = self._parPerSounding
+        resp = self._batchResponses(mods)
+        sounding = np.repeat(np.arange(self._nSoundings),
+                             np.diff(self._dataOffsets))
+        vals = np.zeros((len(resp), nPar))
+        for j in range(nPar):
+            modsJ = mods.copy()
+            modsJ[:, j] *= fak
+            dm = (modsJ[:, j] - mods[:, j])[sounding]
+            dr = self._batchResponses(modsJ) - resp
+            vals[:, j] = np.where(np.abs(dm) > 1e-12,
+                                  dr / np.where(dm == 0, 1, dm), 0.0)
+
+        cols = sounding[:, np.newaxis] * nPar + np.arange(nPar)
+        J = csr_matrix((vals.ravel(), cols.ravel(),
+                        np.arange(0, len(resp) * nPar + 1, nPar)),
+                       shape=(len(resp), mods.size))
+        self._sJac = pg.utils.toSparseMatrix(J)
+        self.setJacobian(self._sJac)
 
     def createParametrization(self, nSoundings, nLayers=4, nPar=1):
         """Create LCI mesh and suitable constraints informations.
@@ -1057,6 +1309,7 @@ class LCModelling(Modelling):
             All data per sounding need to be equal in length.
             If they don't fit into a matrix use list of sounding data.
         """
+        closeWorkerPool(self)
         nSoundings = len(dataVals)
 
         if nPar is None:
@@ -1096,6 +1349,7 @@ class LCModelling(Modelling):
             self._jac.addMatrixEntry(nID, nData, self._parPerSounding * i)
             nData += len(dataVals[i])
 
+        self._dataOffsets = np.cumsum([0] + [len(d) for d in dataVals])
         self._jac.recalcMatrixSize()
         # print("Jacobian size:", self.J.rows(), self.J.cols(), nData)
         self.setJacobian(self._jac)
@@ -1110,7 +1364,13 @@ class LCModelling(Modelling):
 
 
 class ParameterModelling(Modelling):
-    """Model with symbolic parameter names instead of numbers."""
+    """Model with symbolic parameter names instead of numbers.
+
+    The Jacobian matrix is computed by finite differences (jacobian='fd')
+    or complex steps (jacobian='complex'). If the function broadcasts,
+    i.e., it can be called with the data space as row vector and parameter
+    column vectors, all perturbed parameter sets are computed in one call.
+    """
 
     def __init__(self, funct=None, **kwargs):
         """Initialize, optionally with given function."""
@@ -1118,8 +1378,12 @@ class ParameterModelling(Modelling):
         self._params = {}
         self.dataSpace = None  # x, t freqs, or whatever
         self.defaultModelTrans = 'lin'
+        self.jacobianMethod = kwargs.pop('jacobian', 'fd')
+        self._vectorized = None  # unknown if function broadcasts
+        self._J = pg.Matrix()
 
         super(ParameterModelling, self).__init__(**kwargs)
+        self.setJacobian(self._J)
 
         if funct is not None:
             self._initFunction(funct)
@@ -1132,6 +1396,7 @@ class ParameterModelling(Modelling):
     def _initFunction(self, funct):
         """Init any function and interpret possible args and kwargs."""
         self.function = funct
+        self._vectorized = None
         # the first varname is suposed to be f or freqs
         self.dataSpaceName = funct.__code__.co_varnames[0]
         pg.debug('data space:', self.dataSpaceName)
@@ -1161,6 +1426,108 @@ class ParameterModelling(Modelling):
         ret = self.function(self.dataSpace, *params)
         return ret
 
+    def batchResponse(self, params):
+        """Compute responses for many parameter sets at once.
+
+        Parameters
+        ----------
+        params : array (nSets, nParameters)
+            Parameter sets, may be complex for complex-step derivatives.
+
+        Returns
+        -------
+        resp : array (nSets, nData)
+        """
+        if self.dataSpace is None:
+            pg.critical('no data space given')
+
+        params = np.atleast_2d(params)
+        x = np.asarray(self.dataSpace)
+        if self._vectorized is not False:
+            try:
+                ret = np.asarray(self.function(
+                    x[np.newaxis, :], *[p[:, np.newaxis] for p in params.T]))
+                if ret.shape == (len(params), len(x)) and (
+                        self._vectorized or self._isRowWise(x, params, ret)):
+                    if len(params) > 1:  # otherwise nothing mixed yet
+                        self._vectorized = True
+                    return ret
+            except Exception as e:
+                pg.debug('function does not broadcast:', e)
+
+            self._vectorized = False
+
+        return np.array([self.function(x, *p) for p in params])
+
+    def _isRowWise(self, x, params, ret):
+        """Check a broadcast result against single function calls.
+
+        Functions reducing over the data axis (e.g. normalizing by np.max
+        or np.sum) broadcast to the right shape but mix the parameter sets.
+        """
+        for i in sorted({0, len(params) - 1}):
+            ref = np.asarray(self.function(x, *params[i]))
+            if ref.shape != ret[i].shape or \
+                    not np.allclose(ret[i], ref, rtol=1e-10, atol=0):
+                pg.debug('function does not broadcast row-wise')
+                return False
+        return True
+
+    def batchJacobian(self, params):
+        """Compute Jacobian matrices for many parameter sets at once.
+
+        All perturbed parameter sets are computed by a single call of
+        :py:meth:`batchResponse`.
+
+        Parameters
+        ----------
+        params : array (nSets, nParameters)
+            Parameter sets.
+
+        Returns
+        -------
+        J : array (nSets, nData, nParameters)
+        """
+        params = np.atleast_2d(np.asarray(params, dtype=float))
+        nS, nP = params.shape
+        if self.jacobianMethod == 'complex':
+            h = 1e-20 * np.maximum(np.abs(params), 1.0)
+            pert = np.repeat(params[:, np.newaxis, :], nP,
+                             axis=1).astype(complex)
+            pert[:, np.arange(nP), np.arange(nP)] += 1j * h
+            try:
+                resp = self.batchResponse(pert.reshape(-1, nP))
+                if np.iscomplexobj(resp):
+                    return np.transpose(resp.imag.reshape(nS, nP, -1),
+                                        (0, 2, 1)) / h[:, np.newaxis, :]
+            except Exception as e:
+                pg.debug(e)
+
+            pg.warn('Function does not support complex steps. '
+                    'Using finite differences instead.')
+            self.jacobianMethod = 'fd'
+
+        # relative perturbation like the brute-force core Jacobian
+        dm = params * 0.05
+        dm[np.abs(dm) < 1e-12] = 1e-6
+        pert = np.repeat(params[:, np.newaxis, :], nP + 1, axis=1)
+        pert[:, np.arange(1, nP+1), np.arange(nP)] += dm
+        resp = self.batchResponse(pert.reshape(-1, nP)).reshape(
+            nS, nP+1, -1)
+        return np.transpose(resp[:, 1:] - resp[:, :1],
+                            (0, 2, 1)) / dm[:, np.newaxis, :]
+
+    def createJacobian(self, params):
+        """Create Jacobian matrix by one vectorized function call."""
+        J = self.batchJacobian(np.asarray(params))[0]
+        if hasattr(self._J, 'setArray'):
+            self._J.setArray(np.ascontiguousarray(J))
+            return
+
+        self._J.resize(*J.shape)
+        for i, row in enumerate(J):
+            self._J.setVal(i, row)
+
     def setRegionProperties(self, k, **kwargs):
         """Set Region Properties by parameter name."""
         if isinstance(k, int) or (k == '*'):
@@ -24,10 +24,14 @@ def scaledJacobianMatrix(inv):
     d = inv.dataTrans.error(inv.response, inv.errorVals)
     left = np.reshape(inv.dataTrans.deriv(inv.response) / d, [-1, 1])
     right = np.reshape(1 / inv.modelTrans.deriv(inv.model), [1, -1])
-    if isinstance(J, pg.Matrix):  # e.g. ERT
-        return left * pg.utils.gmat2numpy(J) * right
-    elif isinstance(J, pg.SparseMapMatrix):  # e.g. Traveltime
-        return left * pg.utils.sparseMat2Numpy.sparseMatrix2Dense(J) * right
+    if isinstance(J, (pg.Matrix,  # e.g. ERT
+                      pg.SparseMapMatrix,  # e.g. Traveltime
+                      pg.matrix.SparseMatrix, pg.matrix.RealNumpyMatrix,
+                      np.ndarray)):
+        DJ = pg.utils.gmat2numpy(J, copy=True)
+        DJ *= left
+        DJ *= right
+        return DJ
     else:
         raise TypeError("Matrix type cannot be converted")
 
@@ -93,6 +97,37 @@ def modelResolutionMatrix(inv):
     """
     return resolutionMatrix(inv)
 
+
+def _weightedSystem(inv):
+    r"""Return error-weighted Jacobian and matrix-free inverse problem matrix.
+
+    The Jacobian is scaled by the data and model transformations and the
+    data errors (compare :py:func:`scaledJacobianMatrix`), the constraints by
+    the constraint weights and the regularization strength, so that
+    :math:`\mathbf{A}^T\mathbf{A}=\mathbf{J}^T\mathbf{D}^T\mathbf{D}
+    \mathbf{J} + \lambda\mathbf{C}^T\mathbf{W}^T\mathbf{W}\mathbf{C}`.
+
+    Returns
+    -------
+    DS : pg.matrix.MultLeftRightMatrix
+        error-weighted and transformation-scaled Jacobian
+    JC : pg.BlockMatrix
+        stacked matrix A=[DS; sqrt(lam)*WC] for the LSQR solver
+    """
+    d = inv.dataTrans.error(inv.response, inv.errorVals)
+    left = inv.dataTrans.deriv(inv.response) / d
+    right = 1 / inv.modelTrans.deriv(inv.model)
+    DS = pg.matrix.MultLeftRightMatrix(inv.fop.jacobian(), left, right)
+    C = inv.fop.constraints()  # (sparse) regularization matrix
+    cw = inv.fop.regionManager().constraintWeights()
+    WC = pg.matrix.MultLeftMatrix(C, cw)
+    JC = pg.BlockMatrix()
+    JC.addMatrix(DS, 0, 0)
+    JC.addMatrix(WC, DS.rows(), 0, np.sqrt(inv.lam))
+    JC.recalcMatrixSize()
+    return DS, JC
+
+
 def modelResolutionKernel(inv, nr=0, maxiter=50):
     """Compute single resolution kernel by solving an inverse problem.
 
@@ -111,22 +146,162 @@ def modelResolutionKernel(inv, nr=0, maxiter=50):
         resolution
     """
     from pygimli.solver.leastsquares import lsqr
-    td = inv.dataTrans  # data transformation (e.g. lin/log/symlog)
-    tm = inv.modelTrans  # model transformation (typically log or logLU)
-    C = inv.fop.constraints()  # (sparse) regularization matrix
-    left = td.deriv(inv.response) / inv.errorVals
-    right = 1 / tm.deriv(inv.model)
-    DS = pg.matrix.MultLeftRightMatrix(inv.fop.jacobian(), left, right)
-    JC = pg.BlockMatrix()
-    JC.addMatrix(DS, 0, 0)
-    JC.addMatrix(C, DS.rows(), 0, np.sqrt(inv.lam))
-    JC.recalcMatrixSize()
+    DS, JC = _weightedSystem(inv)
     if isinstance(nr, int):
         invec = pg.cat(pg.math.matrix.matrixColumn(DS, nr),
-                       pg.Vector(C.rows()))
-        return lsqr(JC, invec, maxiter=50)
+                       pg.Vector(JC.rows() - DS.rows()))
+        return lsqr(JC, invec, maxiter=maxiter)
+
+
+def _resolutionMult(DS, JC, v, maxiter=50, tol=1e-8):
+    """Resolution matrix times vector, i.e. one matrix-free LSQR solve."""
+    from pygimli.solver.leastsquares import lsqr
+    rhs = pg.cat(DS.mult(v), pg.Vector(JC.rows() - DS.rows()))
+    return np.asarray(lsqr(JC, rhs, maxiter=maxiter, tol=tol))
+
+
+def _randomizedEigenBasis(DS, rank, oversampling=10, seed=None):
+    """Dominant eigenvectors of DS^T DS by a randomized range finder.
+
+    Uses one power iteration and only matrix-vector products with DS, see
+    Halko et al. (2011), Algorithm 4.4 and 5.3.
+    """
+    rng = np.random.default_rng(seed)
+    nM = DS.cols()
+    k = min(rank + oversampling, nM)
+    Y = np.empty((nM, k))
+    for i in range(k):
+        Y[:, i] = DS.transMult(DS.mult(rng.standard_normal(nM)))
+    Q = np.linalg.qr(Y)[0]
+    DQ = np.empty((DS.rows(), k))
+    for i in range(k):
+        DQ[:, i] = DS.mult(Q[:, i])
+    ev, W = np.linalg.eigh(DQ.T @ DQ)
+    return Q @ W[:, ::-1][:, :min(rank, k)]
+
+
+def modelResolutionDiagonal(inv, method='hutchinson', nProbes=32,
+                            maxiter=50, tol=1e-8, seed=None, verbose=False):
+    r"""Estimate the model resolution diagonal without forming matrices.
+
+    Instead of inverting the dense :math:`n_M\times n_M` normal equation
+    matrix like :py:func:`resolutionMatrix`, the resolution matrix
+    :math:`\mathbf{R_M}` is only applied to a number of probe vectors.
+    Every application is a matrix-free LSQR solve using products with the
+    error-weighted Jacobian (:py:class:`pg.matrix.MultLeftRightMatrix`) and
+    the constraints, stacked into a :py:class:`pg.BlockMatrix`.
+
+    Two kinds of probes are available:
+
+    * 'hutchinson' - stochastic diagonal estimator of Bekas et al. (2007)
+      with random Rademacher vectors
+      :math:`\mathrm{diag}(\mathbf{R})\approx\sum_k\mathbf{v}_k\odot
+      \mathbf{R}\mathbf{v}_k / \sum_k\mathbf{v}_k\odot\mathbf{v}_k`
+    * 'rsvd' - deterministic projection onto the nProbes dominant right
+      singular vectors :math:`\mathbf{V}` of the error-weighted Jacobian
+      obtained by randomized SVD,
+      :math:`\mathrm{diag}(\mathbf{R})\approx\sum_k\mathbf{v}_k\odot
+      \mathbf{R}\mathbf{v}_k`. Since :math:`\mathbf{R}` vanishes outside
+      of the data-informed subspace, this converges fast with nProbes.
+
+    Parameters
+    ----------
+    inv : pg.Inversion
+        pygimli inversion instance after inversion
+    method : str ['hutchinson']
+        probing method, 'hutchinson' or 'rsvd'
+    nProbes : int [32]
+        number of probe vectors (LSQR solves), or rank for 'rsvd'
+    maxiter : int [50]
+        maximum iterations for every LSQR solve
+    tol : float [1e-8]
+        tolerance for every LSQR solve
+    seed : int [None]
+        seed for the random number generator
+    verbose : bool [False]
+        be verbose
+
+    Returns
+    -------
+    rm : np.array
+        estimated diagonal of the model resolution matrix
+    """
+    DS, JC = _weightedSystem(inv)
+    nM = DS.cols()
+
+    if method == 'rsvd':
+        probes = _randomizedEigenBasis(DS, nProbes, seed=seed).T
+    elif method == 'hutchinson':
+        rng = np.random.default_rng(seed)
+        probes = rng.choice([-1.0, 1.0], size=(nProbes, nM))
+    else:
+        pg.critical("Unknown resolution estimation method:", method)
+
+    t = np.zeros(nM)
+    q = np.zeros(nM)
+    for i, v in enumerate(probes):
+        t += v * _resolutionMult(DS, JC, v, maxiter=maxiter, tol=tol)
+        q += v * v
+        if verbose:
+            pg.info("Probe {0}/{1}".format(i + 1, len(probes)))
+
+    if method == 'rsvd':
+        return t
+
+    return t / q
+
+
+def modelPosteriorStd(inv, nSamples=32, maxiter=50, tol=1e-8, seed=None,
+                      verbose=False):
+    r"""Estimate posterior model standard deviations without forming matrices.
+
+    The posterior covariance of the (transformed) model is
+    :math:`(\mathbf{A}^T\mathbf{A})^{-1}` with :math:`\mathbf{A}` being
+    the error-weighted Jacobian stacked on the weighted constraints. For
+    random standard normal vectors :math:`\mathbf{w}` in data and
+    constraint space, the least-squares solutions
+    :math:`\mathbf{x}=(\mathbf{A}^T\mathbf{A})^{-1}\mathbf{A}^T\mathbf{w}`
+    have exactly this covariance, so that its diagonal is estimated by
+    :math:`\langle\mathbf{x}\odot\mathbf{x}\rangle` from nSamples
+    matrix-free LSQR solves.
+
+    Parameters
+    ----------
+    inv : pg.Inversion
+        pygimli inversion instance after inversion
+    nSamples : int [32]
+        number of random samples (LSQR solves)
+    maxiter : int [50]
+        maximum iterations for every LSQR solve
+    tol : float [1e-8]
+        tolerance for every LSQR solve
+    seed : int [None]
+        seed for the random number generator
+    verbose : bool [False]
+        be verbose
+
+    Returns
+    -------
+    std : np.array
+        estimated standard deviations of the transformed model parameters,
+        i.e., relative deviations for logarithmic model transformation
+    """
+    from pygimli.solver.leastsquares import lsqr
+    DS, JC = _weightedSystem(inv)
+    rng = np.random.default_rng(seed)
+
+    var = np.zeros(DS.cols())
+    for i in range(nSamples):
+        x = np.asarray(lsqr(JC, rng.standard_normal(JC.rows()),
+                            maxiter=maxiter, tol=tol))
+        var += x * x
+        if verbose:
+            pg.info("Sample {0}/{1}".format(i + 1, nSamples))
+
+    return np.sqrt(var / nSamples)
+
 
-def modelResolutionRadius(inv, nr=None, RM=None):
+def modelResolutionRadius(inv, nr=None, RM=None, estimate=False, **kwargs):
     """Compute resolution radius from model resolution matrix diagonal.
 
     According to Friedel (2003), it is defined as the radius of a circle (2D) or
@@ -139,6 +314,10 @@ def modelResolutionRadius(inv, nr=None, RM=None):
         compute only resolution radius for a single cell (otherwise all cells)
     RM : numpy.matrix [None]
         already existing resolution matrix, otherwise compute it
+    estimate : bool [False]
+        estimate the resolution diagonal for all cells matrix-free by
+        :py:func:`modelResolutionDiagonal` instead of computing the full
+        resolution matrix, kwargs are forwarded
     """
     pd = inv.paraDomain
     cs = pd.cellSizes()
@@ -149,6 +328,8 @@ def modelResolutionRadius(inv, nr=None, RM=None):
             rm = modelResolutionKernel(inv, nr=nr)[nr]
 
         cs = cs[nr]
+    elif estimate and RM is None:
+        rm = modelResolutionDiagonal(inv, **kwargs)
     else:
         if RM is None:
             RM = modelResolutionMatrix(inv)
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""pyGIMLi - Performance telemetry for inversions and forward operators.
+
+Records wall time, call counts and memory of the phases of an inversion
+run (forward response, Jacobian, constraints, model update, line search)
+for every iteration.
+
+Example
+-------
+>>> import pygimli as pg
+>>> tel = pg.frameworks.Telemetry()
+>>> with tel.phase('response'):
+...     _ = sum(range(100))
+>>> tel.calls('response')
+1
+"""
+import json
+import os
+import sys
+import time
+import types
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def _peakRSS():
+    """Return the peak resident memory since the last reset in byte."""
+    try:
+        with open('/proc/self/status') as fi:
+            for line in fi:
+                if line.startswith('VmHWM:'):
+                    return float(line.split()[1]) * 1024
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:  # Windows
+        return np.nan
+
+    # lifetime peak, cannot be reset
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return float(peak)
+    return float(peak) * 1024  # kB on Linux
+
+
+def _resetPeakRSS():
+    """Reset the peak resident memory to the current one (Linux only)."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as fi:
+            fi.write('5')
+    except OSError:
+        pass
+
+
+def _peakTraced():
+    """Return the peak of traced (Python and numpy) memory in byte."""
+    import tracemalloc
+    return float(tracemalloc.get_traced_memory()[1])
+
+
+def _resetPeakTraced():
+    """Reset the peak of traced memory to the current one."""
+    import tracemalloc
+    tracemalloc.reset_peak()
+
+
+class Telemetry(object):
+    """Wall time, call counts and peak memory of inversion phases.
+
+    Phases are recorded with :py:meth:`phase` and can be nested. The time
+    of a phase includes its nested phases, the exclusive (self) time is
+    available by :py:meth:`selfTimes`. Forward operator methods are timed
+    by :py:meth:`instrument`, which also works for calls from the C++ core.
+
+    Memory is the peak memory during a phase (including its nested phases).
+    With memory='rss' this is the peak resident memory of the process. On
+    Linux it is reset when a top-level phase starts, so nested phases
+    report the peak since their top-level phase started. Elsewhere it is
+    the peak of the process lifetime. The reset is process-wide and not
+    done for nested phases, which would cost a system call for every
+    forward response. With memory='tracemalloc' the peak of the Python and
+    numpy allocations is recorded for every phase on all platforms (C++
+    allocations of the core are not traced).
+
+    Attributes
+    ----------
+    iter: int
+        Current iteration, set by the inversion. Records are tagged with it.
+    records: list
+        One tuple (name, iter, start, duration, peakMemory, depth) per call.
+    """
+
+    fields = ('name', 'iter', 'start', 'duration', 'peakMemory', 'depth')
+
+    def __init__(self, memory='rss'):
+        """Initialize empty records.
+
+        Parameters
+        ----------
+        memory: str ['rss']
+            Peak memory measure, 'rss' or 'tracemalloc'.
+        """
+        if memory == 'rss':
+            self._peak, self._resetPeak = _peakRSS, _resetPeakRSS
+            self._resetNested = False
+        elif memory == 'tracemalloc':
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._peak, self._resetPeak = _peakTraced, _resetPeakTraced
+            self._resetNested = True
+        else:
+            raise ValueError("memory needs to be 'rss' or 'tracemalloc'")
+
+        self.records = []
+        self.iter = 0
+        self._depth = 0
+        self._peaks = []  # running peak of the open phases
+        self._t0 = time.perf_counter()
+        self._instrumented = []
+
+    def reset(self):
+        """Remove all records."""
+        self.records = []
+        self.iter = 0
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        """Context manager timing the enclosed code as phase name."""
+        depth = self._depth
+        self._depth += 1
+        reset = depth == 0 or self._resetNested
+        if reset:
+            # the peak counter is shared, keep the peak of the enclosing
+            # phase
+            if self._peaks:
+                self._peaks[-1] = np.fmax(self._peaks[-1], self._peak())
+            self._resetPeak()
+        self._peaks.append(np.nan)
+        tic = time.perf_counter()
+        try:
+            yield
+        finally:
+            toc = time.perf_counter()
+            self._depth = depth
+            peak = float(np.fmax(self._peaks.pop(), self._peak()))
+            if self._resetNested:
+                self._resetPeak()
+            if self._peaks:
+                self._peaks[-1] = np.fmax(self._peaks[-1], peak)
+            self.records.append((name, self.iter, tic - self._t0, toc - tic,
+                                 peak, depth))
+
+    def instrument(self, fop, methods=('response', 'createJacobian',
+                                       'createConstraints')):
+        """Time the given methods of the forward operator fop.
+
+        The methods are replaced by timed methods of the instance, i.e.,
+        the class and other instances are not affected. Call
+        :py:meth:`release` to restore them.
+        """
+        for name in methods:
+            if not hasattr(fop, name):
+                continue
+
+            old = fop.__dict__.get(name, None)
+            orig = getattr(fop, name)
+
+            def timed(_self, *args, _orig=orig, _name=name, **kwargs):
+                with self.phase(_name):
+                    return _orig(*args, **kwargs)
+
+            # bound method, so the C++ core finds the override
+            setattr(fop, name, types.MethodType(timed, fop))
+            self._instrumented.append((fop, name, old))
+
+    def release(self):
+        """Restore all methods replaced by :py:meth:`instrument`."""
+        for fop, name, old in reversed(self._instrumented):
+            if old is None:
+                delattr(fop, name)
+            else:
+                setattr(fop, name, old)
+        self._instrumented = []
+
+    def names(self):
+        """Return the phase names in order of their first appearance."""
+        return list(dict.fromkeys(r[0] for r in self.records))
+
+    def asArrays(self):
+        """Return the records as dictionary of numpy arrays."""
+        cols = list(zip(*self.records)) or [[]] * len(self.fields)
+        arrs = {}
+        for key, col in zip(self.fields, cols):
+            if key == 'name':
+                arrs[key] = np.array(col, dtype=str)
+            elif key in ('iter', 'depth'):
+                arrs[key] = np.array(col, dtype=int)
+            else:
+                arrs[key] = np.array(col, dtype=float)
+        return arrs
+
+    def calls(self, name):
+        """Return the number of calls of phase name."""
+        return sum(1 for r in self.records if r[0] == name)
+
+    def times(self, name):
+        """Return the accumulated wall time of phase name per iteration."""
+        a = self.asArrays()
+        if len(a['iter']) == 0:
+            return np.zeros(0)
+        return np.bincount(a['iter'], weights=a['duration'] *
+                           (a['name'] == name), minlength=max(a['iter']) + 1)
+
+    def selfTimes(self):
+        """Return the exclusive time of every phase (without nested
+        phases) as dictionary."""
+        a = self.asArrays()
+        excl = a['duration'].copy()
+        # every record is appended after its nested records
+        stack = []  # (depth, index)
+        for i in range(len(excl)):
+            while stack and stack[-1][0] > a['depth'][i]:
+                j = stack.pop()[1]
+                if a['depth'][j] == a['depth'][i] + 1:
+                    excl[i] -= a['duration'][j]
+            stack.append((a['depth'][i], i))
+        return {n: excl[a['name'] == n].sum() for n in self.names()}
+
+    def summary(self):
+        """Return table of calls, time and peak memory of all phases."""
+        a = self.asArrays()
+        excl = self.selfTimes()
+        total = a['duration'][a['depth'] == 0].sum()
+        lines = ["{:<22s}{:>7s}{:>11s}{:>11s}{:>8s}{:>11s}".format(
+            'phase', 'calls', 'total/s', 'self/s', 'share', 'peak/MB')]
+        for n in self.names():
+            idx = a['name'] == n
+            lines.append(
+                "{:<22s}{:>7d}{:>11.3f}{:>11.3f}{:>7.1f}%{:>11.1f}".format(
+                    n, int(idx.sum()), a['duration'][idx].sum(), excl[n],
+                    100 * excl[n] / max(total, 1e-12),
+                    np.max(a['peakMemory'][idx]) / 1024**2))
+        return "\n".join(lines)
+
+    def exportChromeTrace(self, fileName):
+        """Write the records as Chrome trace (JSON) file.
+
+        The file can be viewed with chrome://tracing or ui.perfetto.dev.
+        """
+        pid = os.getpid()
+        events = [dict(name=r[0], ph='X', pid=pid, tid=0,
+                       ts=r[2] * 1e6, dur=r[3] * 1e6,
+                       args=dict(iter=r[1], peakMemory=r[4]))
+                  for r in self.records]
+        with open(fileName, 'w') as fi:
+            json.dump(dict(traceEvents=events, displayTimeUnit='ms'), fi)
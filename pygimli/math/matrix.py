@@ -120,6 +120,8 @@ class RealNumpyMatrix(MatrixBase):
     Matrix Wrapper for for ndarrays, providing syntax for pygimli c++ core
     algorithms. Holds reference to a real matrix, providing the correct
     multiplication algorithms for the pygimli inversion process.
+
+    A dense core matrix (pg.Matrix) is converted with one bulk copy.
     """
 
     def __init__(self, mat, copy=False):
@@ -130,6 +132,8 @@ class RealNumpyMatrix(MatrixBase):
         # print('real Matrix')
         if isinstance(mat, str):
             self.M = np.load(mat)
+        elif isinstance(mat, pgcore.RMatrix):
+            self.M = pg.utils.gmat2numpy(mat)
         else:
             if copy is True:
                 self.M = np.copy(mat)
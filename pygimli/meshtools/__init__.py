@@ -19,6 +19,7 @@ from .grid import (createGrid, createGridPieShaped,
 
 from .mapping import (cellDataToBoundaryData, cellDataToNodeData,
                       fillEmptyToCellArray, interpolate, interpolateAlongCurve,
+                      mappingOperator, InterpolationOperator,
                       nodeDataToBoundaryData, nodeDataToCellData,
                       tapeMeasureToCoordinates, extract2dSlice)
 
@@ -6,6 +6,135 @@ import numpy as np
 import pygimli as pg
 
 
+def _boundaryNormals(mesh, nodes, offset, bIdx):
+    """Unit normal vectors of all boundaries (arbitrary sign)."""
+    nB = len(offset) - 1
+    norm = np.zeros((nB, 3))
+    if mesh.dim() == 1 or nB == 0:
+        norm[:, 0] = 1.0
+        return norm
+
+    p0 = nodes[bIdx[offset[:-1]]]
+    p1 = nodes[bIdx[offset[:-1] + 1]]
+    if mesh.dim() == 2:
+        norm[:, 0] = p1[:, 1] - p0[:, 1]
+        norm[:, 1] = p0[:, 0] - p1[:, 0]
+    else:
+        p2 = nodes[bIdx[offset[:-1] + 2]]
+        norm = np.cross(p1 - p0, p2 - p0)
+
+    return norm / np.linalg.norm(norm, axis=1)[:, None]
+
+
+def _buildMappingOperators(mesh):
+    """Create all sparse mapping operators of a mesh, see mappingOperator."""
+    from scipy.sparse import csr_matrix
+    from .mesh import _meshArrays
+
+    mesh.createNeighborInfos()
+    nodes, cells, (offset, bIdx, left, right) = _meshArrays(mesh,
+                                                            boundaries=True)
+    nN, nC, nB = mesh.nodeCount(), mesh.cellCount(), mesh.boundaryCount()
+
+    # cell to node: mean of all cells sharing a node
+    rows = np.concatenate([idx.ravel() for _, idx in cells.values()] + [[]])
+    cols = np.concatenate([np.repeat(cIds, idx.shape[1])
+                           for cIds, idx in cells.values()] + [[]])
+    rows, cols = rows.astype(np.int64), cols.astype(np.int64)
+    count = np.bincount(rows, minlength=nN).astype(float)
+    count[count == 0] = 1.0
+    cellToNode = csr_matrix((1.0 / count[rows], (rows, cols)), shape=(nN, nC))
+
+    # node to boundary: mean of the boundary nodes
+    nb = np.diff(offset)
+    nodeToBoundary = csr_matrix((np.repeat(1.0 / np.maximum(nb, 1), nb),
+                                 bIdx, offset), shape=(nB, nN))
+
+    # cell to boundary: linear by distance to the cell centers
+    bc = np.array(mesh.boundaryCenters())
+    cc = np.array(mesh.cellCenters())
+    hasL, hasR = left > -1, right > -1
+    if not hasL.all():
+        pg.critical("Boundaries without left cell. Mesh is invalid.")
+    both = hasL & hasR
+    dL = np.linalg.norm(bc - cc[left], axis=1)
+    dR = np.zeros(nB)
+    dR[hasR] = np.linalg.norm(bc[hasR] - cc[right[hasR]], axis=1)
+    wL = np.ones(nB)
+    wL[both] = dR[both] / (dL[both] + dR[both])
+    bIds = np.arange(nB)
+    cellToBoundary = csr_matrix(
+        (np.concatenate([wL, 1.0 - wL[both]]),
+         (np.concatenate([bIds, bIds[both]]),
+          np.concatenate([left, right[both]]))), shape=(nB, nC))
+
+    # neighbor graph: cells sharing a boundary, weighted by the horizontal
+    # part of the boundary normal (see Mesh::prolongateEmptyCellsValues)
+    l, r = left[both], right[both]
+    XY = np.array([1.0, 1.0, 0.0]) if mesh.dim() != 2 else \
+        np.array([1.0, 0.0, 0.0])
+    norm = _boundaryNormals(mesh, nodes, offset, bIdx)[both]
+    zWeight = np.linalg.norm(norm * XY, axis=1) + 1e-6
+    neighbors = csr_matrix((np.ones(2 * len(l)),
+                            (np.concatenate([l, r]), np.concatenate([r, l]))),
+                           shape=(nC, nC))
+    horizontal = csr_matrix((np.concatenate([zWeight, zWeight]),
+                             (np.concatenate([l, r]), np.concatenate([r, l]))),
+                            shape=(nC, nC))
+
+    return dict(cellToNode=cellToNode, nodeToBoundary=nodeToBoundary,
+                cellToBoundary=cellToBoundary, neighbors=neighbors,
+                horizontalNeighbors=horizontal)
+
+
+def mappingOperator(mesh, name):
+    """Return a sparse operator that maps data between mesh entities.
+
+    All operators of a mesh are created once by a single pass over the
+    mesh connectivity and cached into mesh._mappingOperators until the
+    mesh changes. Applying an operator to data of shape (n,) or (n, dim)
+    is a single sparse matrix product.
+
+    Parameters
+    ----------
+    mesh : :gimliapi:`GIMLI::Mesh`
+        Any mesh.
+    name : str
+        * 'cellToNode' : (nodeCount, cellCount), mean of all cells sharing
+          a node, see :py:func:`cellDataToNodeData`.
+        * 'nodeToBoundary' : (boundaryCount, nodeCount), mean of the
+          boundary nodes, see :py:func:`nodeDataToBoundaryData`.
+        * 'cellToBoundary' : (boundaryCount, cellCount), linear
+          interpolation of the two neighbor cells by distance, see
+          :py:func:`cellDataToBoundaryData`.
+        * 'neighbors' : (cellCount, cellCount), adjacency of cells that
+          share a boundary.
+        * 'horizontalNeighbors' : (cellCount, cellCount), like neighbors
+          but weighted by the horizontal part of the common boundary normal.
+
+    Returns
+    -------
+    op : scipy.sparse.csr_matrix
+
+    Examples
+    --------
+    >>> import pygimli as pg
+    >>> grid = pg.createGrid(x=(1,2,3),y=(1,2,3))
+    >>> C2N = pg.meshtools.mappingOperator(grid, 'cellToNode')
+    >>> print(C2N.dot([1, 2, 3, 4]))
+    [1.  1.5 2.  2.  2.5 3.  3.  3.5 4. ]
+    """
+    if not hasattr(mesh, '_mappingOperators') or \
+            mesh._mappingOperators[0] != hash(mesh):
+        mesh._mappingOperators = (hash(mesh), _buildMappingOperators(mesh))
+
+    ops = mesh._mappingOperators[1]
+    if name not in ops:
+        pg.critical("Unknown mapping operator '{0}', available are: "
+                    "{1}".format(name, list(ops.keys())))
+    return ops[name]
+
+
 def nodeDataToCellData(mesh, data):
     """Convert node data to cell data.
 
@@ -67,23 +196,18 @@ def cellDataToNodeData(mesh, data, style='mean'):
             str(len(data[0])))
 
     if style == 'mean':
+        C2N = mappingOperator(mesh, 'cellToNode')
 
         if np.ndim(data) == 1:
-            return pg.core.cellDataToPointData(mesh, data)
-
-        if mesh.dim() == 1:
-            return pg.core.cellDataToPointData(mesh, data)
-        elif mesh.dim() == 2:
-            return np.array([
-                pg.core.cellDataToPointData(mesh, data[:, 0]),
-                pg.core.cellDataToPointData(mesh, data[:, 1])
-            ]).T
+            return pg.Vector(C2N.dot(np.asarray(data, dtype=float)))
+
+        data = np.asarray(data)
+        if mesh.dim() == 2:
+            return C2N.dot(data[:, 0:2])
         elif mesh.dim() == 3:
-            return np.array([
-                pg.core.cellDataToPointData(mesh, data[:, 0]),
-                pg.core.cellDataToPointData(mesh, data[:, 1]),
-                pg.core.cellDataToPointData(mesh, data[:, 2])
-            ])
+            # (3, nodeCount) as before
+            return C2N.dot(data[:, 0:3]).T
+        return C2N.dot(data)
     else:
         raise BaseException("Style '" + style + "'not yet implemented."
                             "Currently styles available are: 'mean, '")
@@ -92,64 +216,45 @@ def cellDataToNodeData(mesh, data, style='mean'):
 def nodeDataToBoundaryData(mesh, data):
     """Convert node data to boundary data.
 
-    Assuming [NodeCount, dim] data
-    DOCUMENT_ME
+    The boundary value is the mean of the values of its nodes.
+
+    Parameters
+    ----------
+    mesh : :gimliapi:`GIMLI::Mesh`
+        2D or 3D GIMLi mesh
+    data : iterable
+        Node data of shape (nodeCount,) or (nodeCount, dim) or
+        :gimliapi:`GIMLI::PosVector`.
+
+    Returns
+    -------
+    ret : ndarray
+        Boundary data of shape (boundaryCount,) or (boundaryCount, dim).
     """
     if len(data) != mesh.nodeCount():
         raise BaseException(
             "Dimension mismatch, expecting nodeCount(): " +
-            str(mesh.nodeCount()) + " got: " + str(len(data)),
-            str(len(data[0])))
+            str(mesh.nodeCount()) + " got: " + str(len(data)))
 
-    if isinstance(data, pg.PosVector):
-        ret = np.zeros((mesh.boundaryCount(), 3))
-        for b in mesh.boundaries():
-            ret[b.id()] = sum(data[b.ids()]) / b.nodeCount()
-        return ret
-
-    dim = len(data[0])
-    ret = np.zeros((mesh.boundaryCount(), dim))
-    if dim == 1:
-        for b in mesh.boundaries():
-            ret[b.id()] = b.pot(b.center(), data)  # / b.nodeCount()
-    elif dim == 2:
-        for b in mesh.boundaries():
-            if b.nodeCount() > 2:
-                print(b)
-                raise BaseException("implement me")
-
-            ret[b.id()] = sum(data[b.ids()]) / b.nodeCount()
-            continue
-            # v = b.data(b.center(), data)
-            # interpolation is hell slow here .. check!!!!!!
-            v2 = (data[b.node(0).id()] + data[b.node(1).id()]) * 0.5
-            # print(v -v2)
-            ret[b.id()] = [v2[0], v2[1]]
-    else:
-        for b in mesh.boundaries():
-            ret[b.id()] = sum(data[b.ids()]) / b.nodeCount()
-            continue
-            raise BaseException("don't use this until further checking")
-            ret[b.id()] = b.vec(b.center(), data)  # / b.nodeCount()
-
-    return ret
+    return mappingOperator(mesh, 'nodeToBoundary').dot(np.asarray(data))
 
 
 def cellDataToBoundaryData(mesh, data):
-    """Convert cell data to boundary data."""
+    """Convert cell data to boundary data.
+
+    Linear interpolation between the centers of the two neighbor cells.
+    Outer boundaries get the value of their cell.
+    """
     if len(data) != mesh.cellCount():
         raise BaseException(
             "Dimension mismatch, expecting cellCount(): " +
-            str(mesh.cellCount()) + "got: " + str(len(data)),
-            str(len(data[0])))
+            str(mesh.cellCount()) + "got: " + str(len(data)))
 
-    CtB = mesh.cellToBoundaryInterpolation()
+    CtB = mappingOperator(mesh, 'cellToBoundary')
 
-    if isinstance(data, pg.PosVector()):
-        return np.array([CtB * pg.x(data), CtB * pg.y(data),
-                         CtB * pg.z(data)]).T
-    else:
-        return CtB * data
+    if np.ndim(data) == 1:
+        return pg.Vector(CtB.dot(np.asarray(data, dtype=float)))
+    return CtB.dot(np.asarray(data))
 
 
 def fillEmptyToCellArray(mesh, vals, slope=True):
@@ -210,16 +315,14 @@ def fillEmptyToCellArray(mesh, vals, slope=True):
     >>> _ = ax2.set_title("Extrapolated with slope=False")
     >>> _ = ax3.set_title("Extrapolated with slope=True")
     """
-    # atts = pg.Vector(mesh.cellCount(), 0.0)  # not used
-    # oldAtts = mesh.cellAttributes()  # not used
     mesh.setCellAttributes(vals)
     mesh.createNeighborInfos()
-    # std::vector< Cell * >
-    # empties = []
+    N = mappingOperator(mesh, 'neighbors')
 
     if slope:
-        # search all cells with empty neighbors
-        ids = pg.find(mesh.cellAttributes() != 0.0)
+        # only filled cells with empty neighbors start a slope
+        empty = np.abs(np.asarray(mesh.cellAttributes())) < 1e-12
+        ids = np.nonzero(~empty & (N.dot(empty.astype(float)) > 0))[0]
 
         for c in mesh.cells(ids):
             for i in range(c.neighborCellCount()):
@@ -227,8 +330,6 @@ def fillEmptyToCellArray(mesh, vals, slope=True):
 
                 if nc:
                     if nc.attribute() == 0.0:
-                        # c.setAttribute(99999)
-
                         b = pg.core.findCommonBoundary(c, nc)
                         # search along a slope
                         pos = b.center() - b.norm() * 1000.
@@ -247,9 +348,40 @@ def fillEmptyToCellArray(mesh, vals, slope=True):
 
                             startCell = nextC
 
-    vals = mesh.cellAttributes()
-    mesh.prolongateEmptyCellsValues(vals, background=-9e99)
+    vals = _prolongateEmptyCellValues(
+        mesh, np.array(mesh.cellAttributes()))
     mesh.setCellAttributes(vals)
+    return pg.Vector(vals)
+
+
+def _prolongateEmptyCellValues(mesh, vals):
+    """Fill empty (zero) cell values from the neighbor cells.
+
+    Breadth-first traversal of the cell neighbor graph: every sweep fills
+    all empty cells next to filled cells with the weighted mean of their
+    filled neighbors, where vertical boundaries weigh more than horizontal
+    ones (like :gimliapi:`GIMLI::Mesh::prolongateEmptyCellsValues`).
+    """
+    W = mappingOperator(mesh, 'horizontalNeighbors')
+    empty = np.abs(vals) < 1e-12
+    todo = np.nonzero(empty)[0]
+    Wt = W[todo]  # rows of the empty cells only
+
+    while len(todo) > 0:
+        filled = (~empty).astype(float)
+        weight = Wt.dot(filled)
+        front = weight > 1e-8
+
+        if not front.any():
+            pg.warn("Cannot fill {0} empty cells that have no connection "
+                    "to filled cells. Filling with mean.".format(len(todo)))
+            vals[todo] = np.mean(vals)
+            break
+
+        vals[todo[front]] = Wt[front].dot(vals * filled) / weight[front]
+        empty[todo[front]] = False
+        todo, Wt = todo[~front], Wt[~front]
+
     return vals
 
 
@@ -663,6 +795,208 @@ def interpolate(*args, **kwargs):
         return interpolateAlongCurve(curve, t, **kwargs)
 
 
+class InterpolationOperator(object):
+    """Precomputed interpolation from a mesh to a set of positions.
+
+    Cell location (core KD-tree search) and shape function weights are
+    computed only once and stored as sparse matrix. Applying the operator
+    to data of many time steps, ensemble members or iterations is then a
+    single sparse matrix product. Data can be node based or cell based,
+    cell data is mapped to the nodes before, like :py:func:`interpolate`.
+
+    The operator can be pickled or saved to a file and used without the
+    source mesh.
+
+    Parameters
+    ----------
+    mesh : :gimliapi:`GIMLI::Mesh`
+        Source mesh of the data.
+    pos : iterable | :gimliapi:`GIMLI::Mesh`
+        Target positions as array (N, dim) or :gimliapi:`GIMLI::PosVector`.
+        For a target mesh, node data is interpolated to its nodes and cell
+        data to its cell centers.
+    extrapolate : str ['fill']
+        Values for positions outside the source mesh.
+        * 'fill' : fallback value
+        * 'nan' : np.nan
+        * 'nearest' : value of the nearest node (node data) or cell (cell
+          data) of the source mesh
+    fallback : float [0.0]
+        Fill value for extrapolate='fill'.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import pygimli as pg
+    >>> grid = pg.createGrid(x=[0, 1, 2], y=[0, 1])
+    >>> I = pg.meshtools.InterpolationOperator(grid, [[0.5, 0.5], [3., 0.]],
+    ...                                        extrapolate='nearest')
+    >>> print(I(pg.x(grid)))
+    [0.5 2. ]
+    >>> frames = np.vstack([pg.x(grid), 2 * pg.x(grid)]).T
+    >>> print(I(frames))
+    [[0.5 1. ]
+     [2.  4. ]]
+    """
+
+    def __init__(self, mesh=None, pos=None, extrapolate='fill', fallback=0.0):
+        if extrapolate not in ('fill', 'nan', 'nearest'):
+            pg.critical("Unknown extrapolation '{0}', use 'fill', 'nan' or "
+                        "'nearest'".format(extrapolate))
+
+        self.extrapolate = extrapolate
+        self.fallback = fallback
+        self.nodeCount = 0
+        self.cellCount = 0
+        self._mesh = mesh
+        self._pos = pos
+        # {'node'|'cell': (scipy.sparse.csr_matrix, outside indices)}
+        self._ops = {}
+
+        if mesh is not None:
+            self.nodeCount = mesh.nodeCount()
+            self.cellCount = mesh.cellCount()
+
+    def _targets(self, source):
+        """Target positions as array (N, 3) for node or cell data."""
+        pos = self._pos
+        if isinstance(pos, pg.Mesh):
+            pos = pos.positions() if source == 'node' else pos.cellCenters()
+
+        pos = np.asarray(pos, dtype=float)
+        if pos.ndim == 1:
+            pos = pos[:, None]
+        ret = np.zeros((len(pos), 3))
+        ret[:, :pos.shape[1]] = pos[:, :3]
+        return ret
+
+    def _build(self, source):
+        """Create the interpolation matrix for node or cell data."""
+        from scipy.sparse import csr_matrix
+
+        if self._mesh is None:
+            pg.critical("No interpolation matrix for {0} data and no source "
+                        "mesh to create it.".format(source))
+
+        pos = self._targets(source)
+        I = pg.utils.sparseMatrix2csr(
+            self._mesh.interpolationMatrix(pos)).tocsr()
+        I.resize((len(pos), self.nodeCount))
+        outside = np.nonzero(np.diff(I.indptr) == 0)[0]
+
+        if source == 'cell':
+            I = I.dot(mappingOperator(self._mesh, 'cellToNode')).tocsr()
+
+        if self.extrapolate == 'nearest' and len(outside) > 0:
+            from scipy.spatial import cKDTree
+
+            if source == 'node':
+                ref = np.array(self._mesh.positions())
+            else:
+                ref = np.array(self._mesh.cellCenters())
+            nearest = cKDTree(ref).query(pos[outside])[1]
+            I = (I + csr_matrix((np.ones(len(outside)), (outside, nearest)),
+                                shape=I.shape)).tocsr()
+            outside = outside[:0]
+
+        self._ops[source] = (I, outside)
+
+    def matrix(self, source='node'):
+        """Return the sparse interpolation matrix for node or cell data."""
+        if source not in self._ops:
+            self._build(source)
+        return self._ops[source][0]
+
+    def dot(self, data, source=None):
+        """Interpolate data.
+
+        Parameters
+        ----------
+        data : iterable
+            Node or cell data of shape (n,) or (n, nFrames), i.e., one
+            column per time step or model.
+        source : str [None]
+            'node' or 'cell'. Default is deduced from the length of data,
+            node data is assumed if nodeCount equals cellCount.
+
+        Returns
+        -------
+        ret : ndarray
+            Interpolated data of shape (N,) or (N, nFrames).
+        """
+        data = np.asarray(data)
+
+        if source is None:
+            if len(data) == self.nodeCount:
+                source = 'node'
+            elif len(data) == self.cellCount:
+                source = 'cell'
+            else:
+                pg.critical("Don't know how to interpolate data of size",
+                            len(data), "expecting nodeCount",
+                            self.nodeCount, "or cellCount", self.cellCount)
+
+        I = self.matrix(source)
+        outside = self._ops[source][1]
+        ret = I.dot(data)
+
+        if len(outside) > 0:
+            if self.extrapolate == 'nan':
+                ret = ret.astype(np.result_type(ret.dtype, float))
+                ret[outside] = np.nan
+            else:
+                ret[outside] = self.fallback
+        return ret
+
+    __call__ = dot
+
+    def __getstate__(self):
+        """Build all matrices and remove the mesh for pickling."""
+        if self._mesh is not None:
+            for source in ('node', 'cell'):
+                self.matrix(source)
+
+        state = self.__dict__.copy()
+        state['_mesh'] = None
+        state['_pos'] = None
+        return state
+
+    def save(self, fileName):
+        """Save the operator into a numpy (.npz) file."""
+        state = self.__getstate__()
+        d = dict(extrapolate=state['extrapolate'],
+                 fallback=state['fallback'],
+                 counts=[state['nodeCount'], state['cellCount']])
+        for source, (I, outside) in state['_ops'].items():
+            d[source + '_data'] = I.data
+            d[source + '_indices'] = I.indices
+            d[source + '_indptr'] = I.indptr
+            d[source + '_shape'] = I.shape
+            d[source + '_outside'] = outside
+        np.savez(fileName, **d)
+
+    def load(self, fileName):
+        """Load the operator from a file written by :py:meth:`save`."""
+        from scipy.sparse import csr_matrix
+
+        if not fileName.endswith('.npz'):
+            fileName += '.npz'
+
+        with np.load(fileName) as d:
+            self.extrapolate = str(d['extrapolate'])
+            self.fallback = float(d['fallback'])
+            self.nodeCount, self.cellCount = [int(c) for c in d['counts']]
+            self._mesh, self._pos, self._ops = None, None, {}
+            for source in ('node', 'cell'):
+                if source + '_data' in d:
+                    I = csr_matrix((d[source + '_data'],
+                                    d[source + '_indices'],
+                                    d[source + '_indptr']),
+                                   shape=tuple(d[source + '_shape']))
+                    self._ops[source] = (I, d[source + '_outside'])
+        return self
+
+
 def extract2dSlice(mesh, origin=None, normal=None, angle=0, dip=0, **kwargs):
     """Extract slice from 3D mesh as triangle mesh.
 
@@ -658,15 +658,441 @@ def toSubsurface(mesh, verbose=False):
         pg.critical('not yet implemented')
 
 
+# Number of nodes for the Gmsh element types understood by readGmsh.
+_GMSH_NODE_COUNT = {15: 1,  # point
+                    1: 2,  # line
+                    2: 3,  # triangle
+                    3: 4,  # quadrangle
+                    4: 4,  # tetrahedron
+                    5: 8,  # hexahedron
+                    6: 6,  # prism
+                    7: 5,  # pyramid
+                    8: 3,  # second order line
+                    9: 6,  # second order triangle
+                    10: 9,  # second order quadrangle
+                    11: 10,  # second order tetrahedron
+                    }
+
+# Local boundary node indices of the cell shapes following the definitions
+# of the C++ core (Triangle, Quadrangle, TetrahedronFacesID,
+# HexahedronFacesID), so that new boundaries get the cell as left neighbor.
+_CELL_BOUNDARY_IDS = {2: [[1, 2], [2, 0], [0, 1]],
+                      3: [[0, 1], [1, 2], [2, 3], [3, 0]],
+                      4: [[1, 2, 3], [2, 0, 3], [0, 1, 3], [0, 2, 1]],
+                      5: [[1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7],
+                          [0, 1, 5, 4], [4, 5, 6, 7], [0, 3, 2, 1]],
+                      }
+
+
+def _tokensPerLine(buf):
+    """Count whitespace separated tokens for every non-empty line in buf."""
+    b = np.frombuffer(buf, dtype=np.uint8)
+    ws = b <= 32  # space, tab, \r, \n
+    start = ~ws
+    start[1:] &= ws[:-1]
+    count = np.cumsum(start)
+    ends = np.flatnonzero(b == 10)
+    if len(b) > 0 and b[-1] != 10:
+        ends = np.append(ends, len(b) - 1)
+    count = np.diff(np.append(0, count[ends]))
+    return count[count > 0]
+
+
+def _gmshSection(data, name):
+    """Return raw content of the section $name or None if not present."""
+    start = data.find(b'$' + name + b'\n')
+    if start < 0:
+        start = data.find(b'$' + name + b'\r\n')
+        if start < 0:
+            return None
+    start = data.find(b'\n', start) + 1
+    end = data.find(b'$End' + name, start)
+    return data[start:end]
+
+
+def _gmshEntities(section, binary):
+    """Map (dim, entityTag) -> first physical tag for Gmsh MSH 4.1 files."""
+    phys = {}
+    if section is None:
+        return phys
+
+    if binary:
+        import struct
+        counts = struct.unpack_from('4Q', section, 0)
+        pos = 32
+        for dim in range(4):
+            for _ in range(counts[dim]):
+                tag = struct.unpack_from('i', section, pos)[0]
+                pos += 4 + (3 if dim == 0 else 6) * 8
+                nPhys = struct.unpack_from('Q', section, pos)[0]
+                pos += 8
+                p = struct.unpack_from('%di' % nPhys, section, pos)
+                pos += 4 * nPhys
+                if dim > 0:
+                    nBound = struct.unpack_from('Q', section, pos)[0]
+                    pos += 8 + 4 * nBound
+                phys[(dim, tag)] = p[0] if nPhys > 0 else 0
+        return phys
+
+    lines = section.decode().strip().splitlines()
+    counts = [int(c) for c in lines[0].split()]
+    row = 1
+    for dim in range(4):
+        for _ in range(counts[dim]):
+            entry = lines[row].split()
+            row += 1
+            # points: tag X Y Z nPhys ..., others: tag bbox[6] nPhys ...
+            iPhys = 4 if dim == 0 else 7
+            nPhys = int(entry[iPhys])
+            phys[(dim, int(entry[0]))] = int(entry[iPhys + 1]) \
+                if nPhys > 0 else 0
+    return phys
+
+
+def _readGmshV2(data, binary):
+    """Read nodes and elements from Gmsh MSH 2.2 (ASCII or binary)."""
+    sec = _gmshSection(data, b'Nodes')
+    head, _, body = sec.partition(b'\n')
+    nNodes = int(head)
+
+    if binary:
+        dt = np.dtype([('tag', '<i4'), ('pos', '<f8', (3,))])
+        nd = np.frombuffer(body, dtype=dt, count=nNodes)
+        tags, nodes = nd['tag'], nd['pos']
+    else:
+        nd = np.fromstring(body.decode(), sep=' ').reshape(nNodes, 4)
+        tags, nodes = nd[:, 0].astype(np.int64), nd[:, 1:]
+
+    sec = _gmshSection(data, b'Elements')
+    head, _, body = sec.partition(b'\n')
+    nElements = int(head)
+    # element type -> [(nodeTags, physical tags)]
+    elements = {}
+
+    if binary:
+        raw = np.frombuffer(body, dtype='<i4', count=len(body) // 4)
+        pos, count = 0, 0
+        while count < nElements:
+            eType, nFollow, nTags = raw[pos:pos + 3]
+            pos += 3
+            nn = _GMSH_NODE_COUNT.get(eType, None)
+            if nn is None:
+                pg.critical('Gmsh element type %s is not supported' % eType)
+            block = raw[pos:pos + nFollow * (1 + nTags + nn)].reshape(
+                nFollow, 1 + nTags + nn)
+            pos += nFollow * (1 + nTags + nn)
+            count += nFollow
+            marker = block[:, 1] if nTags > 0 else np.zeros(nFollow, int)
+            elements.setdefault(eType, []).append((block[:, 1 + nTags:],
+                                                   marker))
+    else:
+        # elm-number elm-type number-of-tags < tag > ... node-number-list
+        tok = np.fromstring(body.decode(), dtype=np.int64, sep=' ')
+        nTok = _tokensPerLine(body)[:nElements]
+        offset = np.cumsum(nTok) - nTok
+        eTypes = tok[offset + 1]
+        nTags = tok[offset + 2]
+
+        for eType in np.unique(eTypes):
+            nn = _GMSH_NODE_COUNT.get(eType, None)
+            if nn is None:
+                pg.critical('Gmsh element type %s is not supported' % eType)
+            idx = np.flatnonzero(eTypes == eType)
+            first = offset[idx] + 3 + nTags[idx]
+            marker = np.where(nTags[idx] > 0, tok[offset[idx] + 3], 0)
+            elements[eType] = [(tok[first[:, None] + np.arange(nn)],
+                                marker)]
+
+    return tags, nodes, elements
+
+
+def _readGmshV4(data, binary):
+    """Read nodes and elements from Gmsh MSH 4.1 (ASCII or binary)."""
+    phys = _gmshEntities(_gmshSection(data, b'Entities'), binary)
+
+    sec = _gmshSection(data, b'Nodes')
+    tags, nodes = [], []
+    if binary:
+        nBlocks = np.frombuffer(sec, dtype='<u8', count=1)[0]
+        pos = 32
+        for _ in range(nBlocks):
+            eDim, _tag, para = np.frombuffer(sec, '<i4', 3, pos)
+            n = int(np.frombuffer(sec, '<u8', 1, pos + 12)[0])
+            pos += 20
+            tags.append(np.frombuffer(sec, '<u8', n, pos))
+            pos += 8 * n
+            nCoord = 3 + (eDim if para else 0)
+            nodes.append(np.frombuffer(sec, '<f8', n * nCoord,
+                                       pos).reshape(n, nCoord)[:, :3])
+            pos += 8 * n * nCoord
+    else:
+        tok = np.fromstring(sec.decode(), sep=' ')
+        pos = 4
+        for _ in range(int(tok[0])):
+            eDim, _tag, para, n = tok[pos:pos + 4].astype(int)
+            pos += 4
+            tags.append(tok[pos:pos + n])
+            pos += n
+            nCoord = 3 + (eDim if para else 0)
+            nodes.append(tok[pos:pos + n * nCoord].reshape(n, nCoord)[:, :3])
+            pos += n * nCoord
+    tags = np.concatenate(tags).astype(np.int64)
+    nodes = np.concatenate(nodes)
+
+    sec = _gmshSection(data, b'Elements')
+    elements = {}
+    if binary:
+        nBlocks = np.frombuffer(sec, dtype='<u8', count=1)[0]
+        pos = 32
+        for _ in range(nBlocks):
+            eDim, eTag, eType = np.frombuffer(sec, '<i4', 3, pos)
+            n = int(np.frombuffer(sec, '<u8', 1, pos + 12)[0])
+            pos += 20
+            nn = _GMSH_NODE_COUNT.get(eType, None)
+            if nn is None:
+                pg.critical('Gmsh element type %s is not supported' % eType)
+            block = np.frombuffer(sec, '<u8', n * (1 + nn), pos).reshape(
+                n, 1 + nn)
+            pos += 8 * n * (1 + nn)
+            elements.setdefault(eType, []).append(
+                (block[:, 1:].astype(np.int64),
+                 np.full(n, phys.get((eDim, eTag), 0))))
+    else:
+        tok = np.fromstring(sec.decode(), dtype=np.int64, sep=' ')
+        pos = 4
+        for _ in range(tok[0]):
+            eDim, eTag, eType, n = tok[pos:pos + 4]
+            pos += 4
+            nn = _GMSH_NODE_COUNT.get(eType, None)
+            if nn is None:
+                pg.critical('Gmsh element type %s is not supported' % eType)
+            block = tok[pos:pos + n * (1 + nn)].reshape(n, 1 + nn)
+            pos += n * (1 + nn)
+            elements.setdefault(eType, []).append(
+                (block[:, 1:], np.full(n, phys.get((eDim, eTag), 0))))
+
+    return tags, nodes, elements
+
+
+def _createMeshFromArrays(dim, nodes, cells, cellMarkers,
+                          bounds=None, boundMarkers=None, nodeMarkers=None):
+    """Create a mesh from node positions and zero-based connectivity arrays.
+
+    The mesh is written into a temporary binary mesh (bms v2) and loaded by
+    the core in one call, which avoids creating every node, cell and
+    boundary separately from Python.
+
+    Parameters
+    ----------
+    dim : int
+        Mesh dimension.
+    nodes : ndarray (nNodes, 3)
+        Node positions.
+    cells : [ndarray (nCells_i, nNodesPerCell_i), ]
+        Cell node indices for every cell shape.
+    cellMarkers : [ndarray (nCells_i), ]
+        Cell markers for every cell shape.
+    bounds : [ndarray (nBounds_i, nNodesPerBound_i), ]
+        Boundary node indices for every boundary shape.
+    boundMarkers : [ndarray (nBounds_i), ]
+        Boundary markers for every boundary shape.
+    nodeMarkers : ndarray (nNodes)
+        Node markers.
+
+    Returns
+    -------
+    mesh: :gimliapi:`GIMLI::Mesh`
+        Mesh with neighbor information.
+    """
+    nodes = np.asarray(nodes, dtype=float)
+    if nodeMarkers is None:
+        nodeMarkers = np.zeros(len(nodes))
+
+    def _entities(conn, marker):
+        conn = [np.asarray(c) for c in conn or [] if len(c) > 0]
+        marker = [np.asarray(m) for m, c in zip(marker or [], conn or [])
+                  if len(c) > 0]
+        if len(conn) == 0:
+            return (np.zeros(0, np.uint8), np.zeros(0, np.uint32),
+                    np.zeros(0, np.int32))
+        return (np.concatenate([np.full(len(c), c.shape[1], np.uint8)
+                                for c in conn]),
+                np.concatenate([c.ravel() for c in conn]).astype(np.uint32),
+                np.concatenate(marker).astype(np.int32))
+
+    tmp = pg.optImport('tempfile')
+    fd, name = tmp.mkstemp(suffix='.bms')
+    with os.fdopen(fd, 'wb') as fi:
+        np.array([dim, 2], dtype=np.uint8).tofile(fi)  # dimension, version
+        np.array(len(nodes), dtype=np.uint32).tofile(fi)
+        nodes.astype(np.float64).tofile(fi)
+        np.asarray(nodeMarkers, dtype=np.int32).tofile(fi)
+
+        for ents, isBound in [(_entities(cells, cellMarkers), False),
+                              (_entities(bounds, boundMarkers), True)]:
+            np.array(len(ents[0]), dtype=np.uint32).tofile(fi)
+            for e in ents:
+                e.tofile(fi)
+            if isBound:  # no left and right neighbor cells
+                np.full(2 * len(ents[0]), -1, dtype=np.int32).tofile(fi)
+
+        np.array(0, dtype=np.uint64).tofile(fi)  # no data
+    try:
+        mesh = pg.Mesh(dim)
+        mesh.loadBinaryV2(name)
+    finally:
+        os.remove(name)
+
+    mesh.createNeighborInfos()
+    return mesh
+
+
+def _meshArrays(mesh, boundaries=False):
+    """Return node positions and cell connectivity arrays of a mesh.
+
+    The mesh is dumped by the core into a temporary binary mesh (bms) and
+    read back with numpy, which is much faster than collecting the node ids
+    of every cell from Python.
+
+    Parameters
+    ----------
+    mesh: :gimliapi:`GIMLI::Mesh`
+        Any mesh.
+    boundaries: bool [False]
+        Also return the boundary connectivity.
+
+    Returns
+    -------
+    nodes : ndarray (nNodes, 3)
+        Node positions.
+    cells : dict {nNodesPerCell: (ndarray (n_i), ndarray (n_i, nNodesPerCell))}
+        Cell indices and zero-based cell node indices for every occurring
+        number of nodes per cell.
+    bounds : tuple of 4 ndarrays
+        Only if boundaries is True. Offsets into the boundary node indices
+        (compressed row style), the boundary node indices and the left and
+        right cell of every boundary (-1 if there is none). Call
+        mesh.createNeighborInfos() before to get the neighbor cells.
+    """
+    tmp = pg.optImport('tempfile')
+    fd, name = tmp.mkstemp(suffix='.bms')
+    os.close(fd)
+    try:
+        mesh.saveBinaryV2(name)
+        buf = np.fromfile(name, dtype=np.uint8)
+    finally:
+        os.remove(name)
+
+    pos = 2 + (128 if buf[1] > 2 else 0)  # dimension, version, header
+    nNodes = int(buf[pos:pos + 4].view(np.uint32)[0])
+    pos += 4
+    nodes = buf[pos:pos + 24 * nNodes].view(np.float64).reshape(nNodes, 3)
+    pos += 28 * nNodes  # coordinates and markers
+    nCells = int(buf[pos:pos + 4].view(np.uint32)[0])
+    pos += 4
+    nc = buf[pos:pos + nCells]
+    pos += nCells
+    nIdx = int(nc.sum(dtype=np.int64))
+    idx = buf[pos:pos + 4 * nIdx].view(np.uint32)
+    pos += 4 * (nIdx + nCells)  # indices and markers
+
+    uniqueNC = np.unique(nc)
+    if len(uniqueNC) == 1:  # single cell type, e.g., tetrahedra only
+        cells = {int(nc[0]): (np.arange(nCells), idx.reshape(nCells, nc[0]))}
+    else:
+        offset = np.concatenate([[0], np.cumsum(nc, dtype=np.int64)[:-1]])
+        cells = {}
+        for n in uniqueNC:
+            cIds = np.nonzero(nc == n)[0]
+            cells[int(n)] = (cIds, idx[offset[cIds][:, None] + np.arange(n)])
+
+    if not boundaries:
+        return nodes.copy(), cells
+
+    nBounds = int(buf[pos:pos + 4].view(np.uint32)[0])
+    pos += 4
+    nb = buf[pos:pos + nBounds]
+    pos += nBounds
+    offset = np.concatenate([[0], np.cumsum(nb, dtype=np.int64)])
+    bIdx = buf[pos:pos + 4 * int(offset[-1])].view(np.uint32)
+    pos += 4 * (int(offset[-1]) + nBounds)  # indices and markers
+    left = buf[pos:pos + 4 * nBounds].view(np.int32)
+    pos += 4 * nBounds
+    right = buf[pos:pos + 4 * nBounds].view(np.int32)
+
+    return nodes.copy(), cells, (offset, bIdx.astype(np.int64),
+                                 left.astype(np.int64), right.astype(np.int64))
+
+
+def _uniqueRows(a, **kwargs):
+    """Faster alternative for np.unique(a, axis=0, **kwargs)."""
+    a = np.ascontiguousarray(a)
+    v = a.view(np.dtype((np.void, a.dtype.itemsize * a.shape[1]))).ravel()
+    return np.unique(v, **kwargs)
+
+
+def _outerFaces(cells, nodes):
+    """Find the faces of the cells that belong only to a single cell.
+
+    Parameters
+    ----------
+    cells : dict
+        Gmsh element type -> zero-based node indices (nCells, nNodes).
+    nodes : ndarray (nNodes, 3)
+        Node positions.
+
+    Returns
+    -------
+    faces : [ndarray (nFaces_i, nNodesPerFace_i), ]
+        Outer faces for every face shape. Edges keep the node order of the
+        cell, faces are oriented with the normal pointing outside.
+    """
+    faces, owner = [], []
+    for eType, conn in cells.items():
+        center = nodes[conn].mean(axis=1)
+        for ids in _CELL_BOUNDARY_IDS[eType]:
+            faces.append(conn[:, ids])
+            owner.append(center)
+
+    nMax = max(f.shape[1] for f in faces)
+    keys = np.concatenate([np.pad(np.sort(f, axis=1),
+                                  ((0, 0), (nMax - f.shape[1], 0)),
+                                  constant_values=-1) for f in faces])
+    _, inv, count = _uniqueRows(keys, return_inverse=True,
+                                return_counts=True)
+    single = count[inv.ravel()] == 1
+
+    out = {}
+    start = 0
+    for f, center in zip(faces, owner):
+        sel = single[start:start + len(f)]
+        start += len(f)
+        f, center = f[sel], center[sel]
+        if f.shape[1] > 2:
+            p = nodes[f]
+            norm = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+            inside = np.sum(norm * (p.mean(axis=1) - center), axis=1) < 0
+            f[inside] = f[inside, ::-1]
+        out.setdefault(f.shape[1], []).append(f)
+
+    return [np.concatenate(f) for f in out.values()]
+
+
 def readGmsh(fName, verbose=False, precision=None):
-    r"""Read :term:`Gmsh` ASCII file and return instance of GIMLI::Mesh class.
+    r"""Read :term:`Gmsh` file and return instance of GIMLI::Mesh class.
+
+    Node and element blocks are parsed in bulk with numpy and the mesh is
+    build from the resulting connectivity arrays in a single call.
 
     Parameters
     ----------
     fName : string
         Filename of the file to read (\\*.msh). The file must conform
-        to the `MSH ASCII file version 2
-        <https://gmsh.info/doc/texinfo/gmsh.html#MSH-file-format-version-2-_0028Legacy_0029>`_ format
+        to the `MSH file version 2
+        <https://gmsh.info/doc/texinfo/gmsh.html#MSH-file-format-version-2-_0028Legacy_0029>`_
+        or `MSH file version 4.1
+        <https://gmsh.info/doc/texinfo/gmsh.html#MSH-file-format>`_ format,
+        either in ASCII or binary form.
     verbose : boolean, optional
         Be verbose during import. Default: False
     precision : None|int, optional
@@ -696,6 +1122,9 @@ def readGmsh(fName, verbose=False, precision=None):
         - Physical Number 1: No inversion region
         - Physical Number >= 2: Inversion region
 
+    For MSH 4.1 files the physical number is taken from the first physical
+    group of the elementary entity (see $Entities section).
+
     Examples
     --------
     >>> import tempfile, os
@@ -730,97 +1159,80 @@ def readGmsh(fName, verbose=False, precision=None):
     >>> os.remove(fName)
     """
     assert precision is None or precision >= 0
-    inNodes, inElements, nCount = 0, 0, 0
-    fid = open(fName)
     if verbose:
         print('Reading %s... \n' % fName)
 
-    for line in fid:
+    with open(fName, 'rb') as fid:
+        data = fid.read()
+
+    version, fileType, _ = _gmshSection(data, b'MeshFormat').split()[:3]
+    binary = int(fileType) == 1
+    if binary:
+        # binary header contains integer 1 to detect the endianness
+        one = np.frombuffer(
+            _gmshSection(data, b'MeshFormat').partition(b'\n')[2],
+            dtype='<i4', count=1)[0]
+        if one != 1:
+            pg.critical('Only little endian binary Gmsh files are supported.')
+
+    if version.startswith(b'2'):
+        tags, nodes, elements = _readGmshV2(data, binary)
+    elif version.startswith(b'4.1'):
+        tags, nodes, elements = _readGmshV4(data, binary)
+    else:
+        pg.critical('Gmsh file format version %s is not supported. '
+                    'Please export in format 2.2 or 4.1.' % version.decode())
 
-        if line[0] == '$':
-            if line.find('Nodes') > 0:
-                inNodes = 1
-            if line.find('EndNodes') > 0:
-                inNodes = 0
-            if line.find('Elements') > 0:
-                inElements = 1
-            if line.find('EndElements') > 0:
-                inElements = 0
+    if precision is not None:
+        nodes = np.round(nodes, precision)
 
-        else:
-            if inNodes == 1:
-                if len(line.split()) == 1:
-                    nodes = np.zeros((int(line), 3))
-                    if verbose:
-                        print('  Nodes: %s' % int(line))
-                else:
-                    node_coordinates = np.array(line.split(), 'float')[1:]
-                    if precision is None:
-                        nodes[nCount, :] = node_coordinates
-                    else:
-                        nodes[nCount, :] = np.round(
-                            node_coordinates, precision)
-                    nCount += 1
+    # map node tags to node indices
+    tagIdx = np.full(tags.max() + 1, -1, dtype=np.int64)
+    tagIdx[tags] = np.arange(len(tags))
 
-            elif inElements == 1:
-                if len(line.split()) == 1:
-                    if verbose:
-                        print('  Entries: %s' % int(line))
-                    points, lines, triangles, tets = [], [], [], []
-                    quads = []
+    for eType in elements:
+        if eType not in (15, 1, 2, 3, 4, 5):
+            pg.error("Gmsh element type %s is not supported yet" % eType)
 
-                else:
-                    # Element entries follow the following format:
-                    # elm-number elm-type number-of-tags < tag > …
-                    #   node-number-list
-
-                    # strip elm-number here
-                    entry = [int(e_) for e_ in line.split()][1:]
-
-                    if entry[0] == 15:  # Points
-                        # point node, marker (1st tag)
-                        points.append((entry[-1], entry[2]))
-                    elif entry[0] == 1:
-                        lines.append((entry[-2], entry[-1], entry[2]))
-                    elif entry[0] == 2:  # Tri
-                        triangles.append((entry[-3], entry[-2], entry[-1],
-                                          entry[2]))
-                    elif entry[0] == 3:  # Quads
-                        quads.append((entry[-4], entry[-3], entry[-2],
-                                      entry[-1], entry[2]))
-                    elif entry[0] == 4:  # Tet
-                        tets.append((entry[-4], entry[-3], entry[-2],
-                                     entry[-1], entry[2]))
-                    elif entry[0] == 6:
-                        pg.error(
-                            "Quadrangles and prisms are not supported yet")
+    def _join(eType):
+        blocks = elements.get(eType, [])
+        if len(blocks) == 0:
+            return np.zeros((0, _GMSH_NODE_COUNT[eType]), dtype=int), \
+                np.zeros(0, dtype=int)
+        return (tagIdx[np.concatenate([b[0] for b in blocks])],
+                np.concatenate([b[1] for b in blocks]).astype(int))
 
-    fid.close()
-    lines = np.asarray(lines)
-    # triangles = np.asarray(triangles)
-    tets = np.asarray(tets)
+    points, lines, triangles, quads, tets, hexs = [
+        _join(eType) for eType in (15, 1, 2, 3, 4, 5)]
 
     if verbose:
-        print('    Points: %s' % len(points))
-        print('    Lines: %s' % len(lines))
-        print('    Triangles: %s' % len(triangles))
-        print('    Quads: %s' % len(quads))
-        print('    Tetrahedra: %s \n' % len(tets))
+        print('  Nodes: %s' % len(nodes))
+        print('    Points: %s' % len(points[0]))
+        print('    Lines: %s' % len(lines[0]))
+        print('    Triangles: %s' % len(triangles[0]))
+        print('    Quads: %s' % len(quads[0]))
+        print('    Tetrahedra: %s' % len(tets[0]))
+        print('    Hexahedra: %s \n' % len(hexs[0]))
         print('Creating mesh object... \n')
 
     # check dimension
-    if len(tets) == 0:
-        dim, bounds, cells = 2, lines, triangles + quads
+    if len(tets[0]) == 0 and len(hexs[0]) == 0:
+        dim = 2
+        cells = {2: triangles, 3: quads}
+        bounds = [lines]
         zero_dim = np.abs(nodes.sum(0)).argmin()  # identify zero dimension
+        nodes = np.column_stack([nodes[:, 0], nodes[:, 3 - zero_dim],
+                                 np.zeros(len(nodes))])
     else:
-        dim, bounds, cells = 3, triangles, tets
-    bounds = np.asarray(bounds)
+        dim = 3
+        cells = {4: tets, 5: hexs}
+        bounds = [triangles, quads]
+    cells = {k: c for k, c in cells.items() if len(c[0]) > 0}
+    bounds = [b for b in bounds if len(b[0]) > 0]
+
     if verbose:
         print('  Dimension: %s-D' % dim)
 
-    # creating instance of GIMLI::Mesh class
-    mesh = pg.Mesh(dim)
-
     # replacing boundary markers (gmsh does not allow negative phys. regions)
     bound_marker = (pg.core.MARKER_BOUND_HOMOGEN_NEUMANN,
                     pg.core.MARKER_BOUND_MIXED,
@@ -828,14 +1240,15 @@ def readGmsh(fName, verbose=False, precision=None):
                     pg.core.MARKER_BOUND_DIRICHLET)
 
     if len(bounds) > 0:
-        for i in range(4):
-            bounds[:, dim][bounds[:, dim] == i + 1] = bound_marker[i]
+        for _, marker in bounds:
+            for i in range(4):
+                marker[marker == i + 1] = bound_marker[i]
 
-        # account for CEM markers
-        bounds[:, dim][bounds[:, dim] >= 10000] *= -1
+            # account for CEM markers
+            marker[marker >= 10000] *= -1
 
         if verbose:
-            bound_types = np.unique(bounds[:, dim])
+            bound_types = np.unique(np.concatenate([b[1] for b in bounds]))
             print('  Boundary types: %s ' % len(bound_types) + str(
                 tuple(bound_types)))
     else:
@@ -843,55 +1256,48 @@ def readGmsh(fName, verbose=False, precision=None):
               "Setting Neumann on the outer edges by default.")
 
     if verbose:
-        regions = np.unique(np.array(cells)[:, dim + 1])
+        regions = np.unique(np.concatenate([c[1] for c in cells.values()]))
         print('  Regions: %s ' % len(regions) + str(tuple(regions)))
 
-    for node in nodes:
-        if dim == 2:
-            mesh.createNode(node[0], node[3 - zero_dim], 0)
-        else:
-            mesh.createNode(node)
-
-    for cell in cells:
-        mesh.createCell(mesh.nodes(np.array(cell, dtype=int)[:-1]-1),
-                        marker=int(cell[-1]))
-        # if dim == 2:
-        #     mesh.createTriangle(
-        #         mesh.node(int(cell[0] - 1)), mesh.node(int(cell[1] - 1)),
-        #         mesh.node(int(cell[2] - 1)), marker=int(cell[3]))
-        # else:
-        #     mesh.createTetrahedron(
-        #         mesh.node(int(cell[0] - 1)), mesh.node(int(cell[1] - 1)),
-        #         mesh.node(int(cell[2] - 1)), mesh.node(int(cell[3] - 1)),
-        #         marker=int(cell[4]))
-
-    mesh.createNeighborInfos()
-
-    # Set Neumann on outer edges by default (can be overwritten by Gmsh info)
-    for b in mesh.boundaries():
-        if not b.leftCell() or not b.rightCell():
-            b.setMarker(pg.core.MARKER_BOUND_HOMOGEN_NEUMANN)
-
-    for bound in bounds:
-        if dim == 2:
-            mesh.createEdge(
-                mesh.node(int(bound[0] - 1)), mesh.node(int(bound[1] - 1)),
-                marker=int(bound[2]))
-        else:
-            mesh.createTriangleFace(
-                mesh.node(int(bound[0] - 1)), mesh.node(int(bound[1] - 1)),
-                mesh.node(int(bound[2] - 1)), marker=int(bound[3]))
-
+    # Set Neumann on outer faces by default (can be overwritten by Gmsh info)
+    outer = []
+    if len(cells) > 0:
+        outer = _outerFaces({k: c[0] for k, c in cells.items()}, nodes)
+    bNodes = [(o, np.full(len(o), pg.core.MARKER_BOUND_HOMOGEN_NEUMANN))
+              for o in outer]
+    bNodes += [(b, m) for b, m in bounds]
+
+    faces, faceMarker = [], []
+    for nn in np.unique([b.shape[1] for b, _ in bNodes]):
+        f = np.concatenate([b for b, _ in bNodes if b.shape[1] == nn])
+        m = np.concatenate([m for b, m in bNodes if b.shape[1] == nn])
+        # unmarked Gmsh entities do not overwrite the default
+        f, m = f[m != 0], m[m != 0]
+
+        # keep node order of the first occurrence (outer faces) but the
+        # marker of the last one (Gmsh physical entities)
+        _, first, inv = _uniqueRows(np.sort(f, axis=1),
+                                    return_index=True, return_inverse=True)
+        marker = np.zeros(len(first), dtype=int)
+        marker[inv.ravel()] = m
+        order = np.argsort(first)
+        faces.append(f[first[order]])
+        faceMarker.append(marker[order])
+
+    nodeMarker = np.zeros(len(nodes), dtype=int)
     # assign marker to corresponding nodes (sensors, reference nodes, etc.)
-    if points:
-        for point in points:
-            mesh.node(point[0] - 1).setMarker(-point[1])
+    nodeMarker[points[0][:, 0]] = -points[1]
+
+    mesh = _createMeshFromArrays(dim, nodes,
+                                 [c[0] for c in cells.values()],
+                                 [c[1] for c in cells.values()],
+                                 faces, faceMarker, nodeMarker)
 
     if verbose:
-        if points:
-            points = np.asarray(points)
-            node_types = np.unique(points[:, 1])
-            print('  Marked nodes: %s ' % len(points) + str(tuple(node_types)))
+        if len(points[0]) > 0:
+            node_types = np.unique(points[1])
+            print('  Marked nodes: %s ' % len(points[0]) +
+                  str(tuple(node_types)))
         print('\nDone. \n')
         print('  ' + str(mesh))
     return mesh
@@ -108,16 +108,248 @@ def nsr(cell):
     return 2 * r / R
 
 
+# Vectorized quality measures for node positions X (nCells, nCorners, 3)
+_HEX_FACES = np.array([[0, 3, 2, 1], [4, 5, 6, 7], [0, 1, 5, 4],
+                       [1, 2, 6, 5], [2, 3, 7, 6], [3, 0, 4, 7]])
+_HEX_EDGES = np.array([[0, 1], [1, 2], [2, 3], [3, 0], [4, 5], [5, 6],
+                       [6, 7], [7, 4], [0, 4], [1, 5], [2, 6], [3, 7]])
+_HEX_CORNERS = np.array([[0, 1, 3, 4], [1, 2, 0, 5], [2, 3, 1, 6],
+                         [3, 0, 2, 7], [4, 7, 5, 0], [5, 4, 6, 1],
+                         [6, 5, 7, 2], [7, 6, 4, 3]])
+_HEX_TETS = np.array([[0, 1, 2, 6], [0, 2, 3, 6], [0, 3, 7, 6],
+                      [0, 7, 4, 6], [0, 4, 5, 6], [0, 5, 1, 6]])
+_TET_EDGES = np.array([[0, 1], [0, 2], [0, 3], [1, 2], [1, 3], [2, 3]])
+
+# shape name and number of corner nodes by (dimension, nodes per cell)
+_SHAPES = {(2, 3): 'tri', (2, 6): 'tri', (2, 4): 'quad', (2, 8): 'quad',
+           (3, 4): 'tet', (3, 10): 'tet', (3, 8): 'hex', (3, 20): 'hex'}
+_CORNERS = {'tri': 3, 'quad': 4, 'tet': 4, 'hex': 8}
+
+# optimal (minimum) angle for the normalized minimum angle
+_IDEAL_ANGLE = {'tri': 60., 'quad': 90., 'tet': np.degrees(np.arccos(1/3)),
+                'hex': 90.}
+
+
+def _norm(v):
+    return np.sqrt(np.sum(v * v, axis=-1))
+
+
+def _angles(u, v):
+    """Angles (in degrees) between the vectors of two arrays (n, ..., 3)."""
+    return np.degrees(np.arctan2(_norm(np.cross(u, v)),
+                                 np.sum(u * v, axis=-1)))
+
+
+def _edgeLengths(X, edges):
+    return _norm(X[:, edges[:, 1]] - X[:, edges[:, 0]])
+
+
+def _triArea(X):
+    return 0.5 * _norm(np.cross(X[..., 1, :] - X[..., 0, :],
+                                X[..., 2, :] - X[..., 0, :]))
+
+
+def _triRadiusRatio(X):
+    """Normalized shape ratio 2r/R of triangles (n, ..., 3, 3)."""
+    a = _norm(X[..., 2, :] - X[..., 1, :])
+    b = _norm(X[..., 0, :] - X[..., 2, :])
+    c = _norm(X[..., 1, :] - X[..., 0, :])
+    A = _triArea(X)
+    return 16 * A * A / (a * b * c * (a + b + c))
+
+
+def _tetVolume(X):
+    """Signed volume of tetrahedra (n, ..., 4, 3)."""
+    return np.sum((X[..., 1, :] - X[..., 0, :]) *
+                  np.cross(X[..., 2, :] - X[..., 0, :],
+                           X[..., 3, :] - X[..., 0, :]), axis=-1) / 6.
+
+
+def _tetFaceAreas(X):
+    """Areas of the faces opposite to every node of tetrahedra (n, ..., 4)."""
+    return np.stack([_triArea(X[..., [j for j in range(4) if j != i], :])
+                     for i in range(4)], axis=-1)
+
+
+def _tetRadiusRatio(X):
+    """Normalized radius ratio 3r/R of tetrahedra (n, ..., 4, 3)."""
+    V = np.abs(_tetVolume(X))
+    r = 3 * V / np.sum(_tetFaceAreas(X), axis=-1)
+    # products of opposite edge lengths for the circumradius
+    aA = _norm(X[..., 1, :] - X[..., 0, :]) * _norm(X[..., 3, :] -
+                                                    X[..., 2, :])
+    bB = _norm(X[..., 2, :] - X[..., 0, :]) * _norm(X[..., 3, :] -
+                                                    X[..., 1, :])
+    cC = _norm(X[..., 3, :] - X[..., 0, :]) * _norm(X[..., 2, :] -
+                                                    X[..., 1, :])
+    p = (aA + bB + cC) * (aA + bB - cC) * (aA - bB + cC) * (-aA + bB + cC)
+    R = np.sqrt(np.abs(p)) / (24 * V)
+    return 3 * r / R
+
+
+def _faceNormals(X, faces):
+    """Outward pointing area vectors of (possibly warped) polygonal faces."""
+    F = X[:, faces]
+    if faces.shape[1] == 3:
+        n = 0.5 * np.cross(F[:, :, 1] - F[:, :, 0], F[:, :, 2] - F[:, :, 0])
+    else:
+        n = 0.5 * np.cross(F[:, :, 2] - F[:, :, 0], F[:, :, 3] - F[:, :, 1])
+    # point away from the cell center
+    out = np.sum(n * (F.mean(axis=2) - X.mean(axis=1)[:, None]), axis=-1)
+    return n * np.where(out < 0, -1., 1.)[..., None]
+
+
+def _dihedralAngles(X, faces):
+    """Interior dihedral angles (in degrees) between adjacent faces."""
+    n = _faceNormals(X, faces)
+    pairs = [(i, j) for i in range(len(faces)) for j in range(i+1, len(faces))
+             if len(set(faces[i]) & set(faces[j])) == 2]
+    i, j = np.array(pairs).T
+    return 180. - _angles(n[:, i], n[:, j])
+
+
+def _cornerAngles(X):
+    """Interior angles (in degrees) at the corners of polygons (n, k, 3)."""
+    return _angles(np.roll(X, -1, axis=1) - X, np.roll(X, 1, axis=1) - X)
+
+
+def _cellSizes(X, shape):
+    if shape == 'tri':
+        return _triArea(X)
+    if shape == 'quad':
+        return 0.5 * _norm(np.cross(X[:, 2] - X[:, 0], X[:, 3] - X[:, 1]))
+    if shape == 'tet':
+        return np.abs(_tetVolume(X))
+    return np.abs(np.sum(_tetVolume(X[:, _HEX_TETS]), axis=1))
+
+
+def _inRadius(X, shape):
+    """Inradius (2D: 2A/perimeter, 3D: 3V/surface) of the cells."""
+    size = _cellSizes(X, shape)
+    if shape in ['tri', 'quad']:
+        return 2 * size / np.sum(_norm(np.roll(X, -1, axis=1) - X), axis=1)
+    if shape == 'tet':
+        return 3 * size / np.sum(_tetFaceAreas(X), axis=1)
+    return 3 * size / np.sum(_norm(_faceNormals(X, _HEX_FACES)), axis=1)
+
+
+def _angleRange(X, shape):
+    """Interior (2D) or dihedral (3D) angles of the cells in degrees."""
+    if shape in ['tri', 'quad']:
+        return _cornerAngles(X)
+    if shape == 'tet':
+        return _dihedralAngles(X, np.array([[1, 2, 3], [0, 2, 3],
+                                            [0, 1, 3], [0, 1, 2]]))
+    return _dihedralAngles(X, _HEX_FACES)
+
+
+def _cornerRadiusRatio(X, corners):
+    """Minimum radius ratio of the corner simplices, 1 for square/cube."""
+    C = X[:, corners]
+    if corners.shape[1] == 3:
+        rr = _triRadiusRatio(C)
+    else:
+        rr = _tetRadiusRatio(C)
+    ideal = (_triRadiusRatio if corners.shape[1] == 3 else _tetRadiusRatio)(
+        np.vstack([np.zeros(3), np.eye(3)])[:corners.shape[1]])
+    return np.min(rr, axis=1) / ideal
+
+
+def _shapeQuality(X, shape, measure):
+    """Quality measure for the corner node positions of cells of one shape.
+
+    Parameters
+    ----------
+    X : ndarray (nCells, nCorners, 3)
+        Corner node positions.
+    shape : str
+        'tri', 'quad', 'tet' or 'hex'
+    measure : str
+        See :py:func:`quality`.
+    """
+    if measure == 'size':
+        return _cellSizes(X, shape)
+
+    if measure == 'eta':
+        if shape == 'tri':
+            edges = np.array([[0, 1], [1, 2], [2, 0]])
+            return 4 * np.sqrt(3) * _cellSizes(X, shape) / \
+                np.sum(_edgeLengths(X, edges)**2, axis=1)
+        if shape == 'quad':
+            edges = np.array([[0, 1], [1, 2], [2, 3], [3, 0]])
+            return 4 * _cellSizes(X, shape) / \
+                np.sum(_edgeLengths(X, edges)**2, axis=1)
+        edges = _TET_EDGES if shape == 'tet' else _HEX_EDGES
+        return 12 * (_cellSizes(X, shape) * (3 if shape == 'tet' else 1)
+                     )**(2/3) / np.sum(_edgeLengths(X, edges)**2, axis=1)
+
+    if measure in ['nsr', 'radiusRatio']:
+        if shape == 'tri':
+            return _triRadiusRatio(X)
+        if shape == 'tet':
+            return _tetRadiusRatio(X)
+        if shape == 'quad':
+            return _cornerRadiusRatio(X, np.array([[0, 1, 3], [1, 2, 0],
+                                                   [2, 3, 1], [3, 0, 2]]))
+        return _cornerRadiusRatio(X, _HEX_CORNERS)
+
+    if measure == 'aspectRatio':
+        if shape in ['tri', 'quad']:
+            edges = np.array([[i, (i + 1) % len(X[0])]
+                              for i in range(len(X[0]))])
+        else:
+            edges = _TET_EDGES if shape == 'tet' else _HEX_EDGES
+        c = {'tri': 2 * np.sqrt(3), 'tet': 2 * np.sqrt(6)}.get(shape, 2.)
+        return np.max(_edgeLengths(X, edges), axis=1) / \
+            (c * _inRadius(X, shape))
+
+    if measure == 'minAngle':
+        return np.min(_angleRange(X, shape), axis=1)
+
+    if measure == 'maxAngle':
+        return np.max(_angleRange(X, shape), axis=1)
+
+    if measure == 'minimumAngle':
+        return np.min(_angleRange(X, shape), axis=1) / _IDEAL_ANGLE[shape]
+
+    raise ValueError("Unknown quality measure: {0}".format(measure))
+
+
 # Main function
 def quality(mesh, measure="eta"):
-    """Return the quality of a given triangular mesh.
+    r"""Return the quality of a given mesh.
+
+    The quality is computed vectorized from the node positions and the cell
+    connectivity for triangles, quadrangles, tetrahedra and hexahedra (for
+    quadratic cells only the corner nodes are considered). Cells of other
+    shapes get NaN.
 
     Parameters
     ----------
     mesh : mesh object
         Mesh for which the quality is calculated.
     measure : quality measure, str
-        Can be either "eta", "nsr", or "minimumAngle".
+        Can be one of:
+
+        * "eta" - relates size to the sum of squared edge lengths,
+          e.g., :math:`\eta = 4\sqrt{3}a/(l_1^2 + l_2^2 + l_3^2)` for
+          triangles (1 for equilateral/regular cells)
+        * "nsr" or "radiusRatio" - normalized shape ratio (inradius to
+          circumradius) of triangles and tetrahedra, minimum normalized
+          ratio of the corner simplices for quadrangles and hexahedra
+          (1 for equilateral/regular cells)
+        * "aspectRatio" - longest edge related to the inradius
+          (1 for equilateral/regular cells, larger otherwise)
+        * "minAngle", "maxAngle" - minimum/maximum interior (2D) or dihedral
+          (3D) angle in degrees
+        * "minimumAngle" - minimum angle normalized by its optimum
+          (1 for equilateral/regular cells)
+        * "size" - area (2D) or volume (3D)
+
+    Returns
+    -------
+    qualities : np.array
+        Quality for every cell.
 
     Examples
     --------
@@ -139,10 +371,15 @@ def quality(mesh, measure="eta"):
     --------
     eta, nsr, minimumAngle
     """
+    from .mesh import _meshArrays
 
-    # Implemented quality measures (Triangular meshses only.)
-    measures = {"eta": eta, "nsr": nsr, "minimumAngle": minimumAngle}
+    nodes, cells = _meshArrays(mesh)
+    qualities = np.full(mesh.cellCount(), np.nan)
+    for nc, (ids, conn) in cells.items():
+        shape = _SHAPES.get((mesh.dim(), nc))
+        if shape is None:
+            continue
+        X = nodes[conn[:, :_CORNERS[shape]]]
+        qualities[ids] = _shapeQuality(X, shape, measure)
 
-    m = measures[measure]
-    qualities = [m(cell) for cell in mesh.cells()]
     return qualities
@@ -105,6 +105,27 @@ class HEMmodelling(Block1DModelling):
         """Multi-threaded forward response."""
         return self.response(par)
 
+    def batchResponse(self, models, fops=None):
+        """Model responses of many soundings computed at once.
+
+        Soundings that differ only by flight height are computed in one
+        vectorized call of :py:meth:`vmdHemBatch`, otherwise the individual
+        responses are used.
+        """
+        fops = fops or [self] * len(models)
+        if type(self).response is not HEMmodelling.response or any(
+                type(f) is not type(self) or f.nlay != self.nlay or
+                f.scaling != self.scaling or
+                not np.array_equal(f.f, self.f) or
+                not np.array_equal(f.r, self.r) for f in fops):
+            return super().batchResponse(models, fops)
+
+        models = np.asarray(models, dtype=float)
+        ip, op = self.vmdHemBatch(
+            np.array([f.height for f in fops], dtype=float),
+            models[:, self.nlay-1:self.nlay*2-1], models[:, :self.nlay-1])
+        return np.hstack([ip, op])
+
     def calc_forward(self, x, h, rho, d, epr, mur, quasistatic=False):
         """Calculate forward response."""
         field = np.zeros((self.f.size, x.size), complex)
@@ -300,6 +321,73 @@ class HEMmodelling(Block1DModelling):
                            self.r[index]**4 * aux3[:, index]) * self.scaling
         return np.real(Z[0]), np.imag(Z[0])
 
+    def vmdHemBatch(self, h, rho, d):
+        """Vertical magnetic dipole (VMD) response for many soundings.
+
+        Vectorized version of :py:meth:`vmd_hem` (epr=mur=1) for the same
+        frequencies and coil distances.
+
+        Parameters
+        ----------
+        h : array (nSoundings)
+            flight heights
+        rho : array (nSoundings, nlay)
+            resistivities
+        d : array (nSoundings, nlay-1)
+            thicknesses
+
+        Returns
+        -------
+        ip, op : array (nSoundings, nfreq)
+            in-phase and out-of-phase components
+        """
+        fc0, nc, nc0 = hankelfc(3)
+        fc1, nc, nc0 = hankelfc(4)
+        fc0 = fc0[::-1, 0][np.newaxis, :, np.newaxis]
+        fc1 = fc1[::-1, 0][np.newaxis, :, np.newaxis]
+        h = np.reshape(h, (-1, 1, 1))  # (nS, 1, 1)
+        r = np.asarray(self.r, dtype=float)
+        # determine optimum r0 (shift nodes) for f > 1e4 and h > 100
+        full = self.f >= 1e4
+        index = np.logical_and(full, h[:, :, 0] >= 100.0)  # (nS, nfreq)
+        r0 = np.tile(r, (len(h), 1))
+        if np.any(index):
+            f = np.broadcast_to(self.f, index.shape)[index]
+            opt = np.floor(10.0 * np.log10(
+                r0[index] * 2.0 * np.pi * f / self.c0) + nc0)
+            r0[index] = self.c0 / (2.0 * np.pi * f) * 10.0 ** (
+                (opt + 0.5 - nc0) / 10.0)
+        # wave numbers (nS, 100, nfreq) and in air (quasistationary/full)
+        n = np.arange(nc0 - nc, nc0, 1, float)
+        lam = np.exp(-n * 0.1 * np.log(10))[np.newaxis, :, np.newaxis] / \
+            r0[:, np.newaxis, :]
+        alpha0 = lam * complex(1, 0)
+        alpha0[:, :, full] = np.sqrt(lam[:, :, full]**2 - self.wem[full] +
+                                     self.iwm[full] / 1e9)
+        # admittances at the surface of the layered halfspaces
+        alpha = np.sqrt(lam[:, np.newaxis]**2 - self.wem +
+                        self.iwm / rho[:, :, np.newaxis, np.newaxis])
+        b1 = alpha[:, -1]
+        for i in range(rho.shape[1] - 2, -1, -1):
+            ealphad = np.exp(-2.0 * alpha[:, i] * d[:, i, np.newaxis,
+                                                    np.newaxis])
+            talphad = (1.0 - ealphad) / (1.0 + ealphad)
+            b1 = alpha[:, i] * (b1 + alpha[:, i] * talphad) / \
+                (alpha[:, i] + b1 * talphad)
+        # kernel functions and convolution
+        e = np.exp(-2.0 * h * alpha0)
+        aux0 = np.sum((b1 - alpha0) / (b1 + alpha0) * e * lam**3 / alpha0 *
+                      fc0, 1) / r0
+        Z = r**3 * aux0 * self.scaling
+        if np.any(full):
+            aux1 = np.sum(2.0 / (b1 + alpha0) * e * lam**3 * fc0, 1) / r0
+            aux2 = np.sum(e / h * lam * fc0, 1) / r0
+            aux3 = np.sum(e / (2 * h) * lam**2 * fc1, 1) / r0
+            Z[:, full] = (-r[full]**3 * aux1[:, full] +
+                          r[full]**3 * aux2[:, full] -
+                          r[full]**4 * aux3[:, full]) * self.scaling
+        return np.real(Z), np.imag(Z)
+
     def vmd_total_Ef(self, h, z, rho, d, epr, mur, tm):
         """VMD E-phi field (not used actively)."""
         # only halfspace
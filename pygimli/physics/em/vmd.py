@@ -256,6 +256,77 @@ class VMDTimeDomainModelling(VMDModelling):
         """par = [thicknesses(nLay), res(nlay + 1)]"""
         return self.response_mt(par, 0)
 
+    def batchResponse(self, models, fops=None):
+        """Model responses of many soundings computed at once.
+
+        Soundings with equal times and loop areas are computed in one
+        vectorized call of :py:meth:`calcRhoaBatch`, otherwise the
+        individual responses are used.
+        """
+        fops = fops or [self] * len(models)
+        if any(type(f) is not type(self) or f.txArea != self.txArea or
+               f.rxArea != self.rxArea or not np.array_equal(f.t, self.t)
+               for f in fops):
+            return super().batchResponse(models, fops)
+
+        models = np.asarray(models, dtype=float)
+        nLay = (models.shape[1] - 1) // 2
+        return self.calcRhoaBatch(models[:, :nLay], models[:, nLay:])
+
+    def calcRhoaBatch(self, thk, res):
+        """Compute apparent resistivity for many layered models.
+
+        Vectorized version of :py:meth:`calcRhoa` (and the underlying
+        :py:meth:`calcEphiT`, :py:meth:`calcEPhiF` and :py:meth:`btp`).
+
+        Parameters
+        ----------
+        thk : array (nModels, nLayers-1)
+            thicknesses
+        res : array (nModels, nLayers)
+            resistivities
+
+        Returns
+        -------
+        rhoa : array (nModels, len(self.t))
+        """
+        mu0 = pg.physics.constants.mu0
+        a = sqrt(self.txArea / pi)  # TX coil radius
+        t = pg.utils.niceLogspace(min(self.t), max(self.t), nDec=10)
+        # frequencies of the sine transformation
+        fcS, nc0S = pg.utils.hankelFC(1)
+        ncS = len(fcS)
+        omega = 10. ** (0.1 * (1 - (-ncS + nc0S +
+                                     np.arange(1, ncS + len(t))))) / t[0]
+        # wave numbers for the J1 Hankel transformation at r=a, z=0
+        fcJ1, nc0 = pg.utils.hankelFC(4)
+        k = np.exp(-np.arange(nc0 - len(fcJ1), nc0) * np.log(10) * 0.1) / a
+        # admittances for all (models, frequencies, wave numbers)
+        c = (1j * mu0 * omega)[np.newaxis, :, np.newaxis]
+        b = np.sqrt(k**2 + c / res[:, -1, np.newaxis, np.newaxis])
+        for nn in range(res.shape[1] - 2, -1, -1):
+            alpha = np.sqrt(k**2 + c / res[:, nn, np.newaxis, np.newaxis])
+            cth = np.exp(-2. * thk[:, nn, np.newaxis, np.newaxis] * alpha)
+            cth = (1 - cth) / (1 + cth)
+            b = (b + alpha * cth) / (1 + cth * b / alpha)
+
+        aux3 = np.sum((b - k) / (b + k) * k * fcJ1[::-1], axis=2) / a
+        ePhiF = (1. / a**2 - aux3) * -1j * omega * mu0 / (4 * pi)
+        fef = np.real(ePhiF / np.sqrt(omega))
+        # sine transformation into time domain
+        it = np.arange(len(t))[:, np.newaxis] + ncS - 1 - np.arange(ncS)
+        valid = it < len(omega)
+        ePhi = -np.sum(fef[:, np.where(valid, it, 0)] * fcS * valid, axis=2)
+        ePhi *= self.rxArea * np.sqrt(2 / pi / t)
+        # interpolate to measuring times (linear in log-log)
+        W = np.array([np.interp(np.log(self.t), np.log(t), e)
+                      for e in np.eye(len(t))])
+        ePhi = np.exp(np.log(ePhi) @ W)
+
+        tmp = a**(4./3) * self.rxArea**(2./3) * \
+            mu0**(5./3) / (20**(2./3) * pi**(1./3))
+        return tmp / (self.t**(5./3) * (ePhi * 2 * pi * a)**(2./3))
+
     def calcRhoa(self, thk, res):
         """Compute apparent resistivity response"""
         a = sqrt(self.txArea / pi)  # TX coil radius
@@ -22,7 +22,7 @@ from .ert import (simulate, estimateError,
 from .ertManager import ERTManager
 from .ertIPManager import ERTIPManager
 from .ertModelling import ERTModelling, ERTModellingReference
-from .ertScheme import createData
+from .ertScheme import createData, geometricFactorsFromIndices
 from .processing import (uniqueERTIndex, generateDataFromUniqueIndex,
                          reciprocalIndices, fitReciprocalErrorModel,
                          reciprocalProcessing)
@@ -8,6 +8,69 @@ from pygimli.physics import ert
 from pygimli.viewer.mpl.colorbar import createColorBarOnly
 
 
+def geometricFactorsFromIndices(pos, a, b, m, n, dim=3, forceFlatEarth=False):
+    """Analytic geometric factors for electrode index arrays.
+
+    Array version of :gimliapi:`GIMLI::geometricFactors` for a half space
+    with the surface at z=0, without the need of a data container.
+
+    Parameters
+    ----------
+    pos : array (nSensors, 3)
+        Electrode positions.
+    a, b, m, n : array [int]
+        Electrode indices of every datum, -1 for electrodes at infinity.
+    dim : int [3]
+        For dim=2, a non-zero y-coordinate is taken as depth.
+    forceFlatEarth : bool [False]
+        Ignore the electrode depth.
+
+    Returns
+    -------
+    k : array
+        Geometric factors.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pygimli.physics.ert import geometricFactorsFromIndices
+    >>> pos = np.array([[0., 0, 0], [1, 0, 0], [2, 0, 0], [3, 0, 0]])
+    >>> k = geometricFactorsFromIndices(pos, [0], [3], [1], [2])
+    >>> print(np.round(k / np.pi, 6))  # Wenner 2 pi a
+    [2.]
+    """
+    pos = np.array(pos, dtype=float)
+    if dim == 2:
+        depth = pos[:, 1] != 0.0
+        pos[depth, 2] = pos[depth, 1]
+        pos[depth, 1] = 0.0
+    if forceFlatEarth:
+        pos[:, 2] = 0.0
+    mirror = pos * [1.0, 1.0, -1.0]
+
+    def _u(s, p):
+        """Potential of unit current at s in p with mirror source."""
+        s, p = np.asarray(s, dtype=int), np.asarray(p, dtype=int)
+        valid = (s > -1) & (p > -1)
+        r = np.linalg.norm(pos[p] - pos[s], axis=1)
+        rm = np.linalg.norm(pos[p] - mirror[s], axis=1)
+        with np.errstate(divide='ignore'):
+            u = (1.0 / r + 1.0 / rm) / (4.0 * np.pi)
+        u[r < 1e-12] = 1.0  # same fallback as the core
+        return np.where(valid, u, 0.0)
+
+    with np.errstate(divide='ignore'):
+        return 1.0 / (_u(a, m) - _u(b, m) - _u(a, n) + _u(b, n))
+
+
+def _ranges(starts, stops):
+    """Concatenated np.arange(start, stop) and the index of every range."""
+    count = np.maximum(np.asarray(stops) - np.asarray(starts), 0)
+    idx = np.repeat(np.arange(len(count)), count)
+    first = np.cumsum(count) - count
+    return np.arange(count.sum()) - first[idx] + np.asarray(starts)[idx], idx
+
+
 def createData(elecs, schemeName='none', **kwargs):
     """ Utility one-liner to create a BERT datafile
 
@@ -35,6 +98,10 @@ def createData(elecs, schemeName='none', **kwargs):
         * closed : bool
             Close the chain. Measure from the end of the array to the first
             electrode.
+        * maxSeparation : int
+            Maximum separation (in electrode numbers) of the configurations.
+        * minK, maxK : float
+            Remove data with absolute geometric factors outside the range.
 
     Returns
     -------
@@ -60,9 +127,9 @@ def createData(elecs, schemeName='none', **kwargs):
         data.setSensors(pg.cat(-elecs[::-1], elecs))
 
         nElecs = len(elecs)
-        for i in range(nElecs-1):
-            data.createFourPointData(i, i, 2*nElecs-i-1, nElecs-1, nElecs)
-
+        i = np.arange(nElecs - 1)
+        _setQuadrupoles(data, i, 2 * nElecs - i - 1,
+                        np.full(len(i), nElecs - 1), np.full(len(i), nElecs))
         return data
 
     mg = DataSchemeManager()
@@ -84,15 +151,14 @@ def createData(elecs, schemeName='none', **kwargs):
                              **kwargs)
     elif hasattr(elecs, '__iter__'):
         if isinstance(elecs[0], (float, int)):
-            data = scheme.create(nElectrodes=len(elecs), **kwargs)
-            data.setSensors(elecs)
+            data = scheme.create(sensorList=[float(x) for x in elecs],
+                                 **kwargs)
         else:
             data = scheme.create(sensorList=elecs, **kwargs)
     else:
         print(elecs)
         pg.critical("Can't interpret elecs")
 
-    data['k'] = ert.geometricFactors(data)
     return data
 
 
@@ -117,19 +183,38 @@ def createDataVES(ab2, mn2):
     if isinstance(mn2, (float, int)):
         mn2 = [mn2]
 
-    count = 0
-    for mn in mn2:
-        emID = data.createSensor([-mn, 0.0, 0.0])
-        enID = data.createSensor([mn, 0.0, 0.0])
-
-        for x in ab2:
-            eaID = data.createSensor([-x, 0.0, 0.0])
-            ebID = data.createSensor([x, 0.0, 0.0])
-            data.createFourPointData(count, eaID, ebID, emID, enID)
-            count += 1
+    ab2 = np.asarray(ab2, dtype=float)
+    mn2 = np.asarray(mn2, dtype=float)
+
+    # sensor x positions in order of creation (M, N, A1, B1, A2, B2, ...)
+    x = np.column_stack([-mn2, mn2,
+                         np.tile(np.column_stack([-ab2, ab2]).ravel(),
+                                 (len(mn2), 1))]).ravel()
+    ux, first, idx = np.unique(x, return_index=True, return_inverse=True)
+    # sensor ids by first appearance like createSensor
+    rank = np.empty(len(ux), dtype=int)
+    rank[np.argsort(first)] = np.arange(len(ux))
+    for xi in ux[np.argsort(first)]:
+        data.createSensor([xi, 0.0, 0.0])
+
+    idx = rank[idx].reshape(len(mn2), -1)
+    a = idx[:, 2::2].ravel()
+    b = idx[:, 3::2].ravel()
+    m = np.repeat(idx[:, 0], len(ab2))
+    n = np.repeat(idx[:, 1], len(ab2))
+
+    _setQuadrupoles(data, a, b, m, n)
+    return data
 
-    data.fitFillSize()
 
+def _setQuadrupoles(data, a, b, m, n):
+    """Fill data with electrode index arrays in one go."""
+    data.resize(len(a))
+    data.set('a', pg.Vector(np.asarray(a, dtype=float)))
+    data.set('b', pg.Vector(np.asarray(b, dtype=float)))
+    data.set('m', pg.Vector(np.asarray(m, dtype=float)))
+    data.set('n', pg.Vector(np.asarray(n, dtype=float)))
+    data.set('valid', pg.Vector(len(a), 1))
     return data
 
 
@@ -239,6 +324,10 @@ class DataSchemeManager(object):
 class DataSchemeBase(object):
     """Base class for ERT data schemes
 
+    The schemes create the electrode index arrays of all configurations
+    with array operations (see :py:meth:`createIndices`), filters are
+    applied as masks and the data container is filled at once.
+
     Attributes
     ----------
     closed : bool
@@ -257,6 +346,7 @@ class DataSchemeBase(object):
         self.nElectrodes_ = 0
         self.maxSeparation = 1e99
         self._closed = False
+        self._sortSensors = False
 
     @property
     def closed(self):
@@ -264,17 +354,42 @@ class DataSchemeBase(object):
 
     def create(self, nElectrodes=24, electrodeSpacing=1, sensorList=None,
                **kwargs):
-        """."""
+        """Create the data container with geometric factors.
+
+        Parameters
+        ----------
+        **kwargs:
+            * maxSeparation : int [999]
+                Maximum separation in electrode numbers.
+            * minK, maxK : float
+                Remove data with absolute geometric factors outside the
+                range.
+            * all other are forwarded to :py:meth:`createIndices`
+        """
         self.createElectrodes(nElectrodes, electrodeSpacing, sensorList)
         self.setMaxSeparation(kwargs.pop("maxSeparation", 999))
-        self.createData(**kwargs)
+        minK = kwargs.pop('minK', None)
+        maxK = kwargs.pop('maxK', None)
+
+        abmn = self.quadrupoles(**kwargs)
 
         if self.addInverse_:
-            out = pg.DataContainerERT(self.data_)
             self.setInverse(not self.inverse_)
-            self.createData(**kwargs)
-            self.data_.add(out)
-            self.data_.removeInvalid()
+            abmn = np.hstack([self.quadrupoles(**kwargs), abmn])
+
+        pos = np.array(self.data_.sensors())
+        k = geometricFactorsFromIndices(pos, *abmn)
+
+        keep = np.ones(len(k), dtype=bool)
+        if minK is not None:
+            keep &= np.abs(k) >= minK
+        if maxK is not None:
+            keep &= np.abs(k) <= maxK
+
+        _setQuadrupoles(self.data_, *abmn[:, keep])
+        self.data_.set('k', pg.Vector(k[keep]))
+
+        if self.addInverse_ or self._sortSensors:
             self.data_.sortSensorsIndex()
 
         if kwargs.values():
@@ -300,8 +415,40 @@ class DataSchemeBase(object):
 
         self.nElectrodes_ = self.data_.sensorCount()
 
+    def createIndices(self, **kwargs):
+        """Return the electrode index arrays a, b, m, n of the scheme.
+
+        Needs to be implemented by the derived schemes, -1 denotes an
+        electrode at infinity. Indices out of range are removed later.
+        """
+        return np.zeros((4, 0), dtype=int)
+
+    def quadrupoles(self, **kwargs):
+        """Return the valid configurations as index array (4, nData).
+
+        Removes configurations with electrodes out of range or used twice
+        and swaps current and potential electrodes for inverse schemes.
+        """
+        abmn = np.array(self.createIndices(**kwargs), dtype=int)
+        abmn = abmn.reshape(4, -1)
+
+        keep = np.all(abmn < self.nElectrodes_, axis=0)
+        for i in range(4):
+            for j in range(i + 1, 4):
+                keep &= (abmn[i] != abmn[j]) | (abmn[i] == -1)
+        abmn = abmn[:, keep]
+
+        if self.inverse_:
+            abmn = abmn[[2, 3, 0, 1]]
+        return abmn
+
     def createData(self, **kwargs):
-        print('*'*100)
+        """Create the dataset without geometric factors.
+
+        Don't use directly .. call create from DataSchemeManager or
+        ert.createData(elecs, schemeName=prefix, **kwargs) instead.
+        """
+        return _setQuadrupoles(self.data_, *self.quadrupoles(**kwargs))
 
     def setInverse(self, inverse=False):
         self.inverse_ = inverse
@@ -327,6 +474,10 @@ class DataSchemeBase(object):
             count += 1
         return count
 
+    def _maxSep(self, nMax):
+        """Maximum separation limited by self.maxSeparation."""
+        return int(min(nMax, self.maxSeparation))
+
 
 class DataSchemePolePole(DataSchemeBase):
     """Pole-Pole data scheme."""
@@ -336,32 +487,17 @@ class DataSchemePolePole(DataSchemeBase):
         self.prefix = "pp"
         self.type = Pseudotype.PolePole
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """
         Create a Pole-Pole dataset.
 
         Don't use directly .. call create from DataSchemeManager or
         ert.createData(elecs, schemeName='pp', **kwargs) instead.
         """
-        nElectrodes = self.nElectrodes_
-        # reserve a couple more than nesseccary ###
-        self.data_.resize((nElectrodes) * (nElectrodes))
-
-        count = 0
-        # enlargeEverySep = 0  # not used
-
-        b = -1
-        n = -1
-
-        for a in range(0, nElectrodes):
-            for m in range(a + 1, nElectrodes):
-                if m - a > self.maxSeparation:
-                    break
-
-                count = self.createDatum_(a, b, m, n, count)
-
-        self.data_.removeInvalid()
-        return self.data_
+        a, m = np.triu_indices(self.nElectrodes_, 1)
+        keep = m - a <= self.maxSeparation
+        a, m = a[keep], m[keep]
+        return a, -np.ones_like(a), m, -np.ones_like(a)
 
 
 class DataSchemeDipoleDipole(DataSchemeBase):
@@ -374,7 +510,7 @@ class DataSchemeDipoleDipole(DataSchemeBase):
         self.enlargeEverySep = 0
         self.spacings = [1]
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """
         Create a Dipole-Dipole dataset.
 
@@ -400,54 +536,33 @@ class DataSchemeDipoleDipole(DataSchemeBase):
 
         self.enlargeEverySep = kwargs.pop('enlarge', 0)
         self.spacings = kwargs.pop('spacings', self.spacings)
-        # self.createElectrodes(nElectrodes, electrodeSpacing)
-
-        # reserve a couple more than necessary ###
-        nElectrodes = self.nElectrodes_
-        self.data_.resize(nElectrodes * nElectrodes)
-
-        count = 0
 
         if self.closed:
             space = 1
-            for i in range(nElectrodes):
-                a = i
-                b = (a + space) % nElectrodes
-
-                for j in range(nElectrodes):
-                    m = (j) % nElectrodes
-                    n = (m + space) % nElectrodes
-
-                    if not complete:
-                        if j <= i:
-                            continue
+            i, j = np.divmod(np.arange(nElectrodes**2), nElectrodes)
+            if not complete:
+                i, j = i[j > i], j[j > i]
+            return (i, (i + space) % nElectrodes,
+                    j, (j + space) % nElectrodes)
+
+        abmn = []
+        for space in self.spacings:
+            maxInj = nElectrodes - space
+            sep = np.arange(1, self._maxSep(nElectrodes - space) + 1)
+            if self.enlargeEverySep > 0:
+                sp = space + (sep - 1) // self.enlargeEverySep + 1
+            else:
+                sp = np.full(len(sep), space)
 
-                    if a != m and a != n and b != m and b != n:
-                        count = self.createDatum_(a, b, m, n, count)
+            a, iSep = _ranges(np.zeros(len(sep), dtype=int), maxInj - sep)
+            sep, sp = sep[iSep], sp[iSep]
+            b = (a + sp) % nElectrodes
+            m = (b + sep) % nElectrodes
+            n = (m + sp) % nElectrodes
+            keep = m + sp < nElectrodes
+            abmn.append(np.array([a, b, m, n])[:, keep])
 
-        else:
-            for space in self.spacings:
-                maxSep = nElectrodes - space
-                maxInj = nElectrodes - space
-
-                if self.maxSeparation < maxSep:
-                    maxSep = self.maxSeparation
-                for sep in range(1, maxSep + 1):
-
-                    if self.enlargeEverySep > 0:
-                        if (sep-1) % self.enlargeEverySep == 0:
-                            space += 1
-
-                    for i in range(maxInj - sep):
-                        a = i
-                        b = (a + space) % nElectrodes
-                        m = (b + sep) % nElectrodes
-                        n = (m + space) % nElectrodes
-                        if m + space < nElectrodes:
-                            count = self.createDatum_(a, b, m, n, count)
-
-        self.data_.removeInvalid()
-        return self.data_
+        return np.hstack(abmn) if abmn else np.zeros((4, 0), dtype=int)
 # class DataSchemeDipoleDipole
 
 class DataSchemePoleDipole(DataSchemeBase):
@@ -459,7 +574,7 @@ class DataSchemePoleDipole(DataSchemeBase):
         self.type = Pseudotype.PoleDipole
         self.spacings = [1]
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """
         Create a Pole-Dipole dataset.
 
@@ -475,29 +590,13 @@ class DataSchemePoleDipole(DataSchemeBase):
             * spacings : array[int]
                 vector of spacings (dipole lengths) to use
         """
-        nElectrodes = self.nElectrodes_
-
-        # self.createElectrodes(nElectrodes, electrodeSpacing)
-        # reserve a couple more than nesseccary !!!
-        self.data_.resize((nElectrodes) * (nElectrodes))
-
-        count = 0
         self.enlargeEverySep = kwargs.pop('enlarge', 0)
         self.spacings = kwargs.pop('spacings', self.spacings)
 
-        b = -1
-        for a in range(0, nElectrodes):
-
-            for m in range(a + 1, nElectrodes - 1):
-                n = m + 1
-
-                if m - a > self.maxSeparation:
-                    break
-
-                count = self.createDatum_(a, b, m, n, count)
-
-        self.data_.removeInvalid()
-        return self.data_
+        a, m = np.triu_indices(max(self.nElectrodes_ - 1, 0), 1)
+        keep = m - a <= self.maxSeparation
+        a, m = a[keep], m[keep]
+        return a, -np.ones_like(a), m, m + 1
 # class DataSchemePoleDipole
 
 class DataSchemeHalfWenner(DataSchemeBase):
@@ -507,8 +606,9 @@ class DataSchemeHalfWenner(DataSchemeBase):
         self.name = "Half Wenner (C-P-P)"
         self.prefix = "hw"
         self.type = Pseudotype.HalfWenner
+        self._sortSensors = True
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """
         Create a Half-Wenner dataset.
 
@@ -516,44 +616,20 @@ class DataSchemeHalfWenner(DataSchemeBase):
         ert.createData(elecs, schemeName='hw', **kwargs) instead.
         """
         nElectrodes = self.nElectrodes_
-
-        # reserve a couple more than nesseccary !!!
-        self.data_.resize((nElectrodes) * (nElectrodes))
-
-        # print("create", self.maxSeparation)
-
-        count = 0
-        # space = 0  # not yet used
-        # enlargeEverySep = 0  # not yet used
-
-        b = -1
-        for a in range(0, nElectrodes):
-            inc = 1
-            while True:
-                m = a - inc
-                n = m - inc
-
-                if m < 0 or n < 0 or inc > self.maxSeparation:
-                    break
-
-                count = self.createDatum_(a, b, m, n, count)
-                inc = inc + 1
-
-            inc = 1
-            while True:
-                m = a + inc
-                n = m + inc
-
-                if m > nElectrodes or n > nElectrodes or \
-                        inc > self.maxSeparation:
-                    break
-
-                count = self.createDatum_(a, b, m, n, count)
-                inc = inc + 1
-
-        self.data_.removeInvalid()
-        self.data_.sortSensorsIndex()
-        return self.data_
+        a = np.arange(nElectrodes)
+        maxSep = self._maxSep(nElectrodes)
+
+        # backward (n < m < a) and forward (a < m < n) for every a
+        incB, aB = _ranges(np.ones(nElectrodes, dtype=int),
+                           np.minimum(a // 2, maxSep) + 1)
+        incF, aF = _ranges(np.ones(nElectrodes, dtype=int),
+                           np.minimum((nElectrodes - a) // 2, maxSep) + 1)
+
+        a = np.concatenate([aB, aF])
+        inc = np.concatenate([-incB, incF])
+        order = np.lexsort((np.abs(inc), inc > 0, a))
+        a, inc = a[order], inc[order]
+        return a, -np.ones_like(a), a + inc, a + 2 * inc
 #class DataSchemeHalfWenner
 
 class DataSchemeWennerAlpha(DataSchemeBase):
@@ -564,33 +640,15 @@ class DataSchemeWennerAlpha(DataSchemeBase):
         self.prefix = "wa"
         self.type = Pseudotype.WennerAlpha
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """Create a Wenner-alpha dataset.
 
         Don't use directly .. call create from DataSchemeManager or
         ert.createData(elecs, schemeName='wa', **kwargs) instead.
         """
-        nElectrodes = self.nElectrodes_
-
-        maxSep = nElectrodes - 2
-        if self.maxSeparation < maxSep:
-            maxSep = self.maxSeparation
-
-        # reserve a couple more than nesseccary !!!
-        self.data_.resize(nElectrodes * nElectrodes)
-
-        count = 0
-
-        for sep in range(1, maxSep + 1):
-            for i in range((nElectrodes - 2) - sep):
-                a = i
-                m = a + sep
-                n = m + sep
-                b = n + sep
-                count = self.createDatum_(a, b, m, n, count)
-
-        self.data_.removeInvalid()
-        return self.data_
+        a, sep = _separations(self.nElectrodes_, self._maxSep(
+            self.nElectrodes_ - 2))
+        return a, a + 3 * sep, a + sep, a + 2 * sep
 #class DataSchemeWennerAlpha
 
 class DataSchemeWennerBeta(DataSchemeBase):
@@ -601,34 +659,15 @@ class DataSchemeWennerBeta(DataSchemeBase):
         self.prefix = "wb"
         self.type = Pseudotype.WennerBeta
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """Create a Wenner-beta dataset.
 
         Don't use directly .. call create from DataSchemeManager or
         ert.createData(elecs, schemeName='wb', **kwargs) instead.
         """
-        nElectrodes = self.nElectrodes_
-
-        maxSep = nElectrodes - 2
-        if self.maxSeparation < maxSep:
-            maxSep = self.maxSeparation
-
-        # reserve a couple more than nesseccary ###
-        self.data_.resize((nElectrodes * nElectrodes))
-
-        count = 0
-
-        for sep in range(1, maxSep + 1):
-            for i in range((nElectrodes - 2) - sep):
-                a = i
-                b = a + sep
-                m = b + sep
-                n = m + sep
-
-                count = self.createDatum_(a, b, m, n, count)
-
-        self.data_.removeInvalid()
-        return self.data_
+        a, sep = _separations(self.nElectrodes_, self._maxSep(
+            self.nElectrodes_ - 2))
+        return a, a + sep, a + 2 * sep, a + 3 * sep
 # class DataSchemeWennerBeta(...)
 
 
@@ -640,32 +679,15 @@ class DataSchemeSchlumberger(DataSchemeBase):
         self.prefix = "slm"
         self.type = Pseudotype.Schlumberger
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """Create a full (Wenner-)Schlumberger dataset.
 
         Don't use directly .. call create from DataSchemeManager or
         ert.createData(elecs, schemeName='sl', **kwargs) instead.
         """
-        nElectrodes = self.nElectrodes_
-
-        maxSep = nElectrodes - 2
-        if self.maxSeparation < maxSep:
-            maxSep = self.maxSeparation
-
-        self.data_.resize(nElectrodes * nElectrodes)
-
-        count = 0
-
-        for sep in range(1, maxSep + 1):
-            for i in range((nElectrodes - 2) - sep):
-                a = i
-                m = a + sep
-                n = m + 1
-                b = n + sep
-                count = self.createDatum_(a, b, m, n, count)
-
-        self.data_.removeInvalid()
-        return self.data_
+        a, sep = _separations(self.nElectrodes_, self._maxSep(
+            self.nElectrodes_ - 2))
+        return a, a + 2 * sep + 1, a + sep, a + sep + 1
 # class DataSchemeSchlumberger(...)
 
 
@@ -677,7 +699,7 @@ class DataSchemeMultipleGradient(DataSchemeBase):
         self.prefix = "gr"
         self.type = Pseudotype.Gradient
 
-    def createData(self, **kwargs):
+    def createIndices(self, **kwargs):
         """Create a multi-gradient dataset.
 
         Don't use directly .. call create from DataSchemeManager or
@@ -691,29 +713,26 @@ class DataSchemeMultipleGradient(DataSchemeBase):
         max_fak = int(np.ceil(nElectrodes / ab_sep_base))
         ab_space = [ii*ab_sep_base for ii in range(max_fak) if ii % ev == 1]
         mn_space = [ii for ii in range(max_fak) if ii % takeevery == 1]
-        count = 0
-        a, b, m, n = [], [], [], []
-        for ab in range(len(ab_space)):  # ab spacings
-            for aa in np.arange(1, nElectrodes-ab_space[ab]+1, 1):  # a index
-                mn = mn_space[ab]
-                for mm in np.arange(aa+mn, aa+ab_space[ab]-mn, mn):
-                    count += 1
-                    a.append(int(aa))
-                    b.append(int(aa+ab_space[ab]))
-                    m.append(int(mm))
-                    n.append(int(mm+mn))
-
-        self.data_.resize(count)
-        self.data_.set('a', pg.Vector(a) - 1)
-        self.data_.set('b', pg.Vector(b) - 1)
-        self.data_.set('m', pg.Vector(m) - 1)
-        self.data_.set('n', pg.Vector(n) - 1)
-        self.data_.set('valid', pg.Vector(count, 1))
 
-        return self.data_
+        abmn = [np.zeros((4, 0), dtype=int)]
+        for ab, mn in zip(ab_space, mn_space):
+            mOff = np.arange(mn, ab - mn, mn)
+            a = np.repeat(np.arange(nElectrodes - ab), len(mOff))
+            m = a + np.tile(mOff, nElectrodes - ab)
+            abmn.append(np.array([a, a + ab, m, m + mn]))
+
+        return np.hstack(abmn)
 # class DataSchemeMultipleGradient(...)
 
 
+def _separations(nElectrodes, maxSep):
+    """Start electrode and separation of all Wenner-like configurations."""
+    sep = np.arange(1, maxSep + 1)
+    a, iSep = _ranges(np.zeros(len(sep), dtype=int),
+                      (nElectrodes - 2) - sep)
+    return a, sep[iSep]
+
+
 if __name__ == '__main__':
     schemes = ['wa', 'wb', 'pp', 'pd', 'dd', 'slm', 'gr', 'hw']
     fig, ax = pg.plt.subplots(3, 3)
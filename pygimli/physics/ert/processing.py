@@ -70,7 +70,43 @@ def generateDataFromUniqueIndex(ind, data=None, nI=None):
     scheme["valid"] = 1
     return scheme
 
-def reciprocalIndices(data, onlyOnce=False, unify=True):
+def _matchIndices(keys, queries, allPairs=False):
+    """Match query values against keys by sorting (hash join).
+
+    Parameters
+    ----------
+    keys, queries : iterable (int)
+        values (e.g. unique ERT indices) to be matched
+    allPairs : bool [False]
+        return all matching pairs instead of only the first (lowest) key
+        index for every query
+
+    Returns
+    -------
+    iQ, iK : np.array(dtype=int)
+        indices into queries and keys with queries[iQ] == keys[iK], sorted
+        by query index
+    """
+    keys = np.asarray(keys)
+    queries = np.asarray(queries)
+    order = np.argsort(keys, kind='stable')
+    sKeys = keys[order]
+    left = np.searchsorted(sKeys, queries, side='left')
+    if allPairs:
+        right = np.searchsorted(sKeys, queries, side='right')
+        nMatch = right - left
+        iQ = np.repeat(np.arange(len(queries)), nMatch)
+        offset = np.arange(len(iQ)) - np.repeat(np.cumsum(nMatch) - nMatch,
+                                                nMatch)
+        return iQ, order[np.repeat(left, nMatch) + offset]
+
+    found = sKeys[np.minimum(left, len(sKeys) - 1)] == queries \
+        if len(sKeys) > 0 else np.zeros(len(queries), dtype=bool)
+    iQ = np.nonzero(found)[0]
+    return iQ, order[left[iQ]]
+
+
+def reciprocalIndices(data, onlyOnce=False, unify=True, allPairs=False):
     """Return indices for reciprocal data.
 
     Parameters:
@@ -78,6 +114,11 @@ def reciprocalIndices(data, onlyOnce=False, unify=True):
         data containing reciprocal data
     onlyOnce : bool [False]
         return every pair only once
+    unify : bool [True]
+        sort A/B and M/N so that bipole orientation does not matter
+    allPairs : bool [False]
+        return all pairs for repeated measurements instead of only the first
+        reciprocal for every datum
 
     Returns
     -------
@@ -86,15 +127,7 @@ def reciprocalIndices(data, onlyOnce=False, unify=True):
     """
     unF = uniqueERTIndex(data, unify=unify)
     unB = uniqueERTIndex(data, unify=unify, reverse=True)
-    iF, iB = [], []
-    for i, u in enumerate(unF):
-        ii = np.nonzero(unB == u)[0]
-        if len(ii) > 0:
-            iF.append(i)
-            iB.append(ii[0])
-
-    iF = np.array(iF, dtype=int)
-    iB = np.array(iB, dtype=int)
+    iF, iB = _matchIndices(unB, unF, allPairs=allPairs)
     if onlyOnce:
         return iF[iF < iB], iB[iF < iB]
     else:
@@ -245,41 +278,56 @@ def getReciprocals(data, change=False, remove=False):
     """Compute data reciprocity from forward and backward data.
 
     The reciprocity (difference between forward and backward array divided by
-    their mean) is computed and saved under the dataContainer field 'rec'
+    their mean) is computed and saved under the dataContainer field 'rec'.
+    Forward/backward pairs are found by sorting the unique indices, so that
+    all values are computed as whole-array operations.
 
     Parameters
     ==========
     data : pg.DataContainerERT
         input data container to be changed inplace
     change : bool [True]
-        compute current-weighted mean of forward and backward values
+        compute current-weighted mean of forward and (all) backward values
     remove : bool [False]
-        remove backward data that are present as forward data
+        remove backward data that are present as forward data, i.e., of every
+        pair only the data with the later index (and its repetitions) is kept
     """
     if not data.allNonZero('r'):
         data['r'] = data['u'] / data['i']
 
     unF = uniqueERTIndex(data)
     unB = uniqueERTIndex(data, reverse=True)
-    rF, rB = [], []
+    iB, iF = _matchIndices(unF, unB)
+    r = np.array(data['r'])
+    I = np.array(data['i'])
+    rF, rB = r[iF], r[iB]
     rec = np.zeros(data.size())
-    data['rec'] = 0
-    for iB in range(data.size()):
-        if unB[iB] in unF:
-            iF = int(np.nonzero(unF == unB[iB])[0][0])
-            rF.append(data['r'][iF])
-            rB.append(data['r'][iB])
-            rec[iB] = (rF[-1]-rB[-1]) / (rF[-1]+rB[-1]) * 2
-            data['rec'][iF] = rec[iB]
-            IF, IB = data['i'][iF], data['i'][iB]  # use currents for weighting
-            if change and data['valid'][iF]:
-                data['r'][iF] = (rF[-1] * IF + rB[-1] * IB) / (IF + IB)
-                data['i'][iF] = (IF**2 + IB**2) / (IF + IB)  # according weight
-                data['u'][iF] = data['r'][iF] * data['i'][iF]
-                if remove:
-                    data['valid'][iB] = 0  # for adding all others later on
-
-    print(len(rF), "reciprocals")
+    rec[iF] = (rF - rB) / (rF + rB) * 2
+    data['rec'] = rec
+    if change:
+        # current-weighted mean of forward and all backward values
+        upd = np.array(data['valid'], dtype=bool)[iF]
+        n = data.size()
+        IB = I[iB]  # use currents for weighting
+        sumI = np.bincount(iF, IB, minlength=n)
+        sumRI = np.bincount(iF, rB * IB, minlength=n)
+        sumII = np.bincount(iF, IB**2, minlength=n)
+        ii = iF[upd]
+        r[ii] = ((r * I + sumRI) / (I + sumI))[ii]
+        I[ii] = ((I**2 + sumII) / (I + sumI))[ii]  # according weight
+        u = np.array(data['u'])
+        u[ii] = r[ii] * I[ii]
+        data['r'] = r
+        data['i'] = I
+        data['u'] = u
+        if remove:  # remove all data of the group that comes first
+            first = np.full(n, n)
+            first[iB] = iF
+            valid = np.array(data['valid'])
+            valid[iB[upd & (first[iF] < iF)]] = 0
+            data['valid'] = valid
+
+    print(len(iF), "reciprocals")
     if remove:
         data.removeInvalid()
 
@@ -289,25 +337,31 @@ def extractReciprocals(fwd, bwd):
     nMax = max(fwd.sensorCount(), bwd.sensorCount())
     unF = uniqueERTIndex(fwd, nI=nMax)
     unB = uniqueERTIndex(bwd, nI=nMax, reverse=True)
-    rF, rB = [], []
+    iB, iF = _matchIndices(unF, unB)
+    rF, rB = np.asarray(fwd('r'))[iF], np.asarray(bwd('r'))[iB]
+    IF, IB = np.asarray(fwd('i'))[iF], np.asarray(bwd('i'))[iB]
     rec = np.zeros(bwd.size())
+    rec[iB] = (rF - rB) / (rF + rB) * 2
+
     both = pg.DataContainerERT(fwd)
-    both.set('rec', pg.Vector(both.size()))
+    recF = np.zeros(both.size())
+    recF[iF] = rec[iB]
+    both.set('rec', recF)
+    r, I = np.array(both('r')), np.array(both('i'))
+    r[iF] = (rF * IF + rB * IB) / (IF + IB)  # use currents for weighting
+    I[iF] = (IF**2 + IB**2) / (IF + IB)  # according to weight
+    u = np.array(both('u'))
+    u[iF] = r[iF] * I[iF]
+    both.set('r', r)
+    both.set('i', I)
+    both.set('u', u)
+
     back = pg.DataContainerERT(bwd)
     back.set('rec', pg.Vector(back.size()))
-    for iB in range(bwd.size()):
-        if unB[iB] in unF:
-            iF = int(np.nonzero(unF == unB[iB])[0][0])
-            rF.append(fwd('r')[iF])
-            rB.append(bwd('r')[iB])
-            rec[iB] = (rF[-1]-rB[-1]) / (rF[-1]+rB[-1]) * 2
-            both('rec')[iF] = rec[iB]
-            IF, IB = fwd('i')[iF], bwd('i')[iB]  # use currents for weighting
-            both('r')[iF] = (rF[-1] * IF + rB[-1] * IB) / (IF + IB)
-            both('i')[iF] = (IF**2 + IB**2) / (IF + IB)  # according to weight
-            both('u')[iF] = fwd('r')[iF] * fwd('i')[iF]
-            back('valid')[iB] = 0  # for adding all others later on
-    print(len(rF), "reciprocals")
+    valid = np.array(back('valid'))
+    valid[iB] = 0  # for adding all others later on
+    back.set('valid', valid)
+    print(len(iB), "reciprocals")
     back.removeInvalid()
     both.add(back)
     return rec, both
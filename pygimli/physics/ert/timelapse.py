@@ -5,10 +5,196 @@ from datetime import datetime, timedelta
 import numpy as np
 import pygimli as pg
 from pygimli.physics import ert
-from .processing import combineMultipleData
+from .processing import combineMultipleData, uniqueERTIndex
+
+
+class TimelapseStore():
+    """Binary on-disk store for timelapse data cubes.
+
+    The store is a directory holding the measuring scheme (scheme.shm), the
+    time stamps (times.bin, int64 microseconds) and a raw float64 file
+    (e.g. rhoa.bin, err.bin) for every (nData, nTimes) array. The arrays are
+    written time step by time step, so that they can be accessed
+    memory-mapped and new frames are appended without rewriting the store.
+
+    Examples
+    --------
+    >>> # store = TimelapseStore("monitoring.tlert", data=scheme)
+    >>> # store.append(times, rhoa=DATA, err=ERR)
+    >>> # DATA = store.array("rhoa")  # memory-mapped (nData, nTimes)
+    """
+
+    def __init__(self, path, data=None):
+        """Open existing store or create a new one for the scheme data.
+
+        Parameters
+        ----------
+        path : str
+            directory name of the store
+        data : DataContainerERT
+            scheme to create a new store with (existing store is replaced)
+        """
+        self.path = path
+        if data is not None:
+            os.makedirs(path, exist_ok=True)
+            for fname in glob(os.path.join(path, "*.bin")) + \
+                    glob(os.path.join(path, "results", "*.b*")):
+                os.remove(fname)
+
+            data.save(os.path.join(path, "scheme.shm"), "a b m n k")
+            open(os.path.join(path, "times.bin"), "wb").close()
+
+        if not os.path.isfile(os.path.join(path, "scheme.shm")):
+            pg.critical("No timelapse store found:", path)
+
+        self.data = ert.load(os.path.join(path, "scheme.shm"))
+
+    @staticmethod
+    def isStore(path):
+        """Check if path is a timelapse store."""
+        return os.path.isfile(os.path.join(path, "scheme.shm"))
+
+    def _fileName(self, name):
+        return os.path.join(self.path, name + ".bin")
+
+    @property
+    def nTimes(self):
+        """Number of stored time steps."""
+        return os.path.getsize(self._fileName("times")) // 8
+
+    @property
+    def times(self):
+        """Time stamps as array of datetime objects."""
+        t = np.fromfile(self._fileName("times"), dtype=np.int64)
+        return t.astype("datetime64[us]").astype(datetime)
+
+    def keys(self):
+        """Names of the stored arrays."""
+        return [os.path.basename(f)[:-4] for f in
+                sorted(glob(os.path.join(self.path, "*.bin")))
+                if not f.endswith("times.bin")]
+
+    def array(self, name, mmap=True):
+        """Return stored array of shape (nData, nTimes).
+
+        Parameters
+        ----------
+        name : str
+            array name, e.g. "rhoa" or "err"
+        mmap : bool [True]
+            return a read-only memory-mapped view instead of loading it
+        """
+        shape = (self.nTimes, self.data.size())
+        if not os.path.isfile(self._fileName(name)):
+            pg.critical("Array not in timelapse store:", name)
+
+        if mmap and np.prod(shape) > 0:
+            return np.memmap(self._fileName(name), dtype=np.float64,
+                             mode="r", shape=shape).T
+
+        return np.fromfile(self._fileName(name),
+                           dtype=np.float64).reshape(shape).T
+
+    def append(self, times, **arrays):
+        """Append time step(s) to the store.
+
+        Parameters
+        ----------
+        times : datetime|[datetime]
+            time stamp(s) of the new frame(s)
+        **arrays : np.array (nData) or (nData, len(times))
+            values (masked entries are stored as nan) for every array name
+        """
+        times = np.atleast_1d(np.array(times, dtype="datetime64[us]"))
+        nT = self.nTimes
+        for name, A in arrays.items():
+            A = np.ma.filled(np.ma.asarray(A, dtype=float), np.nan)
+            A = np.reshape(A, [self.data.size(), -1])
+            if A.shape[1] != len(times):
+                pg.critical("Array does not fit to the number of times:",
+                            name, A.shape)
+
+            with open(self._fileName(name), "ab") as fid:
+                if fid.tell() != nT * A.shape[0] * 8:
+                    pg.critical("Array is not of length nTimes:", name)
+                np.ascontiguousarray(A.T).tofile(fid)
+
+        with open(self._fileName("times"), "ab") as fid:
+            times.astype(np.int64).tofile(fid)
+
+    def appendResult(self, t, model, response, chi2, mesh=None):
+        """Append inversion result of a time step to the results folder.
+
+        Parameters
+        ----------
+        t : datetime
+            time stamp of the inverted frame
+        model, response : iterable
+            model (paraDomain cells) and model response (nData)
+        chi2 : float
+            chi-square misfit
+        mesh : :gimliapi:`GIMLI::Mesh`
+            parameter mesh, stored with the first result only
+        """
+        path = os.path.join(self.path, "results")
+        os.makedirs(path, exist_ok=True)
+        if mesh is not None and not os.path.isfile(
+                os.path.join(path, "para.bms")):
+            mesh.save(os.path.join(path, "para.bms"))
+
+        for name, vals in zip(["model", "response", "chi2"],
+                              [model, response, [chi2]]):
+            with open(os.path.join(path, name + ".bin"), "ab") as fid:
+                np.asarray(vals, dtype=np.float64).tofile(fid)
+
+        with open(os.path.join(path, "times.bin"), "ab") as fid:
+            np.array([t], dtype="datetime64[us]").astype(np.int64).tofile(fid)
+
+    def results(self, mmap=True):
+        """Return stored inversion results.
+
+        Returns
+        -------
+        res : dict
+            times (nResults), models (nResults, nCells), responses
+            (nResults, nData), chi2s (nResults) and paraDomain mesh (pd)
+        """
+        path = os.path.join(self.path, "results")
+        res = {}
+        if not os.path.isfile(os.path.join(path, "times.bin")):
+            return res
+
+        t = np.fromfile(os.path.join(path, "times.bin"), dtype=np.int64)
+        res["times"] = t.astype("datetime64[us]").astype(datetime)
+        res["chi2s"] = np.fromfile(os.path.join(path, "chi2.bin"))
+        for name in ["model", "response"]:
+            fname = os.path.join(path, name + ".bin")
+            shape = (len(t), os.path.getsize(fname) // 8 // max(len(t), 1))
+            if mmap and np.prod(shape) > 0:
+                res[name + "s"] = np.memmap(fname, dtype=np.float64,
+                                            mode="r", shape=shape)
+            else:
+                res[name + "s"] = np.fromfile(fname).reshape(shape)
+
+        if os.path.isfile(os.path.join(path, "para.bms")):
+            res["pd"] = pg.load(os.path.join(path, "para.bms"))
+
+        return res
 
 
 # move general timelapse stuff to method-independent class
+def _unmapped(A):
+    """Return in-memory copy of a (masked) memory-mapped array."""
+    if not isinstance(np.ma.getdata(A), np.memmap):
+        return A
+
+    B = np.array(np.ma.getdata(A))
+    if np.ma.isMaskedArray(A):
+        return np.ma.masked_array(B, mask=np.ma.getmaskarray(A).copy())
+
+    return B
+
+
 # class Timelapse():
 #     mask
 #     chooseTime
@@ -56,6 +242,8 @@ class TimelapseERT():
         self.responses = []
         self.chi2s = []
         self.model = None
+        self.store = None
+        self._online = None
         self.mgr = ert.ERTManager()
         if self.mesh is not None:
             self.mgr.setMesh(self.mesh)
@@ -96,8 +284,30 @@ class TimelapseERT():
         return "\n".join(out)
 
     def load(self, filename, **kwargs):
-        """Load or import data (or data files using *)."""
-        if os.path.isfile(filename):
+        """Load or import data (or data files using *).
+
+        Parameters
+        ----------
+        filename : str
+            data file (with .rhoa/.err/.times files), glob pattern of data
+            files or directory of a binary :py:class:`TimelapseStore`
+        mmap : bool [True]
+            access the arrays of a binary store memory-mapped
+        """
+        if os.path.isdir(filename) and TimelapseStore.isStore(filename):
+            mmap = kwargs.pop("mmap", True)
+            self.store = TimelapseStore(filename)
+            self.data = self.store.data
+            self.times = self.store.times
+            keys = self.store.keys()
+            if "rhoa" in keys:
+                self.DATA = self.store.array("rhoa", mmap=mmap)
+            if "err" in keys:
+                self.ERR = self.store.array("err", mmap=mmap)
+
+            self.name = os.path.splitext(filename.rstrip("/\\"))[0]
+            return
+        elif os.path.isfile(filename):
             self.data = ert.load(filename)
             if os.path.isfile(filename[:-4]+".rhoa"):
                 self.DATA = np.loadtxt(filename[:-4]+".rhoa")
@@ -113,12 +323,44 @@ class TimelapseERT():
 
         self.name = filename[:-4].replace("*", "All")
 
-    def saveData(self, filename=None, masknan=True):
-        """Save all data as datacontainer, times, rhoa and error arrays."""
+    def saveData(self, filename=None, masknan=True, binary=False):
+        """Save all data as datacontainer, times, rhoa and error arrays.
+
+        Parameters
+        ----------
+        filename : str [self.name]
+            file name (without ending)
+        masknan : bool [True]
+            save masked data as nan
+        binary : bool [False]
+            save as binary :py:class:`TimelapseStore` (filename.tlert) that
+            can be loaded memory-mapped and extended by :py:meth:`addFrame`
+        """
         filename = filename or self.name
         if filename.endswith(".shm"):
             filename = filename[:-4]
 
+        if binary:
+            if not filename.endswith(".tlert"):
+                filename += ".tlert"
+
+            if self.store is not None and os.path.abspath(
+                    self.store.path) == os.path.abspath(filename):
+                # the store is replaced, load the arrays mapped from it
+                # into memory and release the old mapping first
+                self.DATA = _unmapped(self.DATA)
+                self.ERR = _unmapped(self.ERR)
+
+            DATA = self.DATA if masknan else np.ma.getdata(self.DATA)
+            arrays = {"rhoa": DATA}
+            if np.any(self.ERR):
+                arrays["err"] = self.ERR
+
+            self.store = TimelapseStore(filename, data=self.data)
+            self.store.append(self.times, **arrays)
+            self.name = filename[:-6]
+            return
+
         self.data.save(filename+".shm", "a b m n k")
         DATA = self.DATA.copy()
         if masknan:
@@ -134,6 +376,76 @@ class TimelapseERT():
 
         self.name = filename
 
+    def addFrame(self, data, t=None):
+        """Add a new frame (time step) of data, e.g. from monitoring.
+
+        The data are matched into the existing scheme, data not being part of
+        the scheme are ignored. If the data were loaded from or saved to a
+        binary store, the frame is appended to it and the data are accessed
+        memory-mapped from the store afterwards.
+
+        Parameters
+        ----------
+        data : DataContainerERT|str
+            data (file) with rhoa (or r/u and i) and possibly err
+        t : datetime|str [now]
+            time of the frame
+        """
+        if isinstance(data, str):
+            data = ert.load(data)
+
+        if isinstance(t, str):
+            t = datetime.fromisoformat(t)
+
+        t = t or datetime.now()
+        nI = max(self.data.sensorCount(), data.sensorCount()) + 1
+        uI = uniqueERTIndex(self.data, nI=nI)
+        order = np.argsort(uI)
+        uF = uniqueERTIndex(data, nI=nI)
+        ii = np.minimum(np.searchsorted(uI, uF, sorter=order), len(uI) - 1)
+        found = uI[order[ii]] == uF
+        if not np.all(found):
+            pg.warn("Ignoring {} data not in scheme".format(sum(~found)))
+
+        iS, iD = order[ii[found]], np.nonzero(found)[0]
+        RHOA = np.full(self.data.size(), np.nan)
+        if data.haveData("rhoa"):
+            RHOA[iS] = np.array(data["rhoa"])[iD]
+        else:
+            r = data["r"] if data.haveData("r") else data["u"] / data["i"]
+            RHOA[iS] = np.abs(np.array(r)[iD] * np.array(self.data["k"])[iS])
+
+        ERR = np.zeros(self.data.size())
+        if data.haveData("err"):
+            ERR[iS] = np.array(data["err"])[iD]
+
+        nT = np.shape(self.DATA)[1] if np.size(self.DATA) > 0 else 0
+        if self.store is not None:
+            # append on disk and re-open instead of copying the whole cube
+            arrays = {"rhoa": RHOA}
+            keys = self.store.keys()
+            if nT == 0 or "err" in keys:
+                arrays["err"] = ERR
+            elif data.haveData("err"):
+                pg.warn("Timelapse store holds no errors, ignoring them")
+
+            self.store.append(t, **arrays)
+            self.DATA = self.store.array("rhoa")
+            if "err" in arrays:
+                self.ERR = self.store.array("err")
+        elif nT > 0:
+            self.DATA = np.ma.column_stack([self.DATA, RHOA])
+            self.ERR = np.column_stack([self.ERR, ERR]) \
+                if np.shape(self.ERR) == (self.data.size(), nT) else \
+                np.column_stack([np.zeros((self.data.size(), nT)), ERR])
+        else:
+            self.DATA = np.reshape(RHOA, [-1, 1])
+            self.ERR = np.reshape(ERR, [-1, 1])
+
+        self.times = np.append(self.times[:nT], t)
+        self.mask()
+        return nT
+
     def timeIndex(self, t):  #
         """Return index of closest timestep in times to t.
 
@@ -209,8 +521,9 @@ class TimelapseERT():
         emax : float
             maximum error
         """
-        self.DATA = np.ma.masked_invalid(self.DATA)
-        self.DATA = np.ma.masked_outside(self.DATA, rmin, rmax)
+        # no copies to keep memory-mapped data on disk
+        self.DATA = np.ma.masked_invalid(self.DATA, copy=False)
+        self.DATA = np.ma.masked_outside(self.DATA, rmin, rmax, copy=False)
         if emax is not None and np.any(self.ERR):
             self.DATA.mask = np.bitwise_or(self.DATA.mask, self.ERR > emax)
 
@@ -459,6 +772,76 @@ class TimelapseERT():
         self.responses = np.array(responses)
         self.pd = self.mgr.paraDomain
 
+    def invertFrame(self, t=-1, jacobian="broyden", **kwargs):
+        """Invert a single time step incrementally (online mode).
+
+        The first call runs a full inversion. Every further call reuses mesh,
+        region manager and constraints, starts from the previous model and
+        keeps the reference model of the first frame. The Jacobian of the
+        previous frame is reused for the first iteration, so that frames
+        can be processed as they arrive (see :py:meth:`addFrame`). Results
+        are appended to the attached binary store (if any).
+
+        Parameters
+        ----------
+        t : int|datetime|str [-1]
+            time step to invert, by default the last one
+        jacobian : str ["broyden"]
+            Jacobian strategy for all but the first frame:
+            "recalc" - recompute in every iteration (like invert)
+            "reuse" - keep the Jacobian of the previous frame
+            "broyden" - reuse and improve it by rank-one (Broyden) updates
+            from the observed response changes after every iteration, it is
+            only recomputed if the linear response prediction fails (see
+            jacobianUpdate of :py:meth:`pygimli.Inversion.run`)
+        **kwargs : dict
+            keyword arguments passed to ERTManager.invert (first frame) or
+            to the inversion run (all others), e.g. maxIter, lam
+
+        Returns
+        -------
+        model : np.array
+            paraDomain model of the time step
+        """
+        if jacobian not in ["recalc", "reuse", "broyden"]:
+            pg.critical("Unknown Jacobian strategy:", jacobian)
+
+        t = int(self.timeIndex(t)) % len(self.times)
+        data = self.chooseTime(t)
+        inv = self.mgr.fw
+        if self._online is None:
+            if self.mesh is None:
+                self.createMesh()
+
+            self.mgr.fop.setVerbose(False)
+            kwargs.setdefault("startModel", 100)
+            kwargs.setdefault("isReference", True)
+            self.model = self.mgr.invert(data, **kwargs)
+            self.pd = self.mgr.paraDomain
+            self._online = []
+        else:
+            inv.run(data["rhoa"], data["err"],
+                    startModel=pg.Vector(inv.model),
+                    jacobianUpdate=jacobian.replace("recalc", "full"),
+                    **kwargs)
+            self.model = self.mgr.paraModel(inv.model)
+
+        self._online.append(t)
+        response = np.array(inv.response)
+        self.chi2s = np.append(self.chi2s, inv.chi2())
+        if self.store is not None:
+            self.store.appendResult(self.times[t], self.model, response,
+                                    inv.chi2(), mesh=self.pd)
+            res = self.store.results()
+            self.models, self.responses = res["models"], res["responses"]
+        else:
+            self.models = np.reshape(np.append(self.models, self.model),
+                                     [-1, len(self.model)])
+            self.responses = np.reshape(np.append(self.responses, response),
+                                        [-1, len(response)])
+
+        return self.model
+
     def fullInversion(self, scalef=1.0, **kwargs):
         """Full (4D) inversion."""
         DATA = [self.chooseTime(ti) for ti in range(len(self.times))]
@@ -618,6 +1001,14 @@ class TimelapseERT():
     def loadResults(self, basename=None):
         """Load inversion results."""
         if basename is None or basename is True:
+            if self.store is not None and self.store.results():
+                res = self.store.results()
+                self.pd = res.get("pd", self.pd)
+                self.models = res["models"]
+                self.responses = res["responses"]
+                self.chi2s = res["chi2s"]
+                return
+
             basename = self.name
         
         self.pd = pg.load(basename+".bms")
@@ -4,6 +4,7 @@
 
 import pygimli as pg
 from pygimli.frameworks import MethodManager
+from pygimli.frameworks.modelling import FopDispatcher
 
 
 class PetroModelling(pg.Modelling):
@@ -63,7 +64,8 @@ class PetroModelling(pg.Modelling):
 class PetroJointModelling(pg.Modelling):
     """Cumulative (joint) forward operator for petrophysical inversions."""
 
-    def __init__(self, f=None, p=None, mesh=None, verbose=True):
+    def __init__(self, f=None, p=None, mesh=None, verbose=True,
+                 nWorkers=1, backend="process"):
         """Constructor."""
         pg.warn('do not use')
         super().__init__(verbose=verbose)
@@ -72,6 +74,9 @@ class PetroJointModelling(pg.Modelling):
         self.jac = None
         self.jacI = None
         self.mesh = None
+        self.dispatcher = None
+        self.nWorkers = nWorkers
+        self.backend = backend
 
         if f is not None and p is not None:
             self.setFopsAndTrans(f, p)
@@ -80,10 +85,14 @@ class PetroJointModelling(pg.Modelling):
         """TODO."""
         self.fops = [PetroModelling(fi, pi, self.mesh)
                      for fi, pi in zip(fops, trans)]
+        self.dispatcher = FopDispatcher(self.fops, nWorkers=self.nWorkers,
+                                        backend=self.backend)
 
     def setMesh(self, mesh):
         """TODO."""
         self.mesh = mesh
+        if self.dispatcher is not None:
+            self.dispatcher.closeWorkerPool()
         for fi in self.fops:
             fi.setMesh(mesh)
 
@@ -95,6 +104,7 @@ class PetroJointModelling(pg.Modelling):
         for i, fi in enumerate(self.fops):
             fi.setData(data[i])
 
+        self.dispatcher.setDataSizes([d.size() for d in data])
         self.initJacobian()
 
     def initJacobian(self):
@@ -108,16 +118,12 @@ class PetroJointModelling(pg.Modelling):
 
     def response(self, model):
         """Create concatenated response for fop stack with model."""
-        resp = []
-        for f in self.fops:
-            resp.extend(f.response(model))
-        return resp
+        return self.dispatcher.response(model)
 
     def createJacobian(self, model):
         """Creating individual Jacobian matrices."""
         self.initJacobian()
-        for f in self.fops:
-            f.createJacobian(model)
+        self.dispatcher.createJacobian(model)
 
 
 class JointPetroInversion(MethodManager):  # bad name: no inversion framework!
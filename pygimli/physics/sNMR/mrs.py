@@ -598,6 +598,11 @@ class MRS():
                 'PSO' - Particle Swarm Optimization
                 'ACS' - Ant Colony Strategy
                 'ES' - Evolutionary Strategy
+
+        See Also
+        --------
+        pygimli.frameworks.GlobalOptimizer : batched and parallel global
+            search (DE, CMA-ES, SA) for any forward operator
         """
         import inspyred
         import random
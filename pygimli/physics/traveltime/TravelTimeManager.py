@@ -11,6 +11,7 @@ from pygimli.frameworks import MeshMethodManager
 from pygimli.utils import getSavePath
 from . modelling import TravelTimeDijkstraModelling, FatrayDijkstraModelling
 from . plotting import drawFirstPicks
+from . utils import raySegments
 
 
 class TravelTimeManager(MeshMethodManager):
@@ -273,7 +274,7 @@ class TravelTimeManager(MeshMethodManager):
         else:
             super().showFit(axs=axs, **kwargs)
 
-    def getRayPaths(self, model=None):
+    def getRayPaths(self, model=None, ragged=False):
         """Compute ray paths.
 
         If model is not specified, the last calculated Jacobian is used.
@@ -283,27 +284,28 @@ class TravelTimeManager(MeshMethodManager):
         model : array
             Velocity model for which to calculate and visualize ray paths (the
             default is model for last Jacobian calculation in self.velocity).
+        ragged : bool [False]
+            Return all rays as compact (offsets, points) arrays.
 
         Returns
         -------
-        list of two-column array holding x and y positions
+        list of two-column array holding x and y positions or, if ragged,
+        offsets : array (data.size() + 1)
+            Ray i consists of points[offsets[i]:offsets[i+1]].
+        points : array (N, 2)
+            x and y positions of all ray points.
         """
         if model is not None:
-            # if self.fop.jacobian().size() == 0 or model != self.model:
-            self.fop.createJacobian(1/model)
+            model = 1.0 / np.asarray(model)
 
-        shots = self.fop.data.id("s")
-        recei = self.fop.data.id("g")
+        offsets, ids = self.fop.rayPaths(model)
+        nodes = np.array(self.fop._core.mesh().positions(withSecNodes=True))
+        points = nodes[ids, :2]
 
-        segs = []
-        nodes = self.fop._core.mesh().positions(withSecNodes=True)
+        if ragged:
+            return offsets, points
 
-        for s, g in zip(shots, recei):
-            wi = self.fop.way(s, g)
-            points = nodes[wi]
-            segs.append(np.column_stack((pg.x(points), pg.y(points))))
-
-        return segs
+        return np.split(points, offsets[1:-1])
 
     def drawRayPaths(self, ax, model=None, rayPaths=None, **kwargs):
         """Draw the the ray paths for model or last model.
@@ -312,8 +314,9 @@ class TravelTimeManager(MeshMethodManager):
 
         Parameters
         ----------
-        rayPaths : list of np.array
-            x/y column array with ray point positions
+        rayPaths : list of np.array | (offsets, points)
+            x/y column array with ray point positions or ragged rays, see
+            :py:meth:`getRayPaths`
         model : array
             Velocity model for which to calculate and visualize ray paths (the
             default is model for last Jacobian calculation in self.velocity).
@@ -327,7 +330,11 @@ class TravelTimeManager(MeshMethodManager):
         -------
         lc : matplotlib.LineCollection
         """
-        rayPaths = rayPaths or self.getRayPaths(model=model)
+        if rayPaths is None:
+            rayPaths = self.getRayPaths(model=model, ragged=True)
+
+        if isinstance(rayPaths, tuple):
+            rayPaths = raySegments(*rayPaths)[0]
 
         _ = kwargs.setdefault("color", "w")
         _ = kwargs.setdefault("alpha", 0.5)
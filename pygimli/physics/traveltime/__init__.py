@@ -7,7 +7,7 @@ from .importData import load
 from .tt import simulate, DataContainerTT, show
 from .plotting import drawFirstPicks, drawTravelTimeData, drawVA, showVA
 from .utils import (createGradientModel2D, createRAData, shotReceiverDistances,
-                    createCrossholeData)
+                    createCrossholeData, raySegments)
 #from .refraction import Refraction, Tomography # will be removed(201909)
 from .refraction1d import RefractionNLayer, RefractionNLayerFix1stLayer
 from .TravelTimeManager import TravelTimeDijkstraModelling, TravelTimeManager
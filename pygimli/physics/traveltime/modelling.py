@@ -11,6 +11,154 @@ from .utils import createGradientModel2D, shotReceiverDistances
 from .plotting import drawVA
 
 
+def _shortestPathGraph(mesh):
+    """Edges of the shortest path graph of a mesh, like the core builds it.
+
+    Every cell connects all pairs of its nodes, the secondary nodes of its
+    boundaries and its own secondary nodes. The edges are collected once
+    and cached into mesh._shortestPathGraph.
+
+    Returns
+    -------
+    a, b: ndarray
+        Unique node pairs (a < b), indices into
+        mesh.positions(withSecNodes=True).
+    order, starts: ndarray
+        Sort order of all (edge, cell) pairs by edge and the start of every
+        unique edge in it.
+    cell, dist: ndarray
+        Cell and length of the sorted (edge, cell) pairs.
+    """
+    if hasattr(mesh, '_shortestPathGraph'):
+        if mesh._shortestPathGraph[0] == hash(mesh):
+            return mesh._shortestPathGraph[1:]
+
+    from pygimli.meshtools.mesh import _meshArrays
+
+    mesh.createNeighborInfos()
+    _, cells, (_, _, left, right) = _meshArrays(mesh, boundaries=True)
+
+    if mesh.secondaryNodeCount() > 0:
+        extra = [[] for _ in range(mesh.cellCount())]
+        for b in mesh.boundaries():
+            sec = [n.id() for n in b.secondaryNodes()]
+            if len(sec) > 0:
+                extra[left[b.id()]].extend(sec)
+                if right[b.id()] > -1:
+                    extra[right[b.id()]].extend(sec)
+        for c in mesh.cells():
+            extra[c.id()].extend([n.id() for n in c.secondaryNodes()])
+
+        cellNodes = [None] * mesh.cellCount()
+        for cIds, idx in cells.values():
+            for c, ids in zip(cIds, idx):
+                cellNodes[c] = list(ids) + extra[c]
+
+        groups = {}
+        for c, ids in enumerate(cellNodes):
+            groups.setdefault(len(ids), []).append(c)
+        cells = {k: (np.array(cIds), np.array([cellNodes[c] for c in cIds]))
+                 for k, cIds in groups.items()}
+
+    a, b, cell = [], [], []
+    for cIds, idx in cells.values():
+        j, k = np.triu_indices(idx.shape[1], 1)
+        a.append(idx[:, j].ravel())
+        b.append(idx[:, k].ravel())
+        cell.append(np.repeat(cIds, len(j)))
+
+    a, b = np.concatenate(a).astype(int), np.concatenate(b).astype(int)
+    cell = np.concatenate(cell)
+    a, b = np.minimum(a, b), np.maximum(a, b)
+
+    pos = np.array(mesh.positions(withSecNodes=True))
+    dist = np.maximum(1e-8, np.linalg.norm(pos[a] - pos[b], axis=1))
+
+    order = np.lexsort((b, a))
+    a, b = a[order], b[order]
+    starts = np.nonzero(np.r_[True, (a[1:] != a[:-1]) | (b[1:] != b[:-1])])[0]
+
+    mesh._shortestPathGraph = (hash(mesh), a[starts], b[starts], order,
+                               starts, cell[order], dist[order])
+    return mesh._shortestPathGraph[1:]
+
+
+def shortestPaths(mesh, slowPerCell, shotNodes, recNodes, shots=None,
+                  maxMemory=1e8):
+    """Shortest paths for many shot-receiver pairs at once.
+
+    The Dijkstra predecessor tree of every shot is computed with
+    scipy.sparse.csgraph and all paths are backtracked simultaneously, so
+    there is no Python work per path.
+
+    Parameters
+    ----------
+    mesh: :gimliapi:`GIMLI::Mesh`
+        Mesh (with secondary nodes) of the forward calculation.
+    slowPerCell: iterable
+        Slowness for every cell of the mesh.
+    shotNodes, recNodes: iterable [int]
+        Start and end node of every path.
+    shots: iterable [int]
+        Unique start nodes, default is the unique shotNodes.
+    maxMemory: int [1e8]
+        Maximum bytes of predecessor trees computed at once.
+
+    Returns
+    -------
+    offsets: ndarray (nPaths + 1)
+        Path i consists of nodes[offsets[i]:offsets[i+1]].
+    nodes: ndarray
+        Node indices of all paths from shot to receiver, indices into
+        mesh.positions(withSecNodes=True).
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra
+
+    a, b, order, starts, cell, dist = _shortestPathGraph(mesh)
+    nNodes = mesh.nodeCount() + mesh.secondaryNodeCount()
+
+    # edge time is the minimum over all cells sharing the edge
+    time = np.minimum.reduceat(dist * np.asarray(slowPerCell)[cell], starts)
+    G = csr_matrix((time, (a, b)), shape=(nNodes, nNodes))
+
+    shotNodes = np.asarray(shotNodes, dtype=int)
+    recNodes = np.asarray(recNodes, dtype=int)
+    if shots is None:
+        shots = np.unique(shotNodes)
+    shots = np.asarray(shots, dtype=int)
+
+    rays, steps, nodes = [], [], []
+    # dijkstra returns float64 distances and int32 predecessors per node
+    chunk = max(1, int(maxMemory // (12 * nNodes)))
+    for i in range(0, len(shots), chunk):
+        sh = shots[i:i + chunk]
+        pred = dijkstra(G, directed=False, indices=sh,
+                        return_predecessors=True)[1]
+
+        row = np.full(nNodes, -1)
+        row[sh] = np.arange(len(sh))
+        row = row[shotNodes]
+        ray = np.nonzero(row > -1)[0]
+        row, cur = row[ray], recNodes[ray]
+        step = 0
+        while len(ray) > 0:
+            rays.append(ray)
+            steps.append(np.full(len(ray), step))
+            nodes.append(cur)
+            cur = pred[row, cur]
+            keep = cur >= 0
+            ray, row, cur = ray[keep], row[keep], cur[keep]
+            step += 1
+
+    rays, steps = np.concatenate(rays), np.concatenate(steps)
+    nodes = np.concatenate(nodes)
+    # per path from shot to receiver
+    idx = np.lexsort((-steps, rays))
+    offsets = np.r_[0, np.cumsum(np.bincount(rays, minlength=len(shotNodes)))]
+    return offsets, nodes[idx]
+
+
 class TravelTimeDijkstraModelling(MeshModelling):
     """Forward modelling class for traveltime using Dijktras method."""
 
@@ -22,6 +170,7 @@ class TravelTimeDijkstraModelling(MeshModelling):
         self._core.setRegionManager(self.regionManagerRef())
 
         self._useGradient = None  # assumed to be [vTop, vBot] if set
+        self._jacobianModel = None  # slowness of the last Jacobian
         self._refineSecNodes = secNodes
         # self._refineSecNodes = kwargs.pop("secNodes", 3)  # inactive!
         self.jacobian = self._core.jacobian
@@ -34,6 +183,15 @@ class TravelTimeDijkstraModelling(MeshModelling):
         """Return current Dijkstra graph associated to mesh and model."""
         return self._core.dijkstra()
 
+    @property
+    def background(self):
+        """Slowness of background cells.
+
+        Fixed constant: the core operator uses 1e16 internally and has no
+        accessor, so the value can neither be read from nor set in the core.
+        """
+        return 1e16
+
     # def regionManagerRef(self):
     #     """Region manager reference (core Dijkstra has an own!)."""
     #     return self._core.regionManagerRef()
@@ -53,6 +211,7 @@ class TravelTimeDijkstraModelling(MeshModelling):
 
     def setMeshPost(self, mesh):
         """Set mesh after forward operator has been initalized."""
+        self._jacobianModel = None
         self._core.setMesh(mesh, ignoreRegionManager=True)
 
     def setDataPost(self, data):
@@ -90,6 +249,7 @@ class TravelTimeDijkstraModelling(MeshModelling):
         if not self.mesh():
             pg.critical("no mesh")
 
+        self._jacobianModel = np.array(par)
         return self._core.createJacobian(par)
 
     def response(self, par):
@@ -105,6 +265,49 @@ class TravelTimeDijkstraModelling(MeshModelling):
         """
         return self._core.way(s, g)
 
+    def rayPaths(self, slowness=None):
+        """Return the ray paths of all data as ragged node index array.
+
+        Parameters
+        ----------
+        slowness: iterable [None]
+            Slowness model. The paths are calculated for all data at once
+            from the shortest path trees of the shots (see
+            :py:func:`shortestPaths`). If None, the slowness of the last
+            Jacobian calculation is used. Only if that is unknown (e.g. for
+            operators with an own createJacobian), the ways are collected
+            ray by ray from the core.
+
+        Returns
+        -------
+        offsets: ndarray (data.size() + 1)
+            Ray i consists of nodes[offsets[i]:offsets[i+1]].
+        nodes: ndarray
+            Node indices of all rays from shot to receiver, indices into
+            self.mesh().positions(withSecNodes=True).
+        """
+        shots = self.data.id("s")
+        recei = self.data.id("g")
+
+        if slowness is None:
+            slowness = self._jacobianModel
+
+        if slowness is None:
+            ways = [self._core.way(s, g) for s, g in zip(shots, recei)]
+            offsets = np.r_[0, np.cumsum([len(w) for w in ways])]
+            nodes = np.fromiter((i for w in ways for i in w), dtype=int,
+                                count=offsets[-1])
+            return offsets, nodes
+
+        mesh = self._core.mesh()
+        sensorNodes = np.array([mesh.findNearestNode(p)
+                                for p in self.data.sensorPositions()])
+        # same mapping as the core response
+        slowPerCell = self._core.createMappedModel(slowness, self.background)
+        return shortestPaths(mesh, slowPerCell,
+                             sensorNodes[np.asarray(shots, dtype=int)],
+                             sensorNodes[np.asarray(recei, dtype=int)])
+
     def drawModel(self, ax, model, **kwargs):
         """Draw the model."""
         kwargs.setdefault('label', pg.unit('vel'))
@@ -85,6 +85,44 @@ def shotReceiverDistances(data, full=True):
         return np.absolute(gx - sx)
 
 
+def raySegments(offsets, points):
+    """Split ragged ray paths into straight segments.
+
+    Parameters
+    ----------
+    offsets: iterable [int]
+        Ray i consists of points[offsets[i]:offsets[i+1]].
+    points: ndarray (N, dim)
+        Positions of all ray points.
+
+    Returns
+    -------
+    segments: ndarray (nSegments, 2, dim)
+        Start and end position of every segment, e.g., for a
+        matplotlib LineCollection.
+    ray: ndarray (nSegments)
+        Ray index of every segment, e.g., to compute ray densities
+        with np.bincount.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from pygimli.physics.traveltime.utils import raySegments
+    >>> pnts = np.array([[0., 0.], [1., 0.], [2., 1.], [0., 1.], [1., 1.]])
+    >>> seg, ray = raySegments([0, 3, 5], pnts)
+    >>> print(len(seg), ray)
+    3 [0 0 1]
+    """
+    offsets = np.asarray(offsets, dtype=int)
+    points = np.asarray(points)
+    ray = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    # all points except the last of every ray start a segment
+    start = np.ones(len(points), dtype=bool)
+    start[offsets[1:][offsets[1:] > offsets[:-1]] - 1] = False
+    start = np.nonzero(start)[0]
+    return np.stack([points[start], points[start + 1]], axis=1), ray[start]
+
+
 def createRAData(sensors, shotDistance=1):
     """Create a refraction data container.
 
@@ -6,6 +6,62 @@ from pygimli.frameworks import Block1DModelling
 from pygimli.frameworks.modelling import DEFAULT_STYLES
 
 
+_hankelFilter = {}
+
+
+def _dc1dFilter():
+    """Abscissae and weights of the Hankel filter of the core DC1dModelling.
+
+    Using the same filter keeps batch and single responses identical.
+    """
+    if not _hankelFilter:
+        fop = pg.core.DC1dModelling(1, pg.Vector(1, 1.0), pg.Vector(1, 0.5))
+        _hankelFilter['x'] = np.asarray(fop.filterAbscissae())
+        _hankelFilter['w'] = np.asarray(fop.filterWeights())
+    return _hankelFilter['x'], _hankelFilter['w']
+
+
+def dc1dPotential(r, rho, thk):
+    """Potential kernel of layered halfspaces (vectorized over soundings).
+
+    Computes the secondary part of the potential by a Hankel transform of
+    the layered-earth kernel using the digital J0 filter of the core
+    DC1dModelling.
+
+    Parameters
+    ----------
+    r : array (nSoundings, nData)
+        electrode distances
+    rho : array (nSoundings, nLayers)
+        layer resistivities
+    thk : array (nSoundings, nLayers-1)
+        layer thicknesses
+
+    Returns
+    -------
+    pot : array (nSoundings, nData)
+        potential (without the homogeneous part) for unit current
+    """
+    r = np.abs(r)
+    if rho.shape[1] == 1:  # homogeneous halfspace
+        return np.zeros_like(r)
+
+    x, w = _dc1dFilter()
+    r = r[:, :, np.newaxis]
+    lam = x / r
+    z = np.ones_like(lam) * rho[:, -1, np.newaxis, np.newaxis]
+    p = np.zeros_like(lam)
+    for i in range(rho.shape[1] - 2, -1, -1):
+        rhoI = rho[:, i, np.newaxis, np.newaxis]
+        p = (z - rhoI) / (z + rhoI)
+        th = np.tanh(lam * thk[:, i, np.newaxis, np.newaxis])
+        z = rhoI * (z + th * rhoI) / (z * th + rhoI)
+
+    ehl = np.exp(-2.0 * lam * thk[:, 0, np.newaxis, np.newaxis]) * p
+    kern = ehl / (1.0 - ehl) * rho[:, 0, np.newaxis, np.newaxis] / np.pi
+    return np.sum(kern * w, axis=2) / r[:, :, 0]
+
+
 class VESModelling(Block1DModelling):
     """Vertical Electrical Sounding (VES) forward operator.
 
@@ -152,6 +208,28 @@ class VESModelling(Block1DModelling):
 
         return fop.response(par)
 
+    def batchResponse(self, models, fops=None):
+        """Model responses of many soundings computed at once.
+
+        Soundings with equal number of data are computed in a single
+        vectorized call of :py:func:`dc1dPotential`, otherwise the
+        individual responses are used.
+        """
+        fops = fops or [self] * len(models)
+        if self.nPara != 1 or len(set(len(f.am) for f in fops)) > 1:
+            return super().batchResponse(models, fops)
+
+        models = np.asarray(models, dtype=float)
+        nLayers = (models.shape[1] + 1) // 2
+        thk, rho = models[:, :nLayers-1], models[:, nLayers-1:]
+        am, an, bm, bn = [np.array([getattr(f, tok) for f in fops],
+                                   dtype=float)
+                          for tok in ["am", "an", "bm", "bn"]]
+        k = 2.0 * np.pi / (1.0 / am - 1.0 / an - 1.0 / bm + 1.0 / bn)
+        return (dc1dPotential(am, rho, thk) - dc1dPotential(an, rho, thk) -
+                dc1dPotential(bm, rho, thk) + dc1dPotential(bn, rho, thk)) * \
+            k + rho[:, :1]
+
     def drawModel(self, ax, model, **kwargs):
         """Draw model as 1D block model."""
         pg.viewer.mpl.drawModel1D(ax=ax,
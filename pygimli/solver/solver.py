@@ -1133,7 +1133,9 @@ class LinSolver(object):
 
     def factorizeSciPy(self, mat):
         """"""
-        self._m = pg.utils.sparseMatrix2csr(mat)
+        # own copy, the factorization (e.g. umfpack) keeps using the matrix
+        # and must not depend on the lifetime of mat
+        self._m = pg.utils.sparseMatrix2csr(mat, copy=True)
         # scipy is not dependency
         # scipy = pg.optImport('scipy', 'Used for sparse linear solver.')
         from scipy.sparse.linalg import factorized
@@ -1235,7 +1237,7 @@ def linSolve(mat, b, solver=None, verbose=False, **kwargs):
 
     elif solver == 'scipy':
         # pg._r(swatch.duration(restart=True))
-        _m = pg.utils.sparseMatrix2csr(mat)
+        _m = pg.utils.sparseMatrix2csr(mat, copy=False)
         # pg._r('convert', swatch.duration(restart=True))
 
         # scipy is now a dependency
@@ -2277,7 +2279,9 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
 
         dynamic: bool [False]
             Boundary conditions for time depending problems will be considered
-            dynamic for each time step.
+            dynamic for each time step. Without Robin conditions, the system
+            matrix is only factorized once per time step length and the
+            Dirichlet values are applied to the right-hand side.
         stats: bool
             Give some statistics.
         progress: bool
@@ -2508,6 +2512,15 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
         if debug:
             print("u0", swatch.duration())
 
+        # The system matrix only depends on dt unless Robin conditions are
+        # assembled into it. Dirichlet conditions are then eliminated once
+        # per dt and applied to the rhs only, so the factorization is reused.
+        reuse = 'Robin' not in bc and dof == mesh.nodeCount() and \
+            not isComplex
+        solver = None
+        dirIdx = None
+        nFactorize = 0
+
         measure = 0.
         for n in range(1, len(times)):
             swatch.reset()
@@ -2535,16 +2548,38 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
 
             measure += swatch.duration()
 
-            A = M + S * dt * theta
-
-            assembleBC(bc, mesh, A, br, time=times[n], userData=userData)
+            if reuse:
+                # Neumann values and Dirichlet values (without elimination)
+                dMap = assembleBC(bc, mesh, None, br, time=times[n],
+                                  userData=userData)
+                idx = np.array(sorted(dMap.keys()), dtype=int)
+                if solver is None or abs(dt - solverDt) > 1e-12 * dt or \
+                        not np.array_equal(idx, dirIdx):
+                    A0 = M + S * dt * theta
+                    A = pg.matrix.SparseMatrix(A0)
+                    if len(idx) > 0:
+                        applyDirichlet(A, None, idx, np.zeros(len(idx)))
+
+                    solver = pg.core.LinSolver(A, verbose)
+                    solverDt, dirIdx = dt, idx
+                    nFactorize += 1
+
+                if len(idx) > 0:
+                    uDir = np.zeros(dof)
+                    uDir[idx] = [dMap[i] for i in idx]
+                    br -= A0 * uDir
+                    br[idx] = uDir[idx]
+            else:
+                A = M + S * dt * theta
+                assembleBC(bc, mesh, A, br, time=times[n], userData=userData)
+                solver = pg.core.LinSolver(A, verbose)
+                nFactorize += 1
 
             if 'assembleOnly' in kwargs:
                 return A, br
 
             # u = S/b
             t_prep = swatch.duration(True)
-            solver = pg.core.LinSolver(A, verbose)
             solver.solve(br, u)
 
             if 'plotTimeStep' in kwargs:
@@ -2559,6 +2594,7 @@ def solveFiniteElements(mesh, a=1.0, b=None, f=0.0, bc=None,
         if debug:
             print("Measure(" + str(len(times)) + "): ",
                   measure, measure / len(times))
+            print("Factorizations:", nFactorize)
         return U
 
 
@@ -2600,7 +2636,7 @@ def checkCFL(times, mesh, vMax, verbose=False):
 
 def crankNicolson(times, S, I, f=None,
                   u0=None, theta=1.0, dirichlet=None,
-                  solver=None, progress=None):
+                  solver=None, progress=None, adaptive=False, **kwargs):
     """Generic Crank Nicolson solver for time dependend problems.
 
     Limitations so far:
@@ -2633,12 +2669,26 @@ def crankNicolson(times, S, I, f=None,
         Provide a pre configured solver if you want some special.
     progress: Progress [None]
         Provide progress object if you want to see some.
+    adaptive: bool [False]
+        Choose the internal time steps by step doubling error control and
+        interpolate the solution to the requested times.
+        See :py:func:`crankNicolsonAdaptive` for additional keyword arguments,
+        which are rejected without adaptive=True.
 
     Returns
     -------
     np.ndarray:
         Solution for each time steps
     """
+    if adaptive is True:
+        return crankNicolsonAdaptive(times, S, I, f=f, u0=u0, theta=theta,
+                                     dirichlet=dirichlet, solver=solver,
+                                     progress=progress, **kwargs)
+
+    if len(kwargs) > 0:
+        pg.critical("Unknown arguments (adaptive time stepping only?):",
+                    *kwargs)
+
     if len(times) < 2:
         raise BaseException("We need at least 2 times for "
                             "Crank-Nicolsen time discretization." +
@@ -2723,6 +2773,188 @@ def crankNicolson(times, S, I, f=None,
     return u
 
 
+def crankNicolsonAdaptive(times, S, I, f=None, u0=None, theta=0.5,
+                          dirichlet=None, solver=None, dt=None,
+                          rtol=1e-4, atol=1e-8, dtMin=None, dtMax=None,
+                          maxSteps=100000, stats=None, progress=None):
+    """Adaptive theta time stepping with step doubling error control.
+
+    Every step of size h is compared with two steps of size h/2.
+    The difference serves as local error estimate, the step is accepted if
+    the scaled error is below 1 and the more accurate two half steps are
+    kept.
+    To share factorizations between steps, the step sizes are restricted to
+    a ladder dt * 2^k. Each factorized system matrix is cached by its level
+    k, so every distinct step size is factorized only once.
+    The solution for the requested times is linearly interpolated from
+    the accepted steps. The last step may exceed the final time.
+
+    Args
+    ----
+    times: iterable(float)
+        Times for the returned solution. Give at least 2.
+    S: Matrix
+        Systemmatrix holds your discrete equations and boundary conditions
+    I: Matrix
+        Identity matrix (FD, FV) or Masselementmatrix (FE)
+    f: iterable(float) | callable [None]
+        External forces. Either constant, one vector for every time in
+        times (linearly interpolated) or a callable f(t).
+    u0: iterable [None]
+        Starting condition. zero if not given
+    theta: float [0.5]
+        Implicitness of the time discretization, 0.5 (Crank-Nicolson) is of
+        second order, all others are of first order.
+    dirichlet: dirichlet generator
+        Genertor object to applay dirichlet boundary conditions
+    solver: LinSolver [None]
+        Preconfigured solver. Its solver type is used for all cached
+        factorizations.
+    dt: float [None]
+        Initial and base step size. Default is 1/100 of the time range.
+    rtol: float [1e-4]
+        Relative error tolerance per step.
+    atol: float [1e-8]
+        Absolute error tolerance per step.
+    dtMin: float [None]
+        Smallest allowed step size. Default is dt * 2^-20.
+    dtMax: float [None]
+        Largest allowed step size. Default is the time range.
+    maxSteps: int [100000]
+        Maximum number of attempted steps.
+    stats: dict [None]
+        Filled with the step statistics if given: 'times' (accepted),
+        'nSteps', 'nRejected', 'nFactorize' and 'dts' (used step sizes).
+    progress: Progress [None]
+        Provide progress object if you want to see some. It is updated
+        with the index of the last requested time reached.
+
+    Returns
+    -------
+    np.ndarray:
+        Solution for each of the requested times
+    """
+    times = np.asarray(times, dtype=float)
+    if len(times) < 2:
+        pg.critical("We need at least 2 times for adaptive time stepping.",
+                    len(times))
+
+    t0, tEnd = times[0], times[-1]
+    if dt is None:
+        dt = (tEnd - t0) / 100.
+    if dtMax is None:
+        dtMax = tEnd - t0
+    if dtMin is None:
+        dtMin = dt * 2**-20
+
+    solverName = 'scipy'
+    if solver is not None:
+        solverName = solver.solver
+
+    dof = S.rows()
+
+    if f is None:
+        def _f(t):
+            return np.zeros(dof)
+    elif callable(f):
+        _f = f
+    else:
+        F = np.asarray(f, dtype=float)
+        if F.ndim == 2:
+            def _f(t):
+                return np.array([np.interp(t, times, Fi) for Fi in F.T])
+        else:
+            def _f(t):
+                return F
+
+    cache = {}
+
+    def _system(k):
+        if k not in cache:
+            h = dt * 2.**k
+            A = I + S * (h * theta)
+            if dirichlet is not None:
+                dirichlet.apply(A)
+            ls = pg.solver.LinSolver(solver=solverName)
+            ls.factorize(A)
+            cache[k] = (ls, I - S * (h * (1.0 - theta)))
+        return cache[k]
+
+    def _step(u, t, k):
+        h = dt * 2.**k
+        ls, St = _system(k)
+        b = St * u + h * ((1.0 - theta) * _f(t) + theta * _f(t + h))
+        if dirichlet is not None:
+            dirichlet.apply(b)
+        return np.asarray(ls(b))
+
+    p = 2 if abs(theta - 0.5) < 1e-12 else 1
+    errScale = 1.0 / (2**p - 1)
+    kMax = int(np.floor(np.log2(dtMax / dt) + 1e-12))
+    kMin = int(np.ceil(np.log2(dtMin / dt) - 1e-12))
+
+    u = np.zeros(dof)
+    if u0 is not None:
+        u[:] = u0
+
+    out = np.zeros((len(times), dof))
+    out[0] = u
+    iOut = 1
+    t = t0
+    k = min(0, kMax)
+    nSteps = 0
+    nRejected = 0
+    tAccepted = [t0]
+    dts = []
+
+    while iOut < len(times):
+        if nSteps + nRejected >= maxSteps:
+            pg.critical("Maximum number of time steps reached at t =", t)
+
+        h = dt * 2.**k
+        uFull = _step(u, t, k)
+        uHalf = _step(_step(u, t, k-1), t + h/2, k-1)
+
+        scale = atol + rtol * np.maximum(np.abs(u), np.abs(uHalf))
+        err = np.max(np.abs(uHalf - uFull) / scale) * errScale
+
+        if err > 1.0:
+            nRejected += 1
+            if k - 1 < kMin:
+                pg.critical("Step size falls below dtMin at t =", t)
+            k -= 1
+            continue
+
+        nSteps += 1
+        tNew = t + h
+        while iOut < len(times) and times[iOut] <= tNew + 1e-12 * h:
+            s = (times[iOut] - t) / h
+            out[iOut] = (1.0 - s) * u + s * uHalf
+            iOut += 1
+
+        if progress:
+            progress.update(iOut - 1, 'steps: {0} rejected: {1} '
+                            'dt: {2}'.format(nSteps, nRejected, pg.pf(h)))
+
+        u = uHalf
+        t = tNew
+        tAccepted.append(t)
+        dts.append(h)
+
+        # the error scales with h^(p+1), so double only with enough reserve
+        if err < 0.5**(p+1) and k < kMax:
+            k += 1
+
+    pg.debug("adaptive theta scheme: {0} steps, {1} rejected, "
+             "{2} factorizations".format(nSteps, nRejected, len(cache)))
+
+    if stats is not None:
+        stats.update({'times': np.array(tAccepted), 'dts': np.array(dts),
+                      'nSteps': nSteps, 'nRejected': nRejected,
+                      'nFactorize': len(cache)})
+    return out
+
+
 class RungeKutta(object):
     """TODO DOCUMENT ME"""
     rk4a = [0.0,
@@ -2762,6 +2994,112 @@ class RungeKutta(object):
 
         return self.u
 
+    def runAdaptive(self, u0, dt, tMax=1, times=None, rtol=1e-4, atol=1e-8,
+                    dtMin=None, maxSteps=100000):
+        """Run with step doubling error control.
+
+        Each step of size dt is compared with two steps of size dt/2 and the
+        step size is adapted to hold the scaled local error below 1.
+
+        Args
+        ----
+        u0: array
+            Starting condition.
+        dt: float
+            Initial step size.
+        tMax: float [1]
+            End time.
+        times: iterable(float) [None]
+            Return the solution for these times instead of the solution at
+            tMax. The steps are shortened to hit them exactly.
+        rtol: float [1e-4]
+            Relative error tolerance per step.
+        atol: float [1e-8]
+            Absolute error tolerance per step.
+        dtMin: float [None]
+            Smallest allowed step size. Default is dt * 1e-6.
+        maxSteps: int [100000]
+            Maximum number of attempted steps.
+
+        Returns
+        -------
+        array | np.ndarray
+            Solution at tMax or for each of the given times.
+            The accepted step sizes are stored in self.dts.
+        """
+        if isinstance(u0, list):
+            pg.critical("Adaptive stepping needs a single solution array.")
+
+        p = {1: 1, 3: 3, 4: 4, 5: 4}[self.order]
+        if dtMin is None:
+            dtMin = dt * 1e-6
+
+        self.start(u0, dt, tMax)
+        self.dts = []
+        h = dt
+
+        if times is not None:
+            times = np.asarray(times, dtype=float)
+            out = np.zeros((len(times),) + np.shape(u0))
+            iOut = 0
+            while iOut < len(times) and times[iOut] <= 0.0:
+                out[iOut] = self.u
+                iOut += 1
+
+        nAttempts = 0
+        while self.time < tMax * (1 - 1e-12):
+            nAttempts += 1
+            if nAttempts > maxSteps:
+                pg.critical("Maximum number of time steps reached at t =",
+                            self.time)
+
+            t, u = self.time, deepcopy(self.u)
+            tNext = tMax
+            if times is not None and iOut < len(times):
+                tNext = min(tNext, times[iOut])
+            hTrial = h
+            h = min(h, tNext - t)
+
+            self.dt = h
+            uFull = deepcopy(self.step())
+
+            self.time, self.u = t, deepcopy(u)
+            self.dt = h / 2
+            self.step()
+            self.dt = h / 2
+            uHalf = self.step()
+
+            scale = atol + rtol * np.maximum(np.abs(u), np.abs(uHalf))
+            err = np.max(np.abs(uHalf - uFull) / scale) / (2**p - 1)
+
+            if err > 1.0:
+                self.time, self.u = t, u
+                if h / 2 < dtMin:
+                    pg.critical("Step size falls below dtMin at t =", t)
+                h = max(0.2, 0.9 * err**(-1./(p+1))) * h
+                continue
+
+            self.time = t + h
+            self.dts.append(h)
+
+            if times is not None:
+                while iOut < len(times) and \
+                        times[iOut] <= self.time + 1e-12 * max(1.0, tMax):
+                    out[iOut] = self.u
+                    iOut += 1
+
+            # don't let steps shortened to hit an output time slow us down
+            h = max(h, hTrial)
+            h *= min(2.0, 0.9 * max(err, 1e-10)**(-1./(p+1)))
+
+        self.nSteps = len(self.dts)
+
+        if times is not None:
+            out[iOut:] = self.u
+            return out
+
+        return self.u
+
     def start(self, u0, dt, tMax=1):
         """TODO DOCUMENT_ME"""
         self.nSteps = int(np.ceil(tMax/dt))
@@ -8,27 +8,157 @@ import pygimli as pg
 from pygimli.solver import identity  # , parseArgToArray, parseArgToBoundaries
 
 
+class FaceGeometry(object):
+    """Face connectivity and geometry of a mesh for finite volumes.
+
+    Collected once per mesh (see :py:func:`faceGeometry`) so that flux
+    assembly can be vectorized over all faces.
+
+    Attributes
+    ----------
+    left, right: ndarray(nBoundaries) of int
+        Cell index on both sides of every boundary, -1 if there is none.
+    norm: ndarray(nBoundaries, 3)
+        Outer normal vectors of the boundaries with respect to the left cell.
+    size: ndarray(nBoundaries)
+        Boundary sizes (length or area).
+    dLeft, dRight: ndarray(nBoundaries)
+        Distance between boundary center and left/right cell center,
+        0 if there is no such cell.
+    dCells: ndarray(nBoundaries)
+        Distance between left and right cell center (interior boundaries).
+    nodes: ndarray(nBoundaries, nMax) of int
+        Node indices of every boundary, padded with -1.
+    cell, neighbor, face: ndarray(nHalfFaces) of int
+        One half face per cell and cell boundary, i.e., two for interior
+        and one for outer boundaries. neighbor is -1 for outer boundaries.
+    sign: ndarray(nHalfFaces)
+        1 if cell is the left cell of face, -1 otherwise.
+    dCell, dNeighbor: ndarray(nHalfFaces)
+        Distance between face center and cell/neighbor center.
+    """
+
+    def __init__(self, mesh):
+        nB = mesh.boundaryCount()
+        self.left = np.full(nB, -1, dtype=int)
+        self.right = np.full(nB, -1, dtype=int)
+        self.norm = np.zeros((nB, 3))
+        ids = []
+        for b in mesh.boundaries():
+            i = b.id()
+            if b.leftCell() is not None:
+                self.left[i] = b.leftCell().id()
+            if b.rightCell() is not None:
+                self.right[i] = b.rightCell().id()
+            self.norm[i] = b.norm()
+            ids.append(b.ids())
+
+        self.nodes = np.full((nB, max([len(i) for i in ids] + [1])), -1,
+                             dtype=int)
+        for i, nIds in enumerate(ids):
+            self.nodes[i, :len(nIds)] = nIds
+
+        self.size = np.array(mesh.boundarySizes())
+        self.cellSize = np.array(mesh.cellSizes())
+        bc = np.array(mesh.boundaryCenters())
+        cc = np.array(mesh.cellCenters())
+
+        hasL, hasR = self.left > -1, self.right > -1
+        self.dLeft = np.zeros(nB)
+        self.dRight = np.zeros(nB)
+        self.dLeft[hasL] = np.linalg.norm(bc[hasL] - cc[self.left[hasL]],
+                                          axis=1)
+        self.dRight[hasR] = np.linalg.norm(bc[hasR] - cc[self.right[hasR]],
+                                           axis=1)
+        self.dCells = np.zeros(nB)
+        both = hasL & hasR
+        self.dCells[both] = np.linalg.norm(cc[self.left[both]] -
+                                           cc[self.right[both]], axis=1)
+
+        # half faces: (left, right) for every boundary with a left cell and
+        # (right, left) for every boundary with a right cell
+        fL, fR = np.nonzero(hasL)[0], np.nonzero(hasR)[0]
+        self.face = np.concatenate([fL, fR])
+        self.cell = np.concatenate([self.left[fL], self.right[fR]])
+        self.neighbor = np.concatenate([self.right[fL], self.left[fR]])
+        self.sign = np.concatenate([np.ones(len(fL)), -np.ones(len(fR))])
+        self.dCell = np.concatenate([self.dLeft[fL], self.dRight[fR]])
+        self.dNeighbor = np.concatenate([self.dRight[fL], self.dLeft[fR]])
+
+        # outer normal must point away from the cell center
+        n = self.norm[self.face] * self.sign[:, None]
+        flip = np.sum((bc[self.face] - cc[self.cell]) * n, axis=1) < 0
+        self.sign[flip] *= -1
+
+        self._pattern = None
+
+    def pattern(self, dof):
+        """Sparsity pattern of the finite volume system matrix.
+
+        Returns
+        -------
+        rows, cols: ndarray of int
+            Unique matrix positions, all diagonal entries first.
+        offDiag: ndarray(nHalfFaces) of int
+            Position of the (cell, neighbor) entry of every half face, -1
+            for outer boundaries.
+        """
+        if self._pattern is None or self._pattern[0] != dof:
+            inner = self.neighbor > -1
+            key = self.cell[inner] * dof + self.neighbor[inner]
+            uKey, inv = np.unique(key, return_inverse=True)
+            rows = np.concatenate([np.arange(dof), uKey // dof])
+            cols = np.concatenate([np.arange(dof), uKey % dof])
+            offDiag = np.full(len(self.cell), -1, dtype=int)
+            offDiag[inner] = dof + inv
+            self._pattern = (dof, rows, cols, offDiag)
+
+        return self._pattern[1:]
+
+    def nodeToFace(self, v):
+        """Mean of node based values (nNodes, ...) for every boundary."""
+        v = np.asarray(v)
+        valid = self.nodes > -1
+        vals = v[np.where(valid, self.nodes, 0)]
+        vals *= valid.reshape(valid.shape + (1,) * (v.ndim - 1))
+        return vals.sum(axis=1) / valid.sum(axis=1).reshape(
+            (-1,) + (1,) * (v.ndim - 1))
+
+
+def faceGeometry(mesh):
+    """Return the (cached) :py:class:`FaceGeometry` of mesh.
+
+    The face geometry is stored at the mesh and only recomputed if the
+    mesh has changed.
+    """
+    if hasattr(mesh, '_faceGeometry'):
+        if hash(mesh) == mesh._faceGeometry[0]:
+            return mesh._faceGeometry[1]
+
+    geom = FaceGeometry(mesh)
+    mesh._faceGeometry = (hash(mesh), geom)
+    return geom
+
+
 def cellDataToBoundaryData(mesh, v):
-    """TODO Documentme."""
+    """Interpolate cell data to boundaries by distance weighted mean."""
     if len(v) != mesh.cellCount():
         raise Exception("len(v) != mesh.cellCount():", len(v),
                         mesh.cellCount())
-    return np.array([cellToFace(b, v) for b in mesh.boundaries()])
+    return cellDataToBoundaryDataMatrix(mesh) * pg.Vector(v)
+
 
 def boundaryNormals(mesh):
     """Collect all boundary outer normal vectors."""
-    # implement with    return mesh.boundaryNorms()
-    gB = np.zeros((mesh.boundaryCount(), 3))
+    return faceGeometry(mesh).norm.copy()
 
-    for b in mesh.boundaries():
-        gB[b.id()] = b.norm()
-
-    return gB
 
 def _boundaryToCellDistances(mesh):
-    """TODO Documentme."""
-    d = [_boundaryToCellDistancesBound(b) for b in mesh.boundaries()]
-    return np.array(d)
+    """Sum of the distances from boundary center to adjacent cell
+    centers."""
+    geom = faceGeometry(mesh)
+    return geom.dLeft + geom.dRight
+
 
 def _boundaryToCellDistancesBound(b):
     """TODO Documentme."""
@@ -149,12 +279,22 @@ def cellToFaceArithmetic(boundary, AMM):
 
 
 def cellDataToBoundaryDataMatrix(mesh):
-    """TODO Documentme."""
-    AMM = pg.matrix.SparseMapMatrix(mesh.boundaryCount(), mesh.cellCount())
-
-    for b in mesh.boundaries():
-        cellToFaceArithmetic(b, AMM)
+    """Sparse matrix interpolating cell data to boundaries.
 
+    Distance weighted arithmetic mean of both adjacent cells, see
+    :py:func:`cellToFaceArithmetic`.
+    """
+    geom = faceGeometry(mesh)
+    fIds = np.arange(mesh.boundaryCount())
+    both = (geom.left > -1) & (geom.right > -1)
+    d12 = geom.dLeft[both] + geom.dRight[both]
+    single = np.where(geom.left > -1, geom.left, geom.right)
+    rows = np.concatenate([fIds[~both], fIds[both], fIds[both]])
+    cols = np.concatenate([single[~both], geom.left[both], geom.right[both]])
+    vals = np.concatenate([np.ones(np.sum(~both)),
+                           geom.dRight[both] / d12, geom.dLeft[both] / d12])
+    AMM = pg.matrix.SparseMapMatrix(rows, cols, vals)
+    AMM.resize(mesh.boundaryCount(), mesh.cellCount())
     return AMM
 
 
@@ -297,6 +437,78 @@ def findDiffusion(mesh, a, b, c, nc=None):
     return D
 
 
+def _exponentialScheme(peclet):
+    """Weights of the exponential scheme, 1 for vanishing Peclet number."""
+    ret = np.ones_like(peclet)
+    nz = peclet != 0.0
+    ret[nz] = peclet[nz] / (np.exp(np.abs(peclet[nz])) - 1.0)
+    return ret
+
+
+# weighting functions A(|Peclet|) of the finite volume schemes
+_SCHEMES = {
+    'CDS': lambda peclet: 1.0 - 0.5 * np.abs(peclet),
+    'UDS': lambda peclet: np.ones_like(peclet),
+    'HS': lambda peclet: np.maximum(0.0, 1.0 - 0.5 * np.abs(peclet)),
+    'PS': lambda peclet: np.maximum(0.0, (1.0 - 0.1 * np.abs(peclet))**5.0),
+    'ES': _exponentialScheme,
+}
+
+
+def _faceVelocity(mesh, geom, vel):
+    """Velocity vectors (nHalfFaces, 3) of all half faces.
+
+    Vectorized version of :py:func:`findVelocity`.
+    """
+    if not hasattr(vel, '__len__'):
+        return np.zeros((len(geom.cell), 3))
+
+    v = np.asarray(vel, dtype=float)
+    if v.ndim == 1:
+        v = v.reshape(-1, 1)
+    v = np.hstack([v, np.zeros((len(v), 3 - v.shape[1]))])
+
+    if len(v) == mesh.cellCount():
+        # mean cell based vector-field of cell and neighbor cell
+        nc = np.where(geom.neighbor > -1, geom.neighbor, geom.cell)
+        return (v[geom.cell] + v[nc]) / 2.0
+    elif len(v) == mesh.boundaryCount():
+        return v[geom.face]
+
+    # node based vector-field at the boundary centers
+    return geom.nodeToFace(v)[geom.face]
+
+
+def _faceDiffusion(mesh, geom, a):
+    """Diffusion coefficients D of all half faces.
+
+    Vectorized version of :py:func:`findDiffusion`.
+    """
+    if not hasattr(a, '__len__'):
+        a = np.full(mesh.cellCount(), float(a))
+    a = np.asarray(a, dtype=float)
+
+    c, nc, f = geom.cell, geom.neighbor, geom.face
+    inner = nc > -1
+    size = geom.size[f]
+    D = np.zeros(len(c))
+
+    if len(a) == mesh.boundaryCount():
+        D[inner] = a[f[inner]] / geom.dCells[f[inner]] * size[inner]
+        D[~inner] = a[f[~inner]] / geom.dCell[~inner] * size[~inner]
+    else:
+        # Interface harmonic median
+        aC = a[c[inner]]
+        aN = a[nc[inner]]
+        Di = np.zeros(len(aC))
+        ok = (aC > 0) & (aN > 0)
+        Di[ok] = size[inner][ok] / (geom.dCell[inner][ok] / aC[ok] +
+                                    geom.dNeighbor[inner][ok] / aN[ok])
+        D[inner] = Di
+        D[~inner] = a[c[~inner]] / geom.dCell[~inner] * size[~inner]
+    return D
+
+
 def diffusionConvectionKernel(mesh, a=None, b=0.0,
                               uB=None, duB=None,
                               vel=0,
@@ -309,6 +521,11 @@ def diffusionConvectionKernel(mesh, a=None, b=0.0,
 
     Particle concentration u inside a velocity field.
 
+    The fluxes of all faces are computed at once from the face geometry of
+    the mesh (see :py:func:`faceGeometry`), which is collected only once per
+    mesh. Repeated calls, e.g., for changing velocity fields, only
+    reassemble the matrix values.
+
     Peclet Number - ratio between convection/diffusion = F/D
         F = velocity flow trough volume boundary,
         D = diffusion coefficient
@@ -325,8 +542,8 @@ def diffusionConvectionKernel(mesh, a=None, b=0.0,
         TODO What is fn
     vel: ndarray (N,dim) | RMatrix(N,dim)
         velocity field [[v_i,]_j,] with i=[1..3] for the mesh dimension
-        and j = [0 .. N-1] per Cell or per Node so N is either
-        mesh.cellCount() or mesh.nodeCount()
+        and j = [0 .. N-1] per Cell, per Boundary or per Node so N is either
+        mesh.cellCount(), mesh.boundaryCount() or mesh.nodeCount()
     scheme: str [CDS]
         Finite volume scheme
         * CDS -- Central Difference Scheme.
@@ -353,23 +570,10 @@ def diffusionConvectionKernel(mesh, a=None, b=0.0,
     if a is None:
         a = pg.Vector(mesh.boundaryCount(), 1.0)
 
-    AScheme = None
-    if scheme == 'CDS':
-        AScheme = lambda peclet_: 1.0 - 0.5 * abs(peclet_)
-    elif scheme == 'UDS':
-        AScheme = lambda peclet_: 1.0
-    elif scheme == 'HS':
-        AScheme = lambda peclet_: max(0.0, 1.0 - 0.5 * abs(peclet_))
-    elif scheme == 'PS':
-        AScheme = lambda peclet_: max(0.0, (1.0 - 0.1 * abs(peclet_))**5.0)
-    elif scheme == 'ES':
-        AScheme = lambda peclet_: (peclet_) / (np.exp(abs(peclet_)) - 1.0) \
-            if peclet_ != 0.0 else 1
-    else:
+    if scheme not in _SCHEMES:
         raise BaseException("Scheme unknwon:" + scheme)
 
-    useHalfBoundaries = False
-
+    geom = faceGeometry(mesh)
     dof = mesh.cellCount()
 
     if not uB:
@@ -377,126 +581,87 @@ def diffusionConvectionKernel(mesh, a=None, b=0.0,
     if not duB:
         duB = []
 
-    if useHalfBoundaries:
-        dof = mesh.cellCount() + len(uB)
-
-    S = None
-    if sparse:
-        S = pg.matrix.SparseMapMatrix(dof, dof, stype=0) + identity(dof, scale=b)
-    else:
-        S = np.zeros((dof, dof))
-
-    rhsBoundaryScales = np.zeros(dof)
-
     # we need this to fast identify uBoundary and value by boundary
-    uBoundaryID = []
-    uBoundaryVals = [None] * mesh.boundaryCount()
+    uBoundaryVals = {}
 
-    for [b, val] in uB:
+    for [bound, val] in uB:
 
-        if isinstance(b, pg.core.Boundary):
-            uBoundaryID.append(b.id())
-            uBoundaryVals[b.id()] = val
-        elif isinstance(b, pg.core.Node):
-            for _b in b.boundSet():
+        if isinstance(bound, pg.core.Boundary):
+            uBoundaryVals[bound.id()] = (bound, val)
+        elif isinstance(bound, pg.core.Node):
+            for _b in bound.boundSet():
                 if _b.rightCell() is None:
                     pg.warn('Dirichlet for one node considered for the nearest boundary.', _b.id())
-                    uBoundaryID.append(_b.id())
-                    uBoundaryVals[_b.id()] = val
+                    uBoundaryVals[_b.id()] = (_b, val)
                     break
         else:
             raise BaseException("Please give boundary, value list")
 
-
-    duBoundaryID = []
-    duBoundaryVals = [None] * mesh.boundaryCount()
+    duBoundaryVals = {}
 
     for [boundary, val] in duB:
         if not isinstance(boundary, pg.core.Boundary):
             raise BaseException("Please give boundary, value list")
 
-        duBoundaryID.append(boundary.id())
-        duBoundaryVals[boundary.id()] = val
+        duBoundaryVals[boundary.id()] = (boundary, val)
 
-    # iterate over all cells
-    for cell in mesh.cells():
-        cID = cell.id()
-        for bi in range(cell.boundaryCount()):
-            boundary = pg.core.findBoundary(cell.boundaryNodes(bi))
+    # flux weights of all half faces at once
+    c, nc, f = geom.cell, geom.neighbor, geom.face
+    inner = nc > -1
+    v = _faceVelocity(mesh, geom, vel)
 
-            ncell = boundary.leftCell()
-            if ncell == cell:
-                ncell = boundary.rightCell()
+    # Convection part
+    F = np.sum(geom.norm[f] * geom.sign[:, None] * v, axis=1) * geom.size[f]
+    # Diffusion part
+    D = _faceDiffusion(mesh, geom, a)
 
-            v = findVelocity(mesh, vel, boundary, cell, ncell)
+    aB = np.maximum(-F, 0.0)
+    pos = D > 0
+    aB[pos] += D[pos] * _SCHEMES[scheme](F[pos] / D[pos])
+    aB /= geom.cellSize[c]
 
-            # Convection part
-            F = boundary.norm(cell).dot(v) * boundary.size()
-            # print(F, boundary.size(), v, vel)
-            # Diffusion part
-            D = findDiffusion(mesh, a, boundary, cell, ncell)
-
-            # print(F, D, F/D)
-            # print((1.0 - 0.1 * abs(F/D))**5.0)
-            if D > 0:
-                aB = D * AScheme(F / D) + max(-F, 0.0)
-            else:
-                aB = max(-F, 0.0)
+    diag = np.bincount(c[inner], weights=aB[inner], minlength=dof)
+    rhsBoundaryScales = np.zeros(dof)
 
-            aB /= cell.size()
+    # outer half faces by boundary id
+    outer = np.full(mesh.boundaryCount(), -1, dtype=int)
+    outer[f[~inner]] = np.nonzero(~inner)[0]
+
+    for bID, (boundary, val) in uBoundaryVals.items():
+        h = outer[bID]
+        if h < 0:
+            continue
+        val = pg.solver.generateBoundaryValue(boundary, val, time=time,
+                                              userData=userData)
+        diag[c[h]] += aB[h]
+        rhsBoundaryScales[c[h]] += aB[h] * np.mean(val)
+
+    for bID, (boundary, val) in duBoundaryVals.items():
+        h = outer[bID]
+        if h < 0:
+            continue
+        # Neumann boundary condition
+        val = np.mean(pg.solver.generateBoundaryValue(boundary, val,
+                                                      time=time,
+                                                      userData=userData))
+        # amount of flow through the boundary .. maybe buggy
+        # fill be replaced by suitable FE solver
+        diag[c[h]] -= val * geom.size[bID] / geom.cellSize[c[h]]
+
+    if fn is not None:
+        diag -= np.asarray(fn, dtype=float)
+
+    rows, cols, offDiag = geom.pattern(dof)
+    vals = np.bincount(offDiag[inner], weights=-aB[inner],
+                       minlength=len(rows))
+    vals[:dof] += diag
 
-            # print(cell.center(), boundary.center(), boundary.norm(cell), aB)
-            if ncell:
-                # no boundary
-                if sparse:
-                    S.addVal(cID, ncell.id(), -aB)
-                    S.addVal(cID, cID, +aB)
-                else:
-                    S[cID, ncell.id()] -= aB
-                    S[cID, cID] += aB
-
-            elif not useHalfBoundaries:
-
-                if boundary.id() in uBoundaryID:
-                    val = pg.solver.generateBoundaryValue(boundary,
-                                                uBoundaryVals[boundary.id()],
-                                                time=time,
-                                                userData=userData)
-
-                    if sparse:
-                        S.addVal(cID, cID, aB)
-                    else:
-                        S[cID, cID] += aB
-
-                    #print(aB, uBoundaryVals[boundary.id()])
-                    rhsBoundaryScales[cID] += aB * np.mean(val)
-
-                if boundary.id() in duBoundaryID:
-                    # Neumann boundary condition
-                    val = pg.solver.generateBoundaryValue(
-                        boundary,
-                        duBoundaryVals[boundary.id()],
-                        time=time,
-                        userData=userData)
-
-                    val = np.mean(val)
-
-                    # amount of flow through the boundary .. maybe buggy
-                    # fill be replaced by suitable FE solver
-                    outflow = -val * boundary.size() / cell.size()
-
-                    if sparse:
-                        S.addVal(cID, cID, outflow)
-                    else:
-                        S[cID, cID] += outflow
-
-        if fn is not None:
-            if sparse:
-                # * cell.shape().domainSize())
-                S.addVal(cell.id(), cell.id(), -fn[cell.id()])
-            else:
-                # * cell.shape().domainSize()
-                S[cell.id(), cell.id()] -= fn[cell.id()]
+    if sparse:
+        vals[:dof] += np.asarray(b, dtype=float)
+        S = pg.matrix.SparseMapMatrix(rows, cols, vals)
+    else:
+        S = np.zeros((dof, dof))
+        S[rows, cols] = vals
 
     return S, rhsBoundaryScales
 
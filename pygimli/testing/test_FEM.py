@@ -365,6 +365,98 @@ class TestFiniteElementBasics(unittest.TestCase):
             pg.plt.legend()
 
 
+    def test_TimeDependent(self):
+        """Dynamic boundary conditions with reused factorization."""
+        mesh = pg.createGrid(x=np.linspace(0, 1, 21), y=np.linspace(0, 1, 5))
+        times = np.linspace(0, 0.05, 11)
+        bc = {'Dirichlet': {1: lambda b, time: np.sin(time*30), 2: 0.0},
+              'Neumann': {3: 1.0}}
+        u = pg.solver.solveFiniteElements(mesh, a=1.0, f=1.0, bc=bc,
+                                          times=times, theta=0.5,
+                                          dynamic=True)
+
+        # reference: assemble and factorize in every time step
+        S = pg.solver.createStiffnessMatrix(mesh, pg.Vector(
+            mesh.cellCount(), 1.0))
+        M = pg.solver.createMassMatrix(mesh)
+        F = pg.solver.createLoadVector(mesh, 1.0)
+        uRef = np.zeros_like(u)
+        for n in range(1, len(times)):
+            dt = times[n] - times[n-1]
+            br = (M + S*(-dt * 0.5)) * uRef[n-1] + dt * F
+            A = M + S * dt * 0.5
+            pg.solver.assembleBC(bc, mesh, A, br, time=times[n])
+            uRef[n] = pg.solver.linSolve(A, br)
+
+        np.testing.assert_allclose(u, uRef, atol=1e-10)
+
+    def test_TimeAdaptive(self):
+        """Adaptive time stepping with cached factorizations."""
+        mesh = pg.createGrid(x=np.linspace(0, 1, 41))
+        S = pg.solver.createStiffnessMatrix(mesh, pg.Vector(
+            mesh.cellCount(), 1.0))
+        M = pg.solver.createMassMatrix(mesh)
+        u0 = np.exp(-((pg.x(mesh) - 0.5) / 0.05)**2)
+        times = np.linspace(0, 0.1, 11)
+
+        stats = {}
+        u = pg.solver.crankNicolson(times, S, M, u0=u0, theta=0.5,
+                                    adaptive=True, dt=1e-3, rtol=1e-5,
+                                    atol=1e-7, stats=stats)
+        uRef = pg.solver.crankNicolson(np.linspace(0, 0.1, 10001), S, M,
+                                       u0=u0, theta=0.5)[::1000]
+        np.testing.assert_allclose(u, uRef, atol=1e-4)
+        self.assertLess(stats['nFactorize'], stats['nSteps'] / 5)
+        self.assertEqual(len(set(stats['dts'])) + 1, stats['nFactorize'])
+
+        # adaptive-only arguments are not silently ignored
+        with self.assertRaises(Exception):
+            pg.solver.crankNicolson(times, S, M, u0=u0, theta=0.5, rtol=1e-5)
+
+        class Decay(object):
+            def explicitRHS(self, u, t):
+                return -u
+
+        rk = pg.solver.RungeKutta(Decay())
+        ts = [0.5, 1.0, 2.0]
+        u = rk.runAdaptive(np.ones(2), 0.1, tMax=2.0, times=ts, rtol=1e-6)
+        np.testing.assert_allclose(u[:, 0], np.exp(-np.array(ts)), rtol=1e-5)
+        self.assertLess(len(rk.dts), 20)
+
+    def test_FiniteVolume(self):
+        """Vectorized finite volume kernel."""
+        from pygimli.solver.solverFiniteVolume import (
+            diffusionConvectionKernel, faceGeometry)
+
+        mesh = pg.createGrid(x=np.linspace(0, 1, 11),
+                             y=np.linspace(0, 0.5, 6))
+        geom = faceGeometry(mesh)
+        self.assertIs(geom, faceGeometry(mesh))  # cached at the mesh
+        self.assertEqual(len(geom.cell), 4 * mesh.cellCount())
+
+        u = pg.solver.solveFiniteVolume(mesh, a=1.0,
+                                        bc={'Dirichlet': {1: 1.0, 2: 0.0}})
+        np.testing.assert_allclose(u, 1.0 - pg.x(mesh.cellCenters()),
+                                   atol=1e-10)
+
+        S, _ = diffusionConvectionKernel(mesh, a=np.ones(mesh.cellCount()))
+        S = pg.utils.sparseMatrix2Dense(S)
+        np.testing.assert_allclose(S * np.reshape(mesh.cellSizes(), [-1, 1]),
+                                   (S * np.reshape(mesh.cellSizes(),
+                                                   [-1, 1])).T, atol=1e-12)
+        np.testing.assert_allclose(S.sum(axis=1), 0, atol=1e-12)
+
+        # uniform velocity per cell or per boundary gives the same matrix
+        vC = np.tile([1.0, 0.5], (mesh.cellCount(), 1))
+        vB = np.tile([1.0, 0.5], (mesh.boundaryCount(), 1))
+        for scheme in ['CDS', 'UDS', 'HS', 'PS', 'ES']:
+            SC, _ = diffusionConvectionKernel(mesh, a=np.ones(
+                mesh.cellCount()), vel=vC, scheme=scheme)
+            SB, _ = diffusionConvectionKernel(mesh, a=np.ones(
+                mesh.cellCount()), vel=vB, scheme=scheme)
+            np.testing.assert_allclose(pg.utils.sparseMatrix2Dense(SC),
+                                       pg.utils.sparseMatrix2Dense(SB))
+
     def testElementMatrix(self):
         a = pg.core.ElementMatrix()
 
@@ -45,6 +45,21 @@ class ModellingMT(pg.core.ModellingBase):
         return par * 2.0
 
 
+class PoolFOP(object):
+    """Picklable dummy operator for the worker pool."""
+    def setThreadCount(self, n):
+        pass
+
+    def response_mt(self, par, i=0):
+        return np.concatenate([par**2, [np.sum(par)]])
+
+
+class DataFOP(pg.frameworks.Modelling):
+    """Dummy operator whose response depends on its data."""
+    def response(self, model):
+        return np.asarray(model) * self.data
+
+
 class TestFOP(unittest.TestCase):
 
     def test_FOP(self):
@@ -108,6 +123,124 @@ class TestFOP(unittest.TestCase):
         # np.testing.assert_array_equal(J1 * 2.0, J2)
         #######  temporary deactivated  -- test me
 
+    def test_workerPool(self):
+        """Persistent worker pool for Jacobian and multiple responses."""
+        from pygimli.core.workerpool import ModellingPool
+
+        fop = PoolFOP()
+        m = np.arange(1., 8.)
+        resp = fop.response_mt(m)
+        ms = np.array([m * 2, m * 3, m * 4])
+
+        for method in ['fork', 'spawn']:
+            pool = ModellingPool(fop, 2, method=method)
+            try:
+                J = pool.jacobian(m, resp, fak=1.05, chunkSize=2)
+                for i in range(len(m)):
+                    mc = np.array(m)
+                    mc[i] *= 1.05
+                    np.testing.assert_allclose(
+                        J[i], (fop.response_mt(mc) - resp) / (mc[i] - m[i]))
+
+                # second call reuses the running workers
+                R = pool.responses(ms, len(resp))
+                np.testing.assert_allclose(
+                    R, [fop.response_mt(mi) for mi in ms])
+                self.assertTrue(pool.alive)
+            finally:
+                pool.close()
+            self.assertFalse(pool.alive)
+
+    def test_workerPoolUpdate(self):
+        """Changing the operator restarts its worker pool."""
+        from pygimli.core.parallel import workerCount
+        from pygimli.frameworks.linesearch import responses
+
+        if workerCount(2) < 2:
+            self.skipTest("needs two CPUs")
+
+        fop = DataFOP()
+        fop.setData(np.ones(3))
+        models = [np.arange(3.) + i for i in range(4)]
+        np.testing.assert_allclose(responses(fop, models, nWorkers=2),
+                                   models)
+        self.assertTrue(fop._workerPool.alive)
+
+        fop.setData(np.full(3, 2.))
+        self.assertIsNone(fop._workerPool)
+        np.testing.assert_allclose(responses(fop, models, nWorkers=2),
+                                   np.array(models) * 2)
+        fop.closeWorkerPool()
+
+    def test_batchResponse(self):
+        """Batch responses of 1D soundings equal the single responses."""
+        from pygimli.physics.ves import VESModelling
+        from pygimli.physics.em import VMDTimeDomainModelling
+        from pygimli.physics.em.hemmodelling import HEMmodelling
+
+        models = np.array([[2., 10., 100., 5., 30.],
+                           [5., 20., 30., 300., 10.],
+                           [1., 3., 10., 50., 200.]])
+        ab2 = np.logspace(0, 2, 15)
+        fops = [VESModelling(ab2=ab2, mn2=ab2/3) for _ in models]
+        fops[1] = VESModelling(ab2=ab2*1.5, mn2=ab2/3)
+        resp = fops[0].batchResponse(models, fops)
+        for i, f in enumerate(fops):
+            np.testing.assert_allclose(resp[i], f.response(models[i]),
+                                       rtol=1e-10)
+
+        # batch and single responses are the same forward operator
+        fop = fops[0]
+        np.testing.assert_allclose(fop.batchResponse(models),
+                                   [fop.response(m) for m in models],
+                                   rtol=1e-10)
+        halfspaces = np.array([[10.], [100.]])
+        np.testing.assert_allclose(fop.batchResponse(halfspaces),
+                                   [fop.response(m) for m in halfspaces],
+                                   rtol=1e-10)
+
+        fops = [HEMmodelling(3, h, f=[400, 1800, 8000], r=7.9)
+                for h in [30, 40, 50]]
+        resp = fops[0].batchResponse(models, fops)
+        for i, f in enumerate(fops):
+            np.testing.assert_allclose(resp[i], f.response(models[i]),
+                                       rtol=1e-10)
+
+        fop = VMDTimeDomainModelling(times=np.logspace(-5, -3, 10),
+                                     txArea=100.0, nLayers=3)
+        resp = fop.batchResponse(models)
+        for i, m in enumerate(models):
+            np.testing.assert_allclose(resp[i], fop.response(m), rtol=1e-8)
+
+    def test_LCModelling(self):
+        """Batched LCI response and sparse Jacobian."""
+        from pygimli.physics.ves import VESModelling
+
+        nS = 5
+        ab2 = np.logspace(0, 2, 12)
+        data = [np.ones(len(ab2))] * nS
+        model = np.tile([5., 10., 100., 20., 300.], nS)
+        model[2::5] *= np.arange(1, nS+1)  # vary resistivity per sounding
+        for nWorkers in [1, 2]:
+            fop = pg.frameworks.LCModelling(VESModelling, ab2=[ab2]*nS,
+                                            mn2=[ab2/3]*nS, nWorkers=nWorkers)
+            fop.initJacobian(data, nLayers=3)
+            resp = fop.response(model)
+            fop.createJacobian(model)
+            J = pg.utils.sparseMatrix2Dense(fop.jacobian())
+            self.assertEqual(J.shape, (len(ab2) * nS, len(model)))
+            for i, f in enumerate(fop._fops1D):
+                iD = slice(i*len(ab2), (i+1)*len(ab2))
+                iM = slice(i*5, (i+1)*5)
+                np.testing.assert_allclose(resp[iD], f.response(model[iM]),
+                                           rtol=1e-4)
+                f.createJacobian(model[iM])
+                Ji = np.array(f.jacobian())
+                np.testing.assert_allclose(J[iD, iM], Ji,
+                                           atol=1e-4 * np.abs(Ji).max())
+                self.assertEqual(np.abs(J[iD, :i*5]).sum(), 0.0)
+
+
 if __name__ == '__main__':
 
     fop  = TestFOP()
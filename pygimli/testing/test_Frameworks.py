@@ -50,6 +50,272 @@ class TestFrameworks(unittest.TestCase):
         np.testing.assert_allclose(model, [1.1, 2.2])
         np.testing.assert_allclose(data, response)
 
+    def test_FitMany(self):
+        """Vectorized Jacobians and fitting of many data sets at once."""
+        func = lambda t, a, b: a*np.exp(-t/b)
+        t = np.linspace(0.1, 2, 20)
+        rng = np.random.default_rng(1337)
+        A = rng.uniform(1, 10, 500)
+        B = rng.uniform(0.2, 2, 500)
+        data = func(t, A[:, None], B[:, None])
+
+        fop = pg.frameworks.ParameterModelling(func)
+        fop.dataSpace = t
+        J = fop.batchJacobian([[2.0, 0.5], [3.0, 1.0]])
+        self.assertTrue(fop._vectorized)
+        self.assertEqual(J.shape, (2, len(t), 2))
+        np.testing.assert_allclose(J[1][:, 0], np.exp(-t))
+        fop.jacobianMethod = 'complex'
+        Jc = fop.batchJacobian([[2.0, 0.5], [3.0, 1.0]])
+        np.testing.assert_allclose(Jc[1][:, 0], np.exp(-t), rtol=1e-12)
+        np.testing.assert_allclose(Jc[1][:, 1], 3 * t * np.exp(-t),
+                                   rtol=1e-12)
+        np.testing.assert_allclose(J, Jc, rtol=0.1)
+
+        # broadcasting to the right shape but reducing over the data axis
+        norm = lambda t, a, b: a*np.exp(-t/b) / np.max(a*np.exp(-t/b))
+        fopN = pg.frameworks.ParameterModelling(norm)
+        fopN.dataSpace = t
+        params = np.array([[2.0, 0.5], [3.0, 1.0]])
+        np.testing.assert_allclose(fopN.batchResponse(params),
+                                   [norm(t, *p) for p in params])
+        self.assertFalse(fopN._vectorized)
+
+        for jac in ['fd', 'complex']:
+            models, resp, chi2 = pg.frameworks.fitMany(
+                func, data, t=t, startModel={'a': 5}, jacobian=jac,
+                maxIter=50)
+            np.testing.assert_allclose(models, np.column_stack([A, B]),
+                                       rtol=1e-4)
+            np.testing.assert_array_less(chi2, 1e-4)
+
+        models, resp = pg.frameworks.fit(func, data[:2], t=t, startModel=1,
+                                         limits={'b': [0.1, 1.5]})
+        self.assertEqual(models.shape, (2, 2))
+        np.testing.assert_array_less(models[:, 1], 1.5 + 1e-12)
+
+    def test_JacobianUpdate(self):
+        """Broyden updates instead of Jacobian recomputation."""
+        func = lambda t, a, b: a*np.exp(-t/b)
+        t = np.linspace(0.1, 2, 20)
+        data = func(t, 5, 0.7)
+        mgr = pg.frameworks.ParameterInversionManager(func)
+        model = mgr.invert(data, np.ones(len(t)) * 0.01, t=t,
+                           startModel={'a': 1, 'b': 1},
+                           jacobianUpdate='broyden', jacobianTolerance=0.2)
+        np.testing.assert_allclose(model, [5, 0.7], rtol=1e-4)
+        paths = [st['path'] for st in mgr.fw.jacobianStats]
+        self.assertEqual(paths[0], 'full')  # no Jacobian before
+        self.assertIn('broyden', paths)
+        for st in mgr.fw.jacobianStats:
+            if st['path'] == 'broyden':
+                self.assertLessEqual(st['predictionError'], 0.2)
+
+    def test_Telemetry(self):
+        """Per-phase time and memory records of an inversion run."""
+        import json
+        import tempfile
+
+        func = lambda t, a, b: a*np.exp(-t/b)
+        t = np.linspace(0.1, 2, 20)
+        mgr = pg.frameworks.ParameterInversionManager(func)
+        mgr.invert(func(t, 5, 0.7), np.ones(len(t)) * 0.01, t=t,
+                   startModel={'a': 1, 'b': 1}, maxIter=3, telemetry=True)
+        tel = mgr.fw.telemetry
+        self.assertGreater(tel.calls('response'), 0)
+        self.assertGreater(tel.calls('createJacobian'), 0)
+        nIter = len(mgr.fw.chi2History) - 1
+        self.assertEqual(tel.calls('oneStep'), nIter)
+        self.assertEqual(len(tel.times('oneStep')), nIter + 1)
+
+        arr = tel.asArrays()
+        self.assertEqual(len(arr['duration']), len(tel.records))
+        excl = tel.selfTimes()
+        self.assertLessEqual(excl['oneStep'],
+                             arr['duration'][arr['name'] == 'oneStep'].sum())
+        self.assertIn('createJacobian', tel.summary())
+
+        # instrumentation is removed after the run
+        self.assertNotIn('response', mgr.fw.fop.__dict__)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            fName = tmp + '/trace.json'
+            tel.exportChromeTrace(fName)
+            with open(fName) as fi:
+                trace = json.load(fi)
+        self.assertEqual(len(trace['traceEvents']), len(tel.records))
+
+        # a later run without telemetry does not record into the old one
+        nRec = len(tel.records)
+        mgr.invert(func(t, 5, 0.7), np.ones(len(t)) * 0.01, t=t,
+                   startModel={'a': 1, 'b': 1}, maxIter=2)
+        self.assertIs(mgr.fw.telemetry, tel)
+        self.assertEqual(len(tel.records), nRec)
+
+        # peak memory of every phase, not of the process lifetime
+        tel = pg.frameworks.Telemetry(memory='tracemalloc')
+        with tel.phase('outer'):
+            with tel.phase('large'):
+                a = np.ones(2**22)  # 32 MB
+                del a
+            with tel.phase('small'):
+                _ = np.ones(10)
+        peaks = {r[0]: r[4] for r in tel.records}
+        self.assertGreaterEqual(peaks['large'], 2**25)
+        self.assertLess(peaks['small'], 2**20)
+        self.assertGreaterEqual(peaks['outer'], peaks['large'])
+
+    def test_LineSearch(self):
+        """Batched trial responses and Armijo backtracking."""
+        from pygimli.frameworks import linesearch
+
+        func = lambda t, a, b: a*np.exp(-t/b)
+        t = np.linspace(0.1, 2, 20)
+
+        class ExpModelling(pg.Modelling):
+            def response(self, model):
+                return func(t, *model)
+
+        models = [[1., 1.], [2., .5], [3., 1.5]]
+        np.testing.assert_allclose(
+            linesearch.responses(ExpModelling(), models, nWorkers=2),
+            [func(t, *m) for m in models])
+
+        mgr = pg.frameworks.ParameterInversionManager(func)
+        mgr.invert(func(t, 5, 0.7), np.ones(len(t)) * 0.01, t=t,
+                   startModel={'a': 1, 'b': 1}, maxIter=1)
+        inv = mgr.fw
+        dM = np.array(inv.modelTrans.fwd([5, 0.7]) -
+                      inv.modelTrans.fwd(inv.model))
+        for method in ["exact", "armijo"]:
+            tau, resp = linesearch.lineSearch(inv, dM*5, method=method,
+                                              nWorkers=2)
+            self.assertLess(tau, 1.0)
+            model = inv.modelTrans.update(inv.model, dM*5*tau)
+            np.testing.assert_allclose(resp, func(t, *model))
+            self.assertLess(inv.phi(model, resp), inv.phi())
+
+        tau, resp = linesearch.lineSearchArmijo(inv, dM)
+        self.assertEqual(tau, 1.0)  # full step accepted, one response
+
+    def test_ResolutionEstimate(self):
+        """Matrix-free resolution estimates compared to full matrices."""
+        from pygimli.frameworks import resolution
+
+        nM = 40
+        x = np.linspace(0, 1, 30)
+        G = np.exp(-np.abs(x[:, None] - np.linspace(0, 1, nM)[None, :])*5)
+
+        class LinearModelling(pg.Modelling):
+            def __init__(self):
+                super().__init__()
+                self.setMesh(pg.meshtools.createMesh1D(nM))
+
+            def response(self, model):
+                return G.dot(model)
+
+            def createStartModel(self, dataVals):
+                return pg.Vector(nM, 1.0)
+
+            def createJacobian(self, model):
+                self.setJacobian(self.G)
+
+        fop = LinearModelling()
+        fop.G = pg.Matrix(G)
+        inv = pg.Inversion(fop=fop)
+        inv.modelTrans = pg.trans.Trans()
+        data = G.dot(1 + np.sin(np.arange(nM) / 4))
+        data += np.random.default_rng(0).normal(0, 0.01, len(x))
+        inv.run(data, absoluteError=np.ones(len(x)) * 0.01, lam=1,
+                verbose=False)
+
+        rm = np.diag(resolution.resolutionMatrix(inv))
+        # range of R is spanned by the data, i.e. nData probes are exact
+        np.testing.assert_allclose(
+            resolution.modelResolutionDiagonal(inv, method='rsvd',
+                                               nProbes=len(x), seed=1),
+            rm, atol=1e-6)
+        np.testing.assert_allclose(
+            resolution.modelResolutionDiagonal(inv, nProbes=200, seed=1),
+            rm, atol=0.1)
+
+        DJ = resolution.scaledJacobianMatrix(inv)
+        C = pg.utils.sparseMatrix2Dense(inv.fop.constraints())
+        C *= np.reshape(inv.fop.regionManager().constraintWeights(), [-1, 1])
+        std = np.sqrt(np.diag(np.linalg.inv(DJ.T @ DJ +
+                                            C.T @ C * inv.lam)))
+        np.testing.assert_allclose(
+            resolution.modelPosteriorStd(inv, nSamples=400, seed=1),
+            std, rtol=0.2)
+
+    def test_JointModellingDispatch(self):
+        """Concurrent evaluation of joint forward operators."""
+        A = [np.arange(12.).reshape(3, 4), np.ones((5, 4))]
+        model = pg.Vector([1., 2., 3., 4.])
+        ref = np.concatenate([a.dot(model) for a in A])
+        for backend in ["thread", "process"]:
+            for nWorkers in [1, 2]:
+                fops = [pg.frameworks.LinearModelling(pg.Matrix(a))
+                        for a in A]
+                fop = pg.frameworks.JointModelling(fops, nWorkers=nWorkers,
+                                                   backend=backend)
+                np.testing.assert_allclose(fop.response(model), ref)
+                # data sizes are known now, so arrays are preallocated
+                np.testing.assert_allclose(fop.response(model), ref)
+                fop.createJacobian(model)
+                self.assertEqual(fop.dispatcher.calls["response"], 2)
+                self.assertEqual(fop.dispatcher.calls["jacobian"], 1)
+                self.assertEqual(len(fop.timings["response"]), 2)
+                self.assertTrue(all(fop.timings["response"] > 0))
+                self.assertIn("LinearModelling", fop.dispatcher.summary())
+
+    def test_GlobalOptimization(self):
+        """Seeded population searches with batched responses."""
+        func = lambda t, a, b: a*np.exp(-t/b)
+        t = np.linspace(0.1, 2, 20)
+        data = func(t, 5, 0.7)
+
+        fop = pg.frameworks.ParameterModelling(func)
+        fop.dataSpace = t
+        for method, nGen, tol in [('DE', 200, 0.01), ('CMAES', 200, 0.01),
+                                  ('SA', 300, 0.05)]:
+            opt = pg.frameworks.GlobalOptimizer(fop, lower=[0.1, 0.01],
+                                                upper=[100, 10],
+                                                logScale=True, seed=42)
+            model = opt.run(data, relativeError=0.01, method=method,
+                            maxGen=nGen, chi2Target=1e-4)
+            np.testing.assert_allclose(model, [5, 0.7], rtol=tol)
+            np.testing.assert_allclose(opt.response, func(t, *model))
+            self.assertLessEqual(opt.chi2, min(opt.fitness))
+            self.assertTrue(np.all(np.diff(opt.history) <= 0))
+
+        class ExpModelling(pg.Modelling):
+            def response(self, model):
+                return func(t, *model)
+
+        # same seed, same result for serial and pooled evaluation
+        from pygimli.core.parallel import workerCount
+
+        res = []
+        for nWorkers in [1, 2]:
+            expFop = ExpModelling()
+            model, chi2 = pg.frameworks.globalOptimization(
+                expFop, data, 0.01, lower=[0.1, 0.01],
+                upper=[100, 10], logScale=True, nWorkers=nWorkers,
+                seed=7, maxGen=20)
+            res.append(model)
+            if nWorkers > 1 and workerCount(nWorkers) > 1:
+                self.assertTrue(expFop._workerPool.alive)
+                expFop.closeWorkerPool()
+        np.testing.assert_array_equal(res[0], res[1])
+
+        # linear parameters with zero bound
+        with np.errstate(divide='raise'):
+            opt = pg.frameworks.GlobalOptimizer(fop, lower=[0, 0.01],
+                                                upper=[100, 10],
+                                                logScale=[False, True])
+        np.testing.assert_allclose(opt.toModel([0, 1]), [0, 10])
+
 
 if __name__ == '__main__':
 
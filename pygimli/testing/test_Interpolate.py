@@ -2,6 +2,9 @@
 """
 Test for interpolation matrix.
 """
+import os
+import tempfile
+
 import numpy as np
 
 import unittest
@@ -81,6 +84,77 @@ class TestInterpolate(unittest.TestCase):
         pnts = np.linspace((min(x), 0.0, 0.0), (max(x), 0.0, 0.0), len(x))
         np.testing.assert_allclose(pg.interpolate(grid, pg.x(grid.positions()), pnts), x)
 
+    def test_MappingOperators(self):
+        grid = pg.createGrid(x=[0, 1, 3, 4], y=[0, 1, 2])
+        grid.createNeighborInfos()
+        c = np.arange(1, grid.cellCount() + 1, dtype=float)
+
+        np.testing.assert_allclose(
+            pg.meshtools.cellDataToNodeData(grid, c),
+            pg.core.cellDataToPointData(grid, c))
+        np.testing.assert_allclose(
+            pg.meshtools.cellDataToBoundaryData(grid, c),
+            grid.cellToBoundaryInterpolation() * pg.Vector(c))
+
+        n = np.array(pg.x(grid))
+        B = pg.meshtools.nodeDataToBoundaryData(grid, n)
+        np.testing.assert_allclose(B, pg.x(grid.boundaryCenters()))
+        B = pg.meshtools.nodeDataToBoundaryData(grid, grid.positions())
+        np.testing.assert_allclose(B, np.array(grid.boundaryCenters()))
+
+        # vector data in one product
+        v = np.vstack([c, 2 * c]).T
+        np.testing.assert_allclose(
+            pg.meshtools.cellDataToNodeData(grid, v)[:, 1],
+            2 * pg.core.cellDataToPointData(grid, c))
+
+        # operators are cached until the mesh changes
+        op = pg.meshtools.mappingOperator(grid, 'neighbors')
+        self.assertIs(op, pg.meshtools.mappingOperator(grid, 'neighbors'))
+        self.assertEqual(op.nnz, 2 * 7)
+
+        # fill empty cells like the core does
+        vals = np.array(c)
+        vals[[0, 4, 5]] = 0.0
+        ref = pg.Vector(vals)
+        grid.prolongateEmptyCellsValues(ref, background=-9e99)
+        filled = pg.meshtools.fillEmptyToCellArray(grid, vals, slope=False)
+        np.testing.assert_allclose(filled, ref)
+
+    def test_InterpolationOperator(self):
+        import pickle
+
+        src = pg.createGrid(x=np.linspace(0, 4, 9), y=np.linspace(0, 2, 5))
+        dst = pg.createGrid(x=np.linspace(0.1, 3.9, 6),
+                            y=np.linspace(0.1, 1.9, 4))
+
+        I = pg.meshtools.InterpolationOperator(src, dst)
+        u = np.array(pg.x(src) + 2 * pg.y(src))
+        np.testing.assert_allclose(I(u), pg.interpolate(dst, src, u))
+        c = np.array(pg.x(src.cellCenters()))
+        np.testing.assert_allclose(I(c), pg.interpolate(dst, src, c))
+
+        # many frames with one product
+        frames = np.vstack([u * i for i in range(5)]).T
+        np.testing.assert_allclose(I(frames)[:, 3], 3 * I(u))
+
+        # extrapolation
+        pos = [[1.0, 1.0], [10.0, 0.0]]
+        for ex, val in [('fill', -1), ('nan', np.nan), ('nearest', 4.0)]:
+            I2 = pg.meshtools.InterpolationOperator(src, pos, extrapolate=ex,
+                                                    fallback=-1)
+            np.testing.assert_allclose(I2(pg.x(src)), [1.0, val])
+
+        # serialization
+        I3 = pickle.loads(pickle.dumps(I))
+        np.testing.assert_allclose(I3(u), I(u))
+        np.testing.assert_allclose(I3(c), I(c))
+
+        fn = os.path.join(tempfile.mkdtemp(), 'interp')
+        I.save(fn)
+        I4 = pg.meshtools.InterpolationOperator().load(fn)
+        np.testing.assert_allclose(I4(frames), I(frames))
+
 
 if __name__ == '__main__':
     #pg.setDebug(1)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import os
 import sys
 
 import unittest
@@ -258,7 +259,97 @@ class TestMeshGenerator(unittest.TestCase):
 
         np.testing.assert_array_equal(mesh2.nodeCount(), mesh.nodeCount())
         np.testing.assert_array_equal(mesh2.cellCount(), mesh.cellCount())
-        
+
+    def test_readGmsh(self):
+        import struct
+        import tempfile as tmp
+
+        msh41 = '\n'.join(['$MeshFormat', '4.1 0 8', '$EndMeshFormat',
+                           '$Entities', '1 1 1 0', '1 0 0 0 1 99',
+                           '1 0 0 0 1 0 0 1 4 2 1 2',
+                           '1 0 0 0 1 1 0 1 2 0', '$EndEntities',
+                           '$Nodes', '1 4 1 4', '2 1 0 4',
+                           '1', '2', '3', '4',
+                           '0 0 0', '1 0 0', '1 1 0', '0 1 0', '$EndNodes',
+                           '$Elements', '3 4 1 4',
+                           '0 1 15 1', '1 1',
+                           '1 1 1 1', '2 1 2',
+                           '2 1 2 2', '3 1 2 3', '4 1 3 4',
+                           '$EndElements', ''])
+
+        msh22 = b'$MeshFormat\n2.2 1 8\n' + struct.pack('<i', 1) + \
+            b'\n$EndMeshFormat\n$Nodes\n4\n'
+        for i, p in enumerate([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]):
+            msh22 += struct.pack('<i3d', i + 1, *p)
+        msh22 += b'\n$EndNodes\n$Elements\n4\n'
+        msh22 += struct.pack('<3i', 15, 1, 2) + struct.pack('<4i', 1, 99, 1, 1)
+        msh22 += struct.pack('<3i', 1, 1, 2) + struct.pack('<5i', 2, 4, 1, 1, 2)
+        msh22 += struct.pack('<3i', 2, 2, 2)
+        msh22 += struct.pack('<6i', 3, 2, 1, 1, 2, 3)
+        msh22 += struct.pack('<6i', 4, 2, 1, 1, 3, 4)
+        msh22 += b'\n$EndElements\n'
+
+        for content in [msh41.encode(), msh22]:
+            fd, fName = tmp.mkstemp(suffix='.msh')
+            with open(fd, 'wb') as fi:
+                fi.write(content)
+            mesh = pg.meshtools.readGmsh(fName)
+            os.remove(fName)
+
+            self.assertEqual(mesh.nodeCount(), 4)
+            self.assertEqual(mesh.cellCount(), 2)
+            self.assertEqual(mesh.boundaryCount(), 5)
+            np.testing.assert_array_equal(mesh.cellMarkers(), [2, 2])
+            np.testing.assert_array_equal(mesh.nodeMarkers(), [-99, 0, 0, 0])
+            for b in mesh.boundaries():
+                if b.outside() and b.center()[1] == 0.0:
+                    self.assertEqual(b.marker(), pg.core.MARKER_BOUND_DIRICHLET)
+                elif b.outside():
+                    self.assertEqual(b.marker(),
+                                     pg.core.MARKER_BOUND_HOMOGEN_NEUMANN)
+                else:
+                    self.assertEqual(b.marker(), 0)
+                    self.assertTrue(b.leftCell() is not None)
+
+    def test_meshQuality(self):
+        from pygimli.meshtools.quality import quality, eta, nsr, minimumAngle
+
+        # mixed triangle/quadrangle mesh
+        mesh = pg.Mesh(2)
+        for p in [[0, 0], [1, 0], [1, 1], [0, 1], [0.5, 3**0.5/2 + 1]]:
+            mesh.createNode(p)
+        mesh.createCell([0, 1, 2, 3])
+        mesh.createCell([3, 2, 4])
+        for m in ['eta', 'nsr', 'aspectRatio', 'minimumAngle']:
+            np.testing.assert_allclose(quality(mesh, m), [1.0, 1.0])
+        np.testing.assert_allclose(quality(mesh, 'minAngle'), [90, 60])
+        np.testing.assert_allclose(quality(mesh, 'size'), mesh.cellSizes())
+
+        mesh = pg.meshtools.createMesh(
+            pg.meshtools.createCircle(radius=3.0, area=0.3), quality=30)
+        for m, f in [('eta', eta), ('nsr', nsr),
+                     ('minimumAngle', minimumAngle)]:
+            np.testing.assert_allclose(quality(mesh, m),
+                                       [f(c) for c in mesh.cells()])
+
+        # regular tetrahedron and distorted hexahedra
+        mesh = pg.Mesh(3)
+        for p in [[1, 1, 1], [1, -1, -1], [-1, 1, -1], [-1, -1, 1]]:
+            mesh.createNode(p)
+        mesh.createCell([0, 1, 2, 3])
+        for m in ['eta', 'nsr', 'aspectRatio', 'minimumAngle']:
+            np.testing.assert_allclose(quality(mesh, m), [1.0])
+
+        grid = pg.createGrid(3, [0, 1, 3], 2)
+        np.testing.assert_allclose(quality(grid, 'size'), grid.cellSizes())
+        np.testing.assert_allclose(quality(grid, 'minAngle'), 90)
+        np.testing.assert_allclose(quality(grid, 'aspectRatio'),
+                                   [1, 1, 5/3, 5/3])
+
+        tets = pg.meshtools.refineHex2Tet(grid)
+        np.testing.assert_allclose(quality(tets, 'size'), tets.cellSizes())
+        self.assertTrue(np.all(quality(tets, 'maxAngle') < 180))
+
 
 if __name__ == '__main__':
     # pg.setDeepDebug(1)
@@ -33,6 +33,157 @@ class TestManagers(unittest.TestCase):
         mod = mgr.invert(dat, mesh=mesh, maxIter=20, lam=10)
         np.testing.assert_approx_equal(mgr.inv.chi2(), 1.033, significant=3)
 
+    def test_ERTReciprocals(self):
+        from pygimli.physics.ert.processing import (reciprocalIndices,
+                                                    getReciprocals)
+        dat = pg.DataContainerERT()
+        for i in range(6):
+            dat.createSensor([i, 0])
+        abmn = np.array([[0, 1, 2, 3], [1, 2, 4, 5], [0, 3, 4, 5],
+                         [3, 2, 0, 1],  # reciprocal to 0 (flipped bipoles)
+                         [4, 5, 1, 2],  # reciprocal to 1
+                         [0, 1, 2, 3]])  # repetition of 0
+        dat.resize(len(abmn))
+        for i, tok in enumerate('abmn'):
+            dat[tok] = abmn[:, i]
+        dat['r'] = [1.0, 2.0, 3.0, 1.2, 2.0, 0.9]
+        dat['i'] = [0.1, 0.1, 0.1, 0.3, 0.1, 0.1]
+        dat['u'] = dat['r'] * dat['i']
+        dat['valid'] = 1
+
+        iF, iB = reciprocalIndices(dat)
+        np.testing.assert_equal(iF, [0, 1, 3, 4, 5])
+        np.testing.assert_equal(iB, [3, 4, 0, 1, 3])
+        iF, iB = reciprocalIndices(dat, onlyOnce=True)
+        np.testing.assert_equal(iF, [0, 1])
+        np.testing.assert_equal(iB, [3, 4])
+        iF, iB = reciprocalIndices(dat, allPairs=True)
+        np.testing.assert_equal(iF, [0, 1, 3, 3, 4, 5])
+        np.testing.assert_equal(iB, [3, 4, 0, 5, 1, 3])
+
+        getReciprocals(dat, change=True, remove=True)
+        # first group (0, 5) and datum 1 are merged into 3 and 4
+        self.assertEqual(dat.size(), 3)
+        np.testing.assert_allclose(dat['a'], [0, 3, 4])
+        np.testing.assert_allclose(dat['r'], [3.0, 1.1, 2.0])
+        np.testing.assert_allclose(dat['i'], [0.1, 0.22, 0.1])
+        np.testing.assert_allclose(dat['rec'], [0.0, 0.3 / 2.1 * 2, 0.0])
+
+    def test_ERTSchemes(self):
+        for name in ['wa', 'wb', 'pp', 'pd', 'dd', 'slm', 'hw', 'gr']:
+            data = ert.createData(24, name)
+            self.assertGreater(data.size(), 0)
+            np.testing.assert_allclose(data['k'], ert.geometricFactors(data))
+
+        data = ert.createData(6, 'wa')
+        np.testing.assert_equal(data['a'], [0, 1, 2])
+        np.testing.assert_equal(data['b'], [3, 4, 5])
+        np.testing.assert_equal(data['m'], [1, 2, 3])
+        np.testing.assert_equal(data['n'], [2, 3, 4])
+
+        data = ert.createData(6, 'dd')
+        np.testing.assert_equal(data['a'], [0, 1, 2, 0, 1, 0])
+        np.testing.assert_equal(data['m'], [2, 3, 4, 3, 4, 4])
+        self.assertEqual(ert.createData(6, 'dd', addInverse=True).size(), 12)
+
+        data = ert.createData(24, 'dd', maxK=500)
+        self.assertTrue(max(abs(data['k'])) <= 500)
+        data = ert.createData(24, 'dd', minK=500)
+        self.assertTrue(min(abs(data['k'])) >= 500)
+
+        from pygimli.physics.ert.ertScheme import createDataVES
+        data = createDataVES(ab2=[1., 2., 4.], mn2=[0.5, 1.])
+        self.assertEqual(data.size(), 6)
+        self.assertEqual(data.sensorCount(), 8)
+        np.testing.assert_allclose(
+            ert.geometricFactorsFromIndices(
+                np.array(data.sensors()), data['a'], data['b'],
+                data['m'], data['n']),
+            ert.geometricFactors(data))
+
+    def test_TimelapseStore(self):
+        import os
+        import tempfile
+        from datetime import datetime, timedelta
+        from pygimli.physics.ert import TimelapseERT
+
+        data = ert.createData(np.arange(8.), "dd")
+        data['k'] = ert.geometricFactors(data)
+        DATA = np.random.rand(data.size(), 3) * 10 + 50
+        ERR = np.ones_like(DATA) * 0.03
+        times = [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(3)]
+        tl = TimelapseERT(data=data, DATA=DATA.copy(), ERR=ERR,
+                          times=np.array(times))
+        tl.DATA[2, 1] = np.nan
+        tl.mask()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            name = os.path.join(tmp, "tl")
+            tl.saveData(name, binary=True)
+            tl2 = TimelapseERT(name + ".tlert")
+            self.assertEqual(tl2.DATA.shape, (data.size(), 3))
+            np.testing.assert_equal(tl2.times, times)
+            np.testing.assert_allclose(tl2.DATA[:, 0], DATA[:, 0])
+            self.assertTrue(tl2.DATA.mask[2, 1])
+
+            frame = pg.DataContainerERT(data)
+            frame['rhoa'] = DATA[:, 0] * 2
+            frame.remove(frame['a'] == 0)
+            self.assertEqual(tl2.addFrame(frame, times[-1] +
+                                          timedelta(hours=1)), 3)
+            # appended on disk, not stacked in memory
+            self.assertEqual(tl2.DATA.shape, (data.size(), 4))
+            self.assertIsInstance(np.ma.getdata(tl2.DATA), np.memmap)
+            tl3 = TimelapseERT(name + ".tlert", mmap=False)
+            self.assertEqual(tl3.DATA.shape, (data.size(), 4))
+            self.assertEqual(np.ma.count_masked(tl3.DATA[:, 3]),
+                             data.size() - frame.size())
+            np.testing.assert_allclose(tl3.DATA[:, 3].compressed(),
+                                       frame['rhoa'])
+
+            # rewriting the store the data are mapped from keeps them
+            tl2.saveData(name, binary=True)
+            self.assertNotIsInstance(np.ma.getdata(tl2.DATA), np.memmap)
+            np.testing.assert_allclose(tl2.DATA[:, 0], DATA[:, 0])
+            tl4 = TimelapseERT(name + ".tlert")
+            self.assertEqual(tl4.DATA.shape, (data.size(), 4))
+            np.testing.assert_allclose(tl4.DATA[:, 0], DATA[:, 0])
+            np.testing.assert_allclose(tl4.DATA[:, 3].compressed(),
+                                       frame['rhoa'])
+            self.assertTrue(tl4.DATA.mask[2, 1])
+
+    def test_TimelapseOnline(self):
+        import os
+        import tempfile
+        from datetime import datetime, timedelta
+        from pygimli.physics.ert import TimelapseERT
+
+        data = ert.createData(np.arange(12.), "dd")
+        data['k'] = ert.geometricFactors(data)
+        mesh = pg.meshtools.createParaMesh(data.sensors(), paraDX=0.5,
+                                           paraMaxCellSize=2, quality=33)
+        DATA = np.zeros((data.size(), 3))
+        for i, rho in enumerate([80, 90, 100]):
+            sim = ert.simulate(mesh, scheme=data, res=rho, noiseLevel=0.01,
+                               noiseAbs=0, seed=i, verbose=False)
+            DATA[:, i] = sim['rhoa']
+        times = [datetime(2024, 1, 1) + timedelta(hours=i) for i in range(3)]
+        tl = TimelapseERT(data=data, DATA=DATA, ERR=np.ones_like(DATA) * 0.02,
+                          times=np.array(times), mesh=mesh)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tl.saveData(os.path.join(tmp, "tl"), binary=True)
+            for i, jac in enumerate(["recalc", "reuse", "broyden"]):
+                tl.invertFrame(i, jacobian=jac, maxIter=3)
+
+            self.assertEqual(tl.models.shape, (3, tl.pd.cellCount()))
+            np.testing.assert_array_less(tl.chi2s, 1.0)
+            np.testing.assert_allclose(np.median(tl.models, axis=1),
+                                       [80, 90, 100], rtol=0.03)
+            res = tl.store.results()
+            np.testing.assert_equal(res['times'], times)
+            self.assertEqual(res['pd'].cellCount(), tl.pd.cellCount())
+
     def test_TT(self, showProgress=False):
         pass
 
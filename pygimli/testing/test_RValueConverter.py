@@ -309,6 +309,31 @@ class TestRVectorMethods(unittest.TestCase):
         np.testing.assert_equal(M, M2)
         A = np.array(pg.Matrix(4,4))
 
+    def test_GMat2Numpy(self):
+        """Bulk conversion between RMatrix and 2D numpy arrays."""
+        M = np.arange(20.).reshape((5, 4))
+        A = pg.utils.numpy2gmat(M)
+        self.assertEqual(A.rows(), 5)
+        self.assertEqual(A.cols(), 4)
+        np.testing.assert_equal(A.row(3), M[3])
+
+        N = pg.utils.gmat2numpy(A)
+        self.assertEqual(N.shape, (5, 4))
+        np.testing.assert_equal(N, M)
+
+        # numpy arrays and wrappers are passed through without copy
+        self.assertIs(pg.utils.gmat2numpy(M), M)
+        W = pg.matrix.RealNumpyMatrix(M)
+        self.assertIs(pg.utils.gmat2numpy(W), M)
+        self.assertIsNot(pg.utils.gmat2numpy(W, copy=True), M)
+        np.testing.assert_equal(pg.matrix.RealNumpyMatrix(A).M, M)
+
+        S = pg.matrix.SparseMapMatrix([0, 1, 2], [0, 1, 2], np.ones(3))
+        np.testing.assert_equal(pg.utils.gmat2numpy(S), np.eye(3))
+
+        np.testing.assert_equal(pg.utils.gmat2numpy(pg.Matrix(0, 0)).shape,
+                                (0, 0))
+
     def test_NumpyToScalar(self):
         """Implemented through automatic iterator """
         x = pg.Vector(2)
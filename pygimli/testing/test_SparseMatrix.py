@@ -109,6 +109,52 @@ class TestSparseMatrix(unittest.TestCase):
 
 
 
+    def test_ConvertScipy(self):
+        from scipy.sparse import random as sprandom
+
+        sci = sprandom(20, 30, density=0.2, format='csr', random_state=42)
+
+        S = pg.utils.toSparseMatrix(sci)
+        self.assertEqual(S.rows(), 20)
+        self.assertEqual(S.cols(), 30)
+
+        x = np.arange(30.)
+        np.testing.assert_allclose(S * x, sci @ x)
+
+        for copy in [True, False]:
+            csr = pg.utils.sparseMatrix2csr(S, copy=copy)
+            self.assertEqual(csr.shape, (20, 30))
+            np.testing.assert_allclose(csr.toarray(), sci.toarray())
+
+        np.testing.assert_allclose(pg.utils.sparseMatrix2Dense(S),
+                                   sci.toarray())
+
+        # block matrix is assembled from its submatrices
+        B = pg.matrix.BlockMatrix()
+        i = B.addMatrix(S)
+        B.addMatrixEntry(i, 0, 0)
+        B.addMatrixEntry(i, 20, 10, -2.0)
+        j = B.addMatrix(pg.matrix.SparseMapMatrix(S))
+        B.addMatrixEntry(j, 0, 0)
+
+        ref = np.zeros((40, 40))
+        ref[:20, :30] += 2 * sci.toarray()
+        ref[20:, 10:] += -2 * sci.toarray()
+        np.testing.assert_allclose(pg.utils.sparseMatrix2csr(B).toarray(), ref)
+        np.testing.assert_allclose(pg.utils.sparseMatrix2csr(
+            B.sparseMapMatrix()).toarray(), ref)
+        self.assertEqual(pg.utils.toSparseMatrix(B).cols(), 40)
+
+        # trailing empty columns are kept
+        sci = sci.tolil()
+        sci[:, -2:] = 0.0
+        sci = sci.tocsr()
+        sci.eliminate_zeros()
+        S = pg.utils.toSparseMatrix(sci)
+        self.assertEqual((S.rows(), S.cols()), (20, 30))
+        np.testing.assert_allclose(pg.utils.sparseMatrix2Dense(S),
+                                   sci.toarray())
+
     def test_Access(self):
         #addVal(0, 1, 1.2) kommt nach der konvertierung auch wieder [0], [1], [1.2]
         pass
@@ -6,6 +6,14 @@ import pygimli as pg
 
 from pygimli.physics import TravelTimeManager
 
+
+def coreRayPaths(fop):
+    """Ragged ray paths collected ray by ray from the core ways."""
+    ways = [np.asarray(fop.way(s, g), dtype=int)
+            for s, g in zip(fop.data.id("s"), fop.data.id("g"))]
+    return np.r_[0, np.cumsum([len(w) for w in ways])], np.concatenate(ways)
+
+
 class TestTT(unittest.TestCase):
 
     def setUp(self):
@@ -65,6 +73,63 @@ class TestTT(unittest.TestCase):
         J = fop.jacobian()
         np.testing.assert_allclose(J * self.slo, np.sqrt(5))
 
+    def test_RayPaths(self):
+        fop = self.mgr.fop
+        fop.setData(self.data)
+        fop.setMesh(self.mesh.createMeshWithSecondaryNodes(n=5),
+                    ignoreRegionManager=True)
+
+        fop.createJacobian(self.slo)
+        offCore, idsCore = coreRayPaths(fop)
+        off, ids = fop.rayPaths(self.slo)
+        np.testing.assert_equal(off, [0, len(ids)])
+        np.testing.assert_equal(ids, idsCore)
+        np.testing.assert_equal(off, offCore)
+
+        pos = np.array(fop._core.mesh().positions(withSecNodes=True))
+        seg, ray = pg.physics.traveltime.raySegments(off, pos[ids])
+        np.testing.assert_allclose(
+            np.sum(np.linalg.norm(seg[:, 1] - seg[:, 0], axis=1)),
+            np.sqrt(5))
+        np.testing.assert_equal(ray, 0)
+
+        # crosshole: many shots and receivers, every ray equals the core way
+        from pygimli.physics.traveltime.modelling import shortestPaths
+
+        data = pg.physics.traveltime.createCrossholeData(x=[0., 4.],
+                                                         z=np.arange(5.))
+        mesh = pg.createGrid(np.arange(5.), np.arange(5.))
+        slo = np.random.default_rng(42).uniform(1, 2, mesh.cellCount())
+        fop.setData(data)
+        fop.setMesh(mesh.createMeshWithSecondaryNodes(n=2),
+                    ignoreRegionManager=True)
+
+        fop.createJacobian(slo)
+        offCore, idsCore = coreRayPaths(fop)
+        off, ids = fop.rayPaths(slo)
+        self.assertEqual(len(off), data.size() + 1)
+        np.testing.assert_equal(off, offCore)
+        for i in range(data.size()):
+            np.testing.assert_equal(ids[off[i]:off[i+1]],
+                                    idsCore[offCore[i]:offCore[i+1]])
+
+        # default is the slowness of the last Jacobian
+        offLast, idsLast = fop.rayPaths()
+        np.testing.assert_equal(offLast, off)
+        np.testing.assert_equal(idsLast, ids)
+
+        # one shot per Dijkstra call gives the same paths
+        fwdMesh = fop._core.mesh()
+        nodes = np.array([fwdMesh.findNearestNode(p)
+                          for p in data.sensorPositions()])
+        off1, ids1 = shortestPaths(fwdMesh, slo,
+                                   nodes[np.array(data.id("s"), dtype=int)],
+                                   nodes[np.array(data.id("g"), dtype=int)],
+                                   maxMemory=1)
+        np.testing.assert_equal(off1, off)
+        np.testing.assert_equal(ids1, ids)
+
+
 if __name__ == '__main__':
 
     # fop  = TestTT()
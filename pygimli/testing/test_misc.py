@@ -153,6 +153,24 @@ class TestMisc(unittest.TestCase):
         p3 = p1.cross(p2)
         self.assertEqual(p3, pg.Pos(0.0, 0.0, 1.0))
 
+    def test_Parallel(self):
+        from pygimli.core.parallel import (cpuBudget, parallel,
+                                           threadsPerWorker, workerCount)
+        nCPU = pg.getCPUCount()
+        self.assertTrue(nCPU >= 1)
+        self.assertEqual(cpuBudget(), nCPU)
+        self.assertEqual(workerCount(nCPU + 10), nCPU)
+        self.assertEqual(workerCount(None, nTasks=1), 1)
+
+        with parallel(cpus=2) as outer:
+            self.assertEqual(outer, min(2, nCPU))
+            self.assertEqual(threadsPerWorker(2), 1)
+            # nested sections cannot exceed the enclosing budget
+            with parallel(cpus=nCPU + 10) as inner:
+                self.assertEqual(inner, outer)
+            self.assertEqual(cpuBudget(), outer)
+        self.assertEqual(cpuBudget(), nCPU)
+
     def test_Hash(self):
         v1 = pg.Vector(10, 2.)
         v2 = pg.Vector(10, 2.)
@@ -53,25 +53,69 @@ def rrmsWithErr(a, b, err, errtol=1):
     return rms((a[fi]-b[fi])/a[fi])
 
 
-def gmat2numpy(mat):
+def gmat2numpy(mat, copy=False):
     """Convert pygimli matrix into numpy.array.
 
-    TODO implement correct rval
+    Dense core matrices are copied in one bulk operation if the core
+    provides `RMatrix.array()`, else row by row into a preallocated array.
+    Numpy arrays and numpy matrix wrappers (:py:class:`RealNumpyMatrix`)
+    are returned without copy unless `copy` is set. Sparse matrices are
+    converted into dense arrays.
+
+    Parameters
+    ----------
+    mat : pg.Matrix | pg.matrix.RealNumpyMatrix | ndarray | sparse matrix
+        Matrix to be converted.
+    copy : bool [False]
+        Force a copy for matrices that are already numpy arrays, e.g., to
+        scale the result inplace.
+
+    Returns
+    -------
+    nmat : ndarray
+        Dense 2D array of shape (mat.rows(), mat.cols()).
     """
-    nmat = np.zeros((len(mat), len(mat[0])))
-    for i, row in enumerate(mat):
-        nmat[i] = row
+    if isinstance(mat, np.ndarray):
+        return np.array(mat) if copy else mat
+
+    if isinstance(mat, pg.matrix.RealNumpyMatrix):
+        return np.array(mat.M) if copy else np.asarray(mat.M)
+
+    if isinstance(mat, (pg.matrix.SparseMapMatrix, pg.matrix.SparseMatrix,
+                        pg.matrix.BlockMatrix)):
+        from .sparseMat2Numpy import sparseMatrix2Dense
+        return sparseMatrix2Dense(mat)
+
+    if not isinstance(mat, pg.Matrix):  # e.g. list of rows
+        return np.array(mat, dtype=float)
+
+    if hasattr(mat, 'array'):
+        return mat.array()
+
+    nmat = np.empty((mat.rows(), mat.cols()))
+    for i in range(mat.rows()):
+        nmat[i] = mat.rowRef(i)
     return nmat
 
 
 def numpy2gmat(nmat):
     """Convert numpy.array into pygimli RMatrix.
 
-    TODO implement correct rval
+    The matrix is filled in one bulk operation if the core provides
+    `RMatrix.setArray()`, else row by row into a preallocated matrix.
     """
+    nmat = np.asarray(nmat, dtype=float)
+    if nmat.ndim != 2:
+        pg.error("numpy2gmat needs a 2D array but got shape", nmat.shape)
+
     gmat = pg.Matrix()
-    for arr in nmat:
-        gmat.push_back(arr)  # pg.asvector(arr))
+    if hasattr(gmat, 'setArray'):
+        gmat.setArray(np.ascontiguousarray(nmat))
+        return gmat
+
+    gmat.resize(*nmat.shape)
+    for i, arr in enumerate(nmat):
+        gmat.setRow(i, arr)
     return gmat
 
 
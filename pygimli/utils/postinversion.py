@@ -80,10 +80,14 @@ def scaledJacobianMatrix(inv):
     d = 1. / inv.dataTrans.error(inv.response, inv.errorVals)
     left = np.reshape(inv.dataTrans.deriv(inv.response) / d, [-1, 1])
     right = np.reshape(1 / inv.modelTrans.deriv(inv.model), [1, -1])
-    if isinstance(J, pg.Matrix):  # e.g. ERT
-        return left * pg.utils.gmat2numpy(J) * right
-    elif isinstance(J, pg.SparseMapMatrix):  # e.g. Traveltime
-        return left * pg.utils.sparseMat2Numpy.sparseMatrix2Dense(J) * right
+    if isinstance(J, (pg.Matrix,  # e.g. ERT
+                      pg.SparseMapMatrix,  # e.g. Traveltime
+                      pg.matrix.SparseMatrix, pg.matrix.RealNumpyMatrix,
+                      np.ndarray)):
+        DJ = pg.utils.gmat2numpy(J, copy=True)
+        DJ *= left
+        DJ *= right
+        return DJ
     else:
         raise TypeError("Matrix type cannot be converted")
 
@@ -179,8 +183,9 @@ def modCovarCoreInv(inv):
     td = np.asarray(inv.transData().deriv(inv.response()))
     tm = np.asarray(inv.transModel().deriv(inv.model()))
 
-    J = td.reshape(len(td), 1) * \
-        gmat2numpy(inv.forwardOperator().jacobian()) * (1. / tm)
+    J = gmat2numpy(inv.forwardOperator().jacobian(), copy=True)
+    J *= td.reshape(len(td), 1)
+    J *= 1. / tm
     d = 1. / np.asarray(inv.transData().error(inv.response(), inv.error()))
 
     DJ = d.reshape(len(d), 1) * J
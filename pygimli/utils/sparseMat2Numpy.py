@@ -19,7 +19,7 @@ def toSparseMatrix(A):
         pg.SparseMatrix
     """
     if isinstance(A, pg.matrix.BlockMatrix):
-        return pg.matrix.SparseMatrix(A.sparseMapMatrix())
+        return toSparseMatrix(sparseMatrix2csr(A))
 
     if isinstance(A, pg.matrix.CSparseMapMatrix):
         return pg.matrix.CSparseMatrix(A)
@@ -37,7 +37,7 @@ def toSparseMatrix(A):
     from scipy.sparse import csr_matrix
 
     if isinstance(A, csr_matrix):
-        return pg.SparseMatrix(A.indptr, A.indices, A.data)
+        return _csr2SparseMatrix(A)
 
     from scipy.sparse import coo_matrix
     if isinstance(A, coo_matrix):
@@ -80,21 +80,85 @@ def toSparseMapMatrix(A):
 
     return toSparseMapMatrix(csr_matrix(A))
 
-def toCSR(A):
-    return sparseMatrix2csr(A)
+def toCSR(A, copy=True):
+    return sparseMatrix2csr(A, copy=copy)
 
 def toCOO(A):
     return sparseMatrix2coo(A)
 
-def sparseMatrix2csr(A):
+
+def _csrArrays(A):
+    """Return the CRS arrays (colPtr, rowIdx, vals) of a pg SparseMatrix.
+
+    If the core provides array views for sparse matrices, the returned arrays
+    share the memory with A and no data is copied. Else the arrays are
+    copied in bulk.
+
+    Parameters
+    ----------
+    A: pg.matrix.SparseMatrix | pg.matrix.CSparseMatrix
+
+    Returns
+    -------
+    colPtr, rowIdx, vals: np.ndarray
+        Row pointers, column indices and values (named after the core
+        members) in the layout of scipy's (indptr, indices, data).
+    """
+    if hasattr(A, 'vecValsArray'):
+        return A.vecColPtrArray(), A.vecRowIdxArray(), A.vecValsArray()
+
+    # slicing the std::vector returns a list which is much faster to
+    # convert than iterating the std::vector element wise
+    return (np.array(A.vecColPtr()[:], dtype=np.int32),
+            np.array(A.vecRowIdx()[:], dtype=np.int32),
+            A.vecVals().array())
+
+
+def _csr2SparseMatrix(A):
+    """Create pg SparseMatrix from scipy.sparse.csr_matrix."""
+    colPtr = np.ascontiguousarray(A.indptr, dtype=np.int32)
+    rowIdx = np.ascontiguousarray(A.indices, dtype=np.int32)
+
+    if np.iscomplexobj(A.data):
+        S = pg.matrix.CSparseMatrix()
+        vals = np.ascontiguousarray(A.data, dtype=complex)
+    else:
+        S = pg.matrix.SparseMatrix()
+        vals = np.ascontiguousarray(A.data, dtype=float)
+
+    if hasattr(S, 'setCRSArrays'):
+        # one memcpy per array in the core
+        S.setCRSArrays(colPtr, rowIdx, vals, A.shape[1])
+        return S
+
+    if np.iscomplexobj(vals):
+        S = pg.matrix.CSparseMatrix(colPtr.tolist(), rowIdx.tolist(),
+                                    pg.core.CVector(vals))
+    else:
+        S = pg.matrix.SparseMatrix(colPtr.tolist(), rowIdx.tolist(),
+                                   pg.Vector(vals))
+
+    # the core counts the columns up to the last non-zero entry only
+    if hasattr(S, 'setCols'):
+        S.setCols(A.shape[1])
+    return S
+
+
+def sparseMatrix2csr(A, copy=True):
     """Convert SparseMatrix to scipy.csr_matrix.
 
     Compressed Sparse Row matrix, i.e., Compressed Row Storage (CRS)
 
     Parameters
     ----------
-    A: pg.matrix.SparseMapMatrix | pg.matrix.SparseMatrix
+    A: pg.matrix.SparseMapMatrix | pg.matrix.SparseMatrix |
+       pg.matrix.BlockMatrix
         Matrix to convert from.
+    copy: bool [True]
+        If False and A is a pg.matrix.SparseMatrix, the returned matrix
+        shares its memory with A if the core supports array views. Changes
+        of the values are then visible in both matrices. Use this for
+        temporary conversions, e.g., to feed a scipy solver.
 
     Returns
     -------
@@ -105,30 +169,61 @@ def sparseMatrix2csr(A):
     from scipy.sparse import csr_matrix
     if isinstance(A, pg.matrix.CSparseMapMatrix):
         C = pg.matrix.CSparseMatrix(A)
-        return csr_matrix((C.vecVals().array(),
-                           C.vecRowIdx(),
-                           C.vecColPtr()), dtype=complex)
+        return csr_matrix(_csrArrays(C)[::-1], shape=(C.rows(), C.cols()),
+                          dtype=complex, copy=False)
     if isinstance(A, pg.matrix.SparseMapMatrix):
         C = pg.matrix.SparseMatrix(A)
-        return csr_matrix((C.vecVals().array(),
-                           C.vecRowIdx(),
-                           C.vecColPtr()))
+        return csr_matrix(_csrArrays(C)[::-1], shape=(C.rows(), C.cols()),
+                          copy=False)
     elif isinstance(A, pg.matrix.SparseMatrix):
-        return csr_matrix((A.vecVals().array(),
-                           A.vecRowIdx(),
-                           A.vecColPtr()))
+        return csr_matrix(_csrArrays(A)[::-1], shape=(A.rows(), A.cols()),
+                          copy=copy and hasattr(A, 'vecValsArray'))
     elif isinstance(A, pg.matrix.CSparseMatrix):
-        csr = csr_matrix((A.vecVals().array(),
-                           A.vecRowIdx(),
-                           A.vecColPtr()), dtype=complex)
-        return csr
+        return csr_matrix(_csrArrays(A)[::-1], shape=(A.rows(), A.cols()),
+                          dtype=complex,
+                          copy=copy and hasattr(A, 'vecValsArray'))
     elif isinstance(A, pg.matrix.BlockMatrix):
-        M = A.sparseMapMatrix()
-        return sparseMatrix2csr(M)
+        return _blockMatrix2csr(A)
 
     return csr_matrix(A)
 
 
+def _blockMatrix2csr(A):
+    """Assemble scipy.csr_matrix from the entries of a BlockMatrix.
+
+    Every submatrix is converted only once and shifted into place with
+    array operations, overlapping entries are summed up.
+    """
+    from scipy.sparse import coo_matrix
+
+    mats = getattr(A, '__mats__', [])
+    ids = [e.matrixID for e in A.entries()]
+    if max(ids + [-1]) >= len(mats) or not all(
+            isinstance(mats[i], (pg.matrix.SparseMatrix,
+                                 pg.matrix.SparseMapMatrix)) for i in ids):
+        # submatrices are unknown on the python side or not sparse
+        return sparseMatrix2csr(A.sparseMapMatrix())
+
+    rows, cols, vals = [], [], []
+    coos = {}
+    for e in A.entries():
+        if e.matrixID not in coos:
+            coos[e.matrixID] = sparseMatrix2coo(mats[e.matrixID])
+        M = coos[e.matrixID]
+        if e.transpose:
+            M = M.T
+        rows.append(M.row + e.rowStart)
+        cols.append(M.col + e.colStart)
+        vals.append(M.data * e.scale)
+
+    if len(vals) == 0:
+        return coo_matrix((A.rows(), A.cols())).tocsr()
+
+    return coo_matrix((np.concatenate(vals),
+                       (np.concatenate(rows), np.concatenate(cols))),
+                      shape=(A.rows(), A.cols())).tocsr()
+
+
 def sparseMatrix2coo(A, rowOffset=0, colOffset=0):
     """Convert SparseMatrix to scipy.coo_matrix.
 
@@ -148,12 +243,11 @@ def sparseMatrix2coo(A, rowOffset=0, colOffset=0):
     rows = pg.core.IndexArray([0])
     cols = pg.core.IndexArray([0])
 
-    if isinstance(A, pg.matrix.SparseMatrix):
-        C = pg.matrix.SparseMapMatrix(A)
-        C.fillArrays(vals=vals, rows=rows, cols=cols)
-        rows += rowOffset
-        cols += colOffset
-        return coo_matrix((vals, (rows, cols)), shape=(A.rows(), A.cols()))
+    if isinstance(A, (pg.matrix.SparseMatrix, pg.matrix.CSparseMatrix)):
+        C = sparseMatrix2csr(A, copy=False).tocoo()
+        C.row += rowOffset
+        C.col += colOffset
+        return C
 
     elif isinstance(A, pg.matrix.SparseMapMatrix):
         A.fillArrays(vals, rows, cols)
@@ -167,12 +261,9 @@ def sparseMatrix2coo(A, rowOffset=0, colOffset=0):
 
 def convertCRSIndex2Map(rowIdx, colPtr):
     """Converts CRS indices to uncompressed indices (row, col)."""
-    ii = []
-    jj = []
-    for i in range(len(colPtr)-1):
-        for j in range(colPtr[i], colPtr[i + 1]):
-            ii.append(i)
-            jj.append(rowIdx[j])
+    colPtr = np.asarray(colPtr)
+    ii = np.repeat(np.arange(len(colPtr) - 1), np.diff(colPtr))
+    jj = np.asarray(rowIdx)[:colPtr[-1]]
     return ii, jj
 
 
@@ -216,12 +307,11 @@ def sparseMatrix2Array(matrix, indices=True, getInCRS=True):
     if not isinstance(matrix, pg.matrix.SparseMatrix):
         matrix = pg.matrix.SparseMatrix(matrix)
 
-    vals = np.array(matrix.vecVals())
+    cols, rows, vals = _csrArrays(matrix)
+    vals = np.array(vals)
     if indices is True:
-        rows = list(matrix.vecRowIdx())
-        cols = list(matrix.vecColPtr())
         if getInCRS:
-            return list(rows), list(cols), vals
+            return rows.tolist(), cols.tolist(), vals
         else:
             rr, cc = convertCRSIndex2Map(rows, cols)
             return rr, cc, vals
@@ -230,14 +320,7 @@ def sparseMatrix2Array(matrix, indices=True, getInCRS=True):
 
 def sparseMatrix2Dense(matrix):
     """Convert sparse matrix to dense ndarray"""
-
-    rr, cc, vals = sparseMatrix2Array(matrix, indices=True, getInCRS=False)
-    mat = np.zeros((matrix.rows(), matrix.cols()))
-
-    for i, r in enumerate(rr):
-        mat[r, cc[i]] = vals[i]
-
-    return mat
+    return sparseMatrix2csr(matrix, copy=False).toarray()
 
 if __name__ == '__main__':
     pass